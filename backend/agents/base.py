@@ -4,40 +4,229 @@ Phase 3: AI Logic Design
 """
 
 from abc import ABC, abstractmethod
-from openai import OpenAI
+from contextlib import contextmanager
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
+import json
 import os
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, Tuple
+try:
+    from .llm_cache import LLMResponseCache, get_llm_cache
+except ImportError:
+    from llm_cache import LLMResponseCache, get_llm_cache
 
 
-class BaseAgent(ABC):
-    """Base class for all AI agents"""
-    
-    def __init__(self):
+# Shared async client - one pooled set of HTTP connections per process
+_async_client: Optional[AsyncOpenAI] = None
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get the process-wide AsyncOpenAI client.
+
+    All agents share this client so concurrent requests reuse the same
+    keep-alive connection pool instead of opening one per agent.
+    Pool size is configurable via OPENAI_MAX_CONNECTIONS / OPENAI_MAX_KEEPALIVE.
+    """
+    global _async_client
+    if _async_client is None:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
-        self.client = OpenAI(api_key=api_key)
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "20")),
+        )
+        _async_client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(limits=limits),
+        )
+    return _async_client
+
+
+class BaseAgent(ABC):
+    """Base class for all AI agents"""
+
+    def __init__(self):
+        self.async_client = get_async_openai_client()
         self.model = "gpt-4o-mini"  # Using cost-effective model
-    
+        self.cache = get_llm_cache()
+        # Token usage of uncached calls made by this agent (see reset_usage)
+        self.usage = self._empty_usage()
+
     @abstractmethod
-    def process(self, *args, **kwargs) -> Dict[str, Any]:
+    async def aprocess(self, *args, **kwargs) -> Any:
         """Process method to be implemented by each agent"""
         pass
-    
-    def _call_llm(self, messages: list, temperature: float = 0.7, max_tokens: int = 2000) -> str:
-        """Helper method to call OpenAI API"""
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                timeout=30.0  # 30 second timeout
+
+    async def _acall_llm(self, messages: list, temperature: float = 0.7, max_tokens: int = 2000, use_cache: bool = True, response_format: Optional[Dict[str, Any]] = None) -> str:
+        """Call the OpenAI API on the shared pooled client (responses are cached by request content)"""
+        cache_key, cached = self._cache_lookup(messages, temperature, max_tokens, use_cache, response_format)
+        if cached is not None:
+            return cached
+        with self._api_errors("_acall_llm"):
+            response = await self.async_client.chat.completions.create(
+                **self._completion_params(messages, temperature, max_tokens, response_format)
+            )
+            content = response.choices[0].message.content.strip()
+            self._record_usage(getattr(response, "usage", None))
+        if cache_key:
+            self.cache.set(cache_key, content)
+        return content
+
+    async def _astream_llm(self, messages: list, temperature: float = 0.7, max_tokens: int = 2000, use_cache: bool = True, response_format: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Stream a completion as text deltas from the shared async client.
+        
+        A cached response is yielded as a single chunk; a completed stream is
+        stored in the cache like a regular call.
+        """
+        cache_key, cached = self._cache_lookup(messages, temperature, max_tokens, use_cache, response_format)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        with self._api_errors("_astream_llm"):
+            stream = await self.async_client.chat.completions.create(
+                stream=True,
+                stream_options={"include_usage": True},
+                **self._completion_params(messages, temperature, max_tokens, response_format)
             )
-            return response.choices[0].message.content.strip()
+            async for chunk in stream:
+                if not chunk.choices:
+                    # The final chunk carries token usage and no choices
+                    self._record_usage(getattr(chunk, "usage", None))
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        if cache_key:
+            self.cache.set(cache_key, "".join(chunks).strip())
+
+    def _completion_params(self, messages: list, temperature: float, max_tokens: int, response_format: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Keyword arguments for chat.completions.create()"""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "timeout": 30.0,  # 30 second timeout
+            **({"response_format": response_format} if response_format else {})
+        }
+
+    def _cache_lookup(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool,
+        response_format: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """(cache key, cached response) for a request; both None when it is not cached"""
+        cache_key = self._cache_key(messages, temperature, max_tokens, response_format) if use_cache else None
+        if not cache_key:
+            return None, None
+        return cache_key, self.cache.get(cache_key)
+
+    @staticmethod
+    @contextmanager
+    def _api_errors(caller: str) -> Iterator[None]:
+        """Log an OpenAI API failure and re-raise it with a uniform message"""
+        try:
+            yield
         except Exception as e:
             error_msg = f"Error calling OpenAI API: {str(e)}"
-            print(f"ERROR in _call_llm: {error_msg}")
+            print(f"ERROR in {caller}: {error_msg}")
             raise Exception(error_msg)
 
+    @staticmethod
+    def _empty_usage() -> Dict[str, int]:
+        return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+    def reset_usage(self) -> Dict[str, int]:
+        """Return the token usage recorded so far and start counting from zero"""
+        usage, self.usage = self.usage, self._empty_usage()
+        return usage
+
+    def _record_usage(self, usage: Any) -> None:
+        """Add the usage block of an OpenAI response to this agent's totals"""
+        if usage is None:
+            return
+        self.usage["calls"] += 1
+        self.usage["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+        self.usage["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+        self.usage["total_tokens"] += getattr(usage, "total_tokens", 0) or 0
+
+    def _cache_key(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Response cache key for a request, or None when caching is disabled"""
+        if self.cache is None:
+            return None
+        extra = {"response_format": response_format} if response_format else {}
+        return LLMResponseCache.make_key(self.model, messages, temperature, max_tokens, **extra)
+
+    @staticmethod
+    def _strip_code_fences(response: str) -> str:
+        """Remove markdown code fences the model sometimes wraps around its output"""
+        response = response.strip()
+        if response.startswith("```json"):
+            response = response[7:]
+        if response.startswith("```"):
+            response = response[3:]
+        if response.endswith("```"):
+            response = response[:-3]
+        return response.strip()
+
+    @classmethod
+    def _parse_json_response(cls, response: str) -> Any:
+        """Parse a (possibly fenced) JSON response from the LLM"""
+        return json.loads(cls._strip_code_fences(response))
 
+    @staticmethod
+    def _iter_json_members(buffer: str, pos: int) -> Iterator[Tuple[str, Any, int]]:
+        """
+        Yield (key, value, next_pos) for each top-level member of a JSON object
+        that is fully present in a partially streamed buffer.
+        
+        Start with pos=0 and resume from the last next_pos as more text arrives.
+        Stops silently at the first incomplete member.
+        """
+        decoder = json.JSONDecoder()
+        length = len(buffer)
+        while True:
+            # Skip whitespace, the opening brace and separators
+            while pos < length and buffer[pos] in " \t\r\n{,`":
+                if buffer[pos] == "`":
+                    # Skip a ```json fence line
+                    newline = buffer.find("\n", pos)
+                    if newline == -1:
+                        return
+                    pos = newline
+                pos += 1
+            if pos >= length or buffer[pos] != '"':
+                return
+            try:
+                key, key_end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                return
+            colon = buffer.find(":", key_end)
+            if colon == -1:
+                return
+            value_start = colon + 1
+            while value_start < length and buffer[value_start] in " \t\r\n":
+                value_start += 1
+            try:
+                value, value_end = decoder.raw_decode(buffer, value_start)
+            except json.JSONDecodeError:
+                return
+            # A number at the end of the buffer may still be growing
+            if value_end >= length and isinstance(value, (int, float)) and not isinstance(value, bool):
+                return
+            yield key, value, value_end
+            pos = value_end
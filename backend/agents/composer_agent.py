@@ -4,7 +4,7 @@ Phase 7: Enhanced AI Prompt Strategy
 """
 
 import json
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List
 import sys
 import os
 
@@ -62,18 +62,52 @@ Return a JSON object with: title, summary, responsibilities, requirements, skill
             # Fallback tone instruction
             return "Professional tone: Clear, engaging, results-oriented. Use strong action verbs. Emphasize impact and opportunities."
 
-    def process(self, job_info: Dict[str, Any]) -> JobPost:
+    async def aprocess(self, job_info: Dict[str, Any], polished: bool = False) -> JobPost:
         """
         Compose a full hiring post from job information
         
         Args:
             job_info: Dictionary with extracted job information from Interview Agent
+            polished: Apply the Formatter Agent's rules in this same generation
+                (fused compose-and-polish) so no separate formatting pass is needed
         
         Returns:
             JobPost object with all fields populated
         """
-        # Build the prompt
-        system_prompt = self.get_system_prompt(job_info)
+        response = await self._acall_llm(self._build_messages(job_info, polished), **self._generation_params(polished))
+        return self._parse_post(response, job_info)
+    
+    async def astream(self, job_info: Dict[str, Any], polished: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of aprocess()
+        
+        Yields {"type": "section", "section": ..., "value": ...} as each top-level
+        field of the post finishes generating, then {"type": "post", "job_post": ...}
+        with the complete JobPost.
+        """
+        buffer = ""
+        pos = 0
+        async for delta in self._astream_llm(self._build_messages(job_info, polished), **self._generation_params(polished)):
+            buffer += delta
+            for key, value, pos in self._iter_json_members(buffer, pos):
+                yield {"type": "section", "section": key, "value": value}
+        yield {"type": "post", "job_post": self._parse_post(buffer, job_info)}
+    
+    @staticmethod
+    def _generation_params(polished: bool) -> Dict[str, Any]:
+        """LLM parameters for a plain draft or a fused, publication-ready post"""
+        if polished:
+            # Between the composer's 0.7 and the formatter's 0.5; JSON mode
+            # avoids losing the whole post to a malformed response
+            return {"temperature": 0.6, "max_tokens": 2000, "response_format": {"type": "json_object"}}
+        return {"temperature": 0.7, "max_tokens": 2000}
+    
+    def _build_messages(self, job_info: Dict[str, Any], polished: bool = False) -> List[Dict[str, str]]:
+        """Build the LLM messages for composing a post"""
+        if polished:
+            system_prompt = ComposerAgentPrompts.get_fused_prompt(job_info)
+        else:
+            system_prompt = self.get_system_prompt(job_info)
         
         try:
             user_prompt = ComposerAgentPrompts.get_user_prompt(job_info)
@@ -84,27 +118,15 @@ Return a JSON object with: title, summary, responsibilities, requirements, skill
 
 Remember to make it engaging and LinkedIn-optimized."""
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
-        
-        # Get response from LLM
-        response = self._call_llm(messages, temperature=0.7, max_tokens=2000)
-        
-        # Parse JSON response
+    
+    def _parse_post(self, response: str, job_info: Dict[str, Any]) -> JobPost:
+        """Parse the composer's JSON response into a JobPost"""
         try:
-            # Clean response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
-            post_data = json.loads(response)
+            post_data = self._parse_json_response(response)
             
             # Create JobPost object
             job_post = JobPost(
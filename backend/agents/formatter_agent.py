@@ -4,7 +4,7 @@ Phase 7: Enhanced AI Prompt Strategy
 """
 
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 import sys
 import os
 
@@ -42,7 +42,7 @@ class FormatterAgent(BaseAgent):
         """System prompt for the Formatter Agent"""
         return FormatterAgentPrompts.get_base_prompt()
 
-    def process(self, job_post: JobPost) -> JobPost:
+    async def aprocess(self, job_post: JobPost) -> JobPost:
         """
         Format and polish a JobPost
         
@@ -52,6 +52,11 @@ class FormatterAgent(BaseAgent):
         Returns:
             Formatted JobPost object
         """
+        response = await self._acall_llm(self._build_messages(job_post), temperature=0.5, max_tokens=2000)
+        return self._apply_formatting(job_post, response)
+    
+    def _build_messages(self, job_post: JobPost) -> List[Dict[str, str]]:
+        """Build the LLM messages for polishing a whole post"""
         # Convert JobPost to dict for processing
         post_dict = {
             "title": job_post.title or "",
@@ -78,27 +83,15 @@ Format and polish this hiring post. Make it clean, professional, and LinkedIn-re
 
 Return the formatted version in the same JSON structure."""
 
-        messages = [
+        return [
             {"role": "system", "content": self.get_system_prompt()},
             {"role": "user", "content": user_prompt}
         ]
-        
-        # Get response from LLM
-        response = self._call_llm(messages, temperature=0.5, max_tokens=2000)
-        
-        # Parse JSON response
+    
+    def _apply_formatting(self, job_post: JobPost, response: str) -> JobPost:
+        """Apply the formatter's JSON response to the JobPost"""
         try:
-            # Clean response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
-            formatted_data = json.loads(response)
+            formatted_data = self._parse_json_response(response)
             
             # Update JobPost with formatted content
             job_post.title = formatted_data.get("title", job_post.title)
@@ -117,7 +110,7 @@ Return the formatted version in the same JSON structure."""
             # If parsing fails, return original post
             return job_post
     
-    def format_section(self, section_type: str, content: Any) -> Any:
+    async def aformat_section(self, section_type: str, content: Any) -> Any:
         """
         Format a specific section of the post
         
@@ -128,6 +121,11 @@ Return the formatted version in the same JSON structure."""
         Returns:
             Formatted content
         """
+        response = await self._acall_llm(self._build_section_messages(section_type, content), temperature=0.5, max_tokens=1000)
+        return self._parse_section(response, content)
+    
+    def _build_section_messages(self, section_type: str, content: Any) -> List[Dict[str, str]]:
+        """Build the LLM messages for formatting a single section"""
         try:
             section_prompt = FormatterAgentPrompts.get_section_formatting_prompt(section_type)
             base_prompt = FormatterAgentPrompts.get_base_prompt()
@@ -142,27 +140,17 @@ Content to format:
 
 Return the formatted version. If it's a list, return a JSON array. If it's text, return the formatted text string."""
 
-        messages = [
+        return [
             {"role": "system", "content": base_prompt},
             {"role": "user", "content": prompt}
         ]
-        
-        response = self._call_llm(messages, temperature=0.5, max_tokens=1000)
-        
+    
+    def _parse_section(self, response: str, content: Any) -> Any:
+        """Parse a formatted section, keeping the original content on failure"""
         try:
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
             if isinstance(content, list):
-                return json.loads(response)
+                return self._parse_json_response(response)
             else:
-                return response.strip()
+                return self._strip_code_fences(response)
         except:
             return content
-
@@ -4,7 +4,8 @@ Phase 7: Enhanced AI Prompt Strategy
 """
 
 import json
-from typing import Dict, Any, List, Optional
+import os
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 try:
     from .base import BaseAgent
     from .prompts import InterviewAgentPrompts
@@ -13,6 +14,9 @@ except ImportError:
     from prompts import InterviewAgentPrompts
 
 
+COMPLETION_MARKER = "[INTERVIEW_COMPLETE]"
+
+
 class InterviewAgent(BaseAgent):
     """
     Interview Agent:
@@ -22,22 +26,37 @@ class InterviewAgent(BaseAgent):
     - Stops only when it has all job information
     """
     
-    def __init__(self):
+    def __init__(self, single_call: Optional[bool] = None):
         super().__init__()
         self.questions_asked = []
-        self.conversation_history = []
+        # Single-call mode: one LLM call returns both the reply and the extracted job info.
+        # Set INTERVIEW_SINGLE_CALL=false to fall back to separate reply + extraction calls.
+        if single_call is None:
+            single_call = os.getenv("INTERVIEW_SINGLE_CALL", "true").lower() in ("1", "true", "yes")
+        self.single_call = single_call
     
     def get_system_prompt(self) -> str:
         """System prompt for the Interview Agent"""
         return InterviewAgentPrompts.get_base_prompt()
 
-    def process(self, user_message: str, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
+    async def aprocess(
+        self,
+        user_message: str,
+        conversation_history: List[Dict[str, str]],
+        previous_job_info: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Process user message and generate next question or completion signal
         
+        Keeps all per-turn state local so a single shared agent can serve
+        many interviews concurrently on one event loop.
+        
         Args:
             user_message: The user's response
             conversation_history: List of previous messages in format [{"role": "user/assistant", "content": "..."}]
+            previous_job_info: Job info extracted on the previous turn. When given, only the
+                latest exchange is sent for extraction and the result is merged into it;
+                when None, job info is re-extracted from the full conversation.
         
         Returns:
             Dict with:
@@ -45,50 +64,116 @@ class InterviewAgent(BaseAgent):
                 - is_complete: Boolean indicating if interview is done
                 - extracted_info: Dict with extracted job information
         """
-        print(f"DEBUG [InterviewAgent.process]: Starting with user_message={user_message[:50]}")
-        
-        # Check if user is asking for help/suggestions
         help_section = InterviewAgentPrompts.detect_help_request(user_message)
         
         if help_section:
-            print(f"DEBUG [InterviewAgent.process]: User asking for help with: {help_section}")
-            # Extract current job info to provide contextual suggestions
-            extracted_info = self._extract_job_info_from_history(conversation_history)
-            
-            # Generate suggestions for the requested section
-            suggestion_prompt = InterviewAgentPrompts.get_help_suggestions_prompt(extracted_info, help_section)
-            
+            if previous_job_info is not None:
+                extracted_info = previous_job_info
+            else:
+                extracted_info = await self._aextract_job_info_from_history(conversation_history)
             try:
-                suggestions = self._call_llm(
-                    [{"role": "user", "content": suggestion_prompt}],
+                suggestions = await self._acall_llm(
+                    self._build_suggestion_messages(extracted_info, help_section),
                     temperature=0.8,
                     max_tokens=800
                 )
-                
-                response = f"Great question! Here are some suggestions for {help_section} for a {extracted_info.get('seniority_level', 'mid-level')} {extracted_info.get('job_title', 'position')}:\n\n{suggestions}\n\nFeel free to use these as inspiration or provide your own details. What would you like to include?"
-                
-                return {
-                    "response": response,
-                    "is_complete": False,
-                    "extracted_info": extracted_info,
-                    "conversation_history": conversation_history + [
-                        {"role": "user", "content": user_message},
-                        {"role": "assistant", "content": response}
-                    ]
-                }
+                return self._build_help_result(user_message, conversation_history, extracted_info, help_section, suggestions)
             except Exception as e:
-                print(f"DEBUG [InterviewAgent.process]: Error generating suggestions: {e}")
-                # Fall through to normal flow if suggestions fail
-                pass
+                print(f"DEBUG [InterviewAgent.aprocess]: Error generating suggestions: {e}")
+        
+        history = conversation_history + [{"role": "user", "content": user_message}]
         
-        # Add user message to conversation
-        self.conversation_history = conversation_history + [{"role": "user", "content": user_message}]
-        print(f"DEBUG [InterviewAgent.process]: conversation_history length={len(self.conversation_history)}")
+        if self.single_call:
+            single_result = await self._asingle_call_turn(history, previous_job_info)
+            if single_result:
+                return single_result
+        
+        response = await self._acall_llm(self._build_interview_messages(history), temperature=0.7, max_tokens=500)
+        if previous_job_info is not None:
+            extracted_info = await self._aextract_job_info_incremental(previous_job_info, self._latest_exchange(history))
+        else:
+            extracted_info = await self._aextract_job_info_from_history(history)
+        
+        return self._build_turn_result(response, history, extracted_info)
+    
+    async def astream(
+        self,
+        user_message: str,
+        conversation_history: List[Dict[str, str]],
+        previous_job_info: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of aprocess()
+        
+        Yields {"type": "token", "text": ...} events as the reply is generated,
+        then one {"type": "result", "result": ...} with the same dict aprocess()
+        returns. The reply is streamed as plain text, so this always uses the
+        reply + extraction path rather than the single-call JSON mode.
+        """
+        if InterviewAgentPrompts.detect_help_request(user_message):
+            result = await self.aprocess(user_message, conversation_history, previous_job_info)
+            yield {"type": "token", "text": result["response"]}
+            yield {"type": "result", "result": result}
+            return
+        
+        history = conversation_history + [{"role": "user", "content": user_message}]
+        chunks = []
+        emitted = 0
+        async for delta in self._astream_llm(self._build_interview_messages(history), temperature=0.7, max_tokens=500):
+            chunks.append(delta)
+            visible = self._hold_back_marker("".join(chunks))
+            if len(visible) > emitted:
+                yield {"type": "token", "text": visible[emitted:]}
+                emitted = len(visible)
+        response = "".join(chunks).strip()
+        
+        if previous_job_info is not None:
+            extracted_info = await self._aextract_job_info_incremental(previous_job_info, self._latest_exchange(history))
+        else:
+            extracted_info = await self._aextract_job_info_from_history(history)
+        
+        yield {"type": "result", "result": self._build_turn_result(response, history, extracted_info)}
+    
+    @staticmethod
+    def _hold_back_marker(text: str) -> str:
+        """Streamed text that is safe to show: the completion marker removed and any partial marker at the end held back"""
+        text = text.replace(COMPLETION_MARKER, "")
+        for size in range(min(len(COMPLETION_MARKER) - 1, len(text)), 0, -1):
+            if COMPLETION_MARKER.startswith(text[-size:]):
+                return text[:-size]
+        return text
+    
+    def _build_suggestion_messages(self, extracted_info: Dict[str, Any], help_section: str) -> List[Dict[str, str]]:
+        """Build the LLM messages for a help/suggestions request"""
+        suggestion_prompt = InterviewAgentPrompts.get_help_suggestions_prompt(extracted_info, help_section)
+        return [{"role": "user", "content": suggestion_prompt}]
+    
+    def _build_help_result(
+        self,
+        user_message: str,
+        conversation_history: List[Dict[str, str]],
+        extracted_info: Dict[str, Any],
+        help_section: str,
+        suggestions: str
+    ) -> Dict[str, Any]:
+        """Wrap generated suggestions into a turn result"""
+        response = f"Great question! Here are some suggestions for {help_section} for a {extracted_info.get('seniority_level', 'mid-level')} {extracted_info.get('job_title', 'position')}:\n\n{suggestions}\n\nFeel free to use these as inspiration or provide your own details. What would you like to include?"
         
-        # Build messages for LLM
+        return {
+            "response": response,
+            "is_complete": False,
+            "extracted_info": extracted_info,
+            "conversation_history": conversation_history + [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": response}
+            ]
+        }
+    
+    def _build_interview_messages(self, conversation_history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build the LLM messages for generating the next interview question"""
         messages = [
             {"role": "system", "content": self.get_system_prompt()}
-        ] + self.conversation_history
+        ] + conversation_history
         
         # Add instruction to check if we have enough info
         try:
@@ -101,40 +186,168 @@ class InterviewAgent(BaseAgent):
             "role": "system",
             "content": completion_prompt
         })
+        return messages
+    
+    async def _asingle_call_turn(
+        self,
+        conversation_history: List[Dict[str, str]],
+        previous_job_info: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate the reply and extract job info with one LLM call.
         
-        # Get response from LLM
-        print(f"DEBUG [InterviewAgent.process]: Calling LLM with {len(messages)} messages")
+        Returns None if the structured response could not be used, so the
+        caller falls back to the two-call path.
+        """
         try:
-            response = self._call_llm(messages, temperature=0.7, max_tokens=500)
-            print(f"DEBUG [InterviewAgent.process]: LLM returned response of length {len(response)}")
+            response = await self._acall_llm(
+                self._build_single_call_messages(conversation_history, previous_job_info),
+                temperature=0.7,
+                max_tokens=1500,
+                response_format={"type": "json_object"}
+            )
         except Exception as e:
-            print(f"DEBUG [InterviewAgent.process]: ERROR in _call_llm: {e}")
-            raise
-        
-        # Check if interview is complete
-        is_complete = "[INTERVIEW_COMPLETE]" in response
-        if is_complete:
-            response = response.replace("[INTERVIEW_COMPLETE]", "").strip()
-        
-        # Extract information from conversation
-        print(f"DEBUG [InterviewAgent.process]: Extracting job info...")
-        extracted_info = self._extract_job_info()
-        print(f"DEBUG [InterviewAgent.process]: Extracted info keys: {list(extracted_info.keys())}")
+            print(f"DEBUG [InterviewAgent._asingle_call_turn]: Falling back to two calls: {e}")
+            return None
+        parsed = self._parse_single_call_response(response, previous_job_info)
+        if not parsed:
+            return None
+        reply, is_complete, extracted_info = parsed
+        return self._build_turn_result(reply, conversation_history, extracted_info, is_complete)
+    
+    def _build_single_call_messages(
+        self,
+        conversation_history: List[Dict[str, str]],
+        previous_job_info: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, str]]:
+        """Build the LLM messages for a combined reply + extraction turn"""
+        if previous_job_info is None:
+            instruction = InterviewAgentPrompts.get_single_call_prompt()
+        else:
+            instruction = InterviewAgentPrompts.get_incremental_single_call_prompt(previous_job_info)
+        return [
+            {"role": "system", "content": self.get_system_prompt()}
+        ] + conversation_history + [
+            {"role": "system", "content": instruction}
+        ]
+    
+    def _parse_single_call_response(
+        self,
+        response: str,
+        previous_job_info: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[str, bool, Dict[str, Any]]]:
+        """Parse a combined turn response into (reply, is_complete, job_info)"""
+        try:
+            data = self._parse_json_response(response)
+        except json.JSONDecodeError as e:
+            print(f"DEBUG [InterviewAgent]: Single-call response was not valid JSON: {e}")
+            return None
+        reply = data.get("reply") if isinstance(data, dict) else None
+        if not isinstance(reply, str) or not reply.strip():
+            return None
+        if previous_job_info is not None:
+            updates = data.get("job_info_updates")
+            job_info = self._merge_job_info(previous_job_info, updates if isinstance(updates, dict) else {})
+        else:
+            job_info = data.get("job_info")
+            if not isinstance(job_info, dict):
+                job_info = self._empty_job_info()
+        is_complete = data.get("is_complete") is True or COMPLETION_MARKER in reply
+        return reply, is_complete, job_info
+    
+    def _build_turn_result(
+        self,
+        response: str,
+        conversation_history: List[Dict[str, str]],
+        extracted_info: Dict[str, Any],
+        is_complete: bool = False
+    ) -> Dict[str, Any]:
+        """Detect the completion marker and assemble the turn result"""
+        is_complete = is_complete or COMPLETION_MARKER in response
+        response = response.replace(COMPLETION_MARKER, "").strip()
         
         return {
             "response": response,
             "is_complete": is_complete,
             "extracted_info": extracted_info,
-            "conversation_history": self.conversation_history + [{"role": "assistant", "content": response}]
+            "conversation_history": conversation_history + [{"role": "assistant", "content": response}]
         }
     
-    def _extract_job_info(self) -> Dict[str, Any]:
-        """Extract structured job information from conversation"""
-        return self._extract_job_info_from_history(self.conversation_history)
-    
-    def _extract_job_info_from_history(self, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
+    async def _aextract_job_info_from_history(self, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
         """Extract structured job information from given conversation history"""
-        # Use LLM to extract structured information
+        try:
+            response = await self._acall_llm(
+                self._build_extraction_messages(conversation_history),
+                temperature=0.3,
+                max_tokens=1000
+            )
+            return self._parse_json_response(response)
+        except Exception as e:
+            return self._empty_job_info()
+    
+    async def _aextract_job_info_incremental(
+        self,
+        previous_job_info: Dict[str, Any],
+        new_messages: List[Dict[str, str]]
+    ) -> Dict[str, Any]:
+        """
+        Update previously extracted job info from the latest exchange only.
+        
+        The prompt holds the previous structured state plus the new messages, so its
+        size does not grow with the length of the interview. Keeps the previous
+        state if the model's patch cannot be parsed.
+        """
+        try:
+            response = await self._acall_llm(
+                self._build_incremental_extraction_messages(previous_job_info, new_messages),
+                temperature=0.3,
+                max_tokens=1000
+            )
+            patch = self._parse_json_response(response)
+        except Exception as e:
+            print(f"DEBUG [InterviewAgent]: Incremental extraction failed, keeping previous job info: {e}")
+            return dict(previous_job_info)
+        return self._merge_job_info(previous_job_info, patch if isinstance(patch, dict) else {})
+    
+    def _build_incremental_extraction_messages(
+        self,
+        previous_job_info: Dict[str, Any],
+        new_messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Build the LLM messages for extracting a job info patch from the latest exchange"""
+        prompt = f"""{InterviewAgentPrompts.get_incremental_extraction_prompt()}
+
+Current job information:
+{json.dumps(previous_job_info)}
+
+New messages:
+{json.dumps(new_messages)}"""
+        return [{"role": "user", "content": prompt}]
+    
+    @staticmethod
+    def _latest_exchange(conversation_history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """The newest user message plus the assistant question it answers"""
+        if len(conversation_history) >= 2 and conversation_history[-2].get("role") == "assistant":
+            return conversation_history[-2:]
+        return conversation_history[-1:]
+    
+    @staticmethod
+    def _merge_job_info(previous_job_info: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge an extraction patch into the previous job info.
+        
+        Fields present in the patch replace the previous value (lists are sent
+        complete); null values mean "no change".
+        """
+        merged = dict(previous_job_info)
+        for key, value in patch.items():
+            if value is None:
+                continue
+            merged[key] = value
+        return merged
+    
+    def _build_extraction_messages(self, conversation_history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build the LLM messages for structured job info extraction"""
         try:
             extraction_base = InterviewAgentPrompts.get_extraction_prompt()
         except:
@@ -160,39 +373,24 @@ Return ONLY the JSON, no other text."""
 
 Conversation:
 {json.dumps(conversation_history, indent=2)}"""
-
-        try:
-            response = self._call_llm(
-                [{"role": "user", "content": extraction_prompt}],
-                temperature=0.3,
-                max_tokens=1000
-            )
-            # Clean response to get JSON
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
-            extracted = json.loads(response)
-            return extracted
-        except Exception as e:
-            # Fallback: return empty structure
-            return {
-                "job_title": None,
-                "company": None,
-                "location": None,
-                "job_type": None,
-                "seniority_level": None,
-                "responsibilities": [],
-                "requirements": [],
-                "skills": [],
-                "preferred_skills": [],
-                "other_info": None
-            }
+        
+        return [{"role": "user", "content": extraction_prompt}]
+    
+    @staticmethod
+    def _empty_job_info() -> Dict[str, Any]:
+        """Empty extraction result used when the LLM output cannot be parsed"""
+        return {
+            "job_title": None,
+            "company": None,
+            "location": None,
+            "job_type": None,
+            "seniority_level": None,
+            "responsibilities": [],
+            "requirements": [],
+            "skills": [],
+            "preferred_skills": [],
+            "other_info": None
+        }
     
     def get_initial_question(self) -> str:
         """Get the first question to start the interview"""
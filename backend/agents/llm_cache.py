@@ -0,0 +1,115 @@
+"""
+Content-addressed cache for LLM responses
+Repeated identical prompts (e.g. regenerating the same section twice) are
+served from cache instead of paying for another completion.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    from ..cache import LRUCache, SQLiteCache
+except ImportError:
+    from cache import LRUCache, SQLiteCache
+
+
+class LLMResponseCache:
+    """
+    Two-tier response cache keyed on a hash of the request.
+
+    Tier 1 is an in-memory LRU; tier 2 is an optional SQLite file shared
+    across restarts and workers. Disk hits are promoted to memory.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: float,
+        max_tokens: int,
+        **extra: Any
+    ) -> str:
+        """Stable SHA-256 key over everything that affects the completion"""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if extra:
+            payload["extra"] = extra
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response in memory, then on disk"""
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response in every tier"""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Overall and per-tier hit/miss counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache, configured from the environment.
+
+    Returns None when LLM_CACHE_ENABLED is false.
+    """
+    global _llm_cache
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    if _llm_cache is None:
+        ttl = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+        memory = LRUCache(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+            ttl_seconds=ttl,
+        )
+        disk = None
+        db_path = os.getenv("LLM_CACHE_DB_PATH")
+        if db_path:
+            disk = SQLiteCache(
+                db_path,
+                table="llm_responses",
+                max_entries=int(os.getenv("LLM_CACHE_DB_MAX_ENTRIES", "10000")),
+                ttl_seconds=ttl,
+            )
+        _llm_cache = LLMResponseCache(memory, disk)
+    return _llm_cache
@@ -3,8 +3,9 @@ Agent Orchestrator - Coordinates all three AI agents
 Phase 3: AI Logic Design
 """
 
+import asyncio
 import json
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 import sys
 import os
 
@@ -16,17 +17,20 @@ try:
     from .interview_agent import InterviewAgent
     from .composer_agent import ComposerAgent
     from .formatter_agent import FormatterAgent
+    from .session_store import SessionStateStore
     from ..models import JobPost
 except ImportError:
     try:
         from interview_agent import InterviewAgent
         from composer_agent import ComposerAgent
         from formatter_agent import FormatterAgent
+        from session_store import SessionStateStore
     except ImportError:
         # If agents are in agents package
         from agents.interview_agent import InterviewAgent
         from agents.composer_agent import ComposerAgent
         from agents.formatter_agent import FormatterAgent
+        from agents.session_store import SessionStateStore
     from models import JobPost
 
 
@@ -38,11 +42,26 @@ class AgentOrchestrator:
     3. Formatter Agent - polishes the post
     """
     
-    def __init__(self):
+    # Sections regenerated through FormatterAgent.format_section
+    FORMATTED_SECTIONS = ("summary", "culture_and_team", "responsibilities", "requirements", "skills")
+    # Every section that can be regenerated
+    REGENERABLE_SECTIONS = FORMATTED_SECTIONS + ("hashtags", "keywords")
+    
+    # Post pipeline modes: "fused" composes a polished post in one generation,
+    # "quality" keeps the separate Composer -> Formatter passes
+    POST_PIPELINE_MODES = ("fused", "quality")
+    
+    def __init__(self, session_store: Optional[SessionStateStore] = None, post_pipeline_mode: Optional[str] = None):
         self._interview_agent = None
         self._composer_agent = None
         self._formatter_agent = None
-        self.current_session: Optional[Dict[str, Any]] = None
+        # Live state for every in-flight interview, keyed by session_id
+        self.sessions = session_store if session_store is not None else SessionStateStore.from_env()
+        if post_pipeline_mode is None:
+            post_pipeline_mode = os.getenv("POST_PIPELINE_MODE", "fused").lower()
+        if post_pipeline_mode not in self.POST_PIPELINE_MODES:
+            raise ValueError(f"Unknown post pipeline mode: {post_pipeline_mode}")
+        self.post_pipeline_mode = post_pipeline_mode
     
     @property
     def interview_agent(self):
@@ -72,14 +91,6 @@ class AgentOrchestrator:
         Returns:
             Dict with initial question and session info
         """
-        self.current_session = {
-            "session_id": session_id,
-            "conversation_history": [],
-            "job_info": {},
-            "is_complete": False,
-            "job_post": None
-        }
-        
         initial_question = self.interview_agent.get_initial_question()
         
         return {
@@ -89,63 +100,161 @@ class AgentOrchestrator:
             "job_post": None
         }
     
-    def process_message(self, session_id: str, user_message: str, conversation_history: List[dict]) -> Dict[str, Any]:
+    def get_session(self, session_id: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the live state of a session
+        
+        Args:
+            session_id: Session identifier
+            version: Version of the stored chat session; state recorded for
+                another version (e.g. a later turn saved by another worker) is ignored
+        
+        Returns:
+            State dict (job_info, is_complete, job_post, version) or None
+        """
+        return self.sessions.get(session_id, version=version)
+    
+    def record_turn(self, session_id: str, result: Dict[str, Any], version: Optional[str] = None) -> None:
+        """
+        Store the live state of a turn once it has been saved
+        
+        The aprocess_message / astream_message methods only build the result; call this after
+        the turn's transaction commits so a failed save leaves no state behind.
+        
+        Args:
+            session_id: Session identifier
+            result: The result dict returned by aprocess_message / astream_message
+            version: Version of the saved chat session (see get_session)
+        """
+        job_post = result.get("job_post")
+        state = SessionStateStore.new_state(session_id)
+        state.update({
+            "job_info": result.get("job_info") or {},
+            "is_complete": bool(result.get("is_complete")),
+            "job_post": JobPost(**job_post) if isinstance(job_post, dict) else job_post,
+            "version": version
+        })
+        self.sessions.save(state)
+    
+    async def aprocess_message(
+        self,
+        session_id: str,
+        user_message: str,
+        conversation_history: List[dict],
+        previous_job_info: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Process a user message through the agent pipeline
         
+        Awaits every LLM call so the event loop can serve other interviews
+        while this one waits on the model.
+        
         Args:
             session_id: Session identifier
             user_message: User's message
             conversation_history: Previous conversation messages
+            previous_job_info: Job info extracted on the previous turn (enables incremental extraction)
         
         Returns:
             Dict with agent response, completion status, and updated job post
         """
-        if not self.current_session or self.current_session["session_id"] != session_id:
-            # Start new session if needed
-            self.start_session(session_id)
-        
         # Step 1: Interview Agent processes the message
-        # conversation_history is already in dict format
-        interview_result = self.interview_agent.process(user_message, conversation_history)
+        interview_result = await self.interview_agent.aprocess(user_message, conversation_history, previous_job_info)
+        
+        job_post = None
+        if interview_result["is_complete"]:
+            # Steps 2-3: compose and polish the full post
+            job_post = await self.acompose_post(interview_result["extracted_info"])
         
-        # Update session state
-        self.current_session["conversation_history"] = interview_result["conversation_history"]
-        self.current_session["job_info"] = interview_result["extracted_info"]
+        return self._finish_turn(session_id, interview_result, job_post)
+    
+    async def astream_message(
+        self,
+        session_id: str,
+        user_message: str,
+        conversation_history: List[dict],
+        previous_job_info: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of aprocess_message()
         
-        # BUILD LIVE PREVIEW: Create partial JobPost as user answers
-        live_preview_job_post = self._build_live_preview(interview_result["extracted_info"])
+        Yields {"event": ..., "data": ...} dicts:
+        - token: interviewer reply text as it arrives
+        - preview: live preview JobPost built from the extracted job info
+        - section: each post section as the Composer Agent finishes it
+        - done: the same result dict aprocess_message() returns
+        """
+        interview_result = None
+        async for event in self.interview_agent.astream(user_message, conversation_history, previous_job_info):
+            if event["type"] == "token":
+                yield {"event": "token", "data": {"text": event["text"]}}
+            else:
+                interview_result = event["result"]
         
-    # If interview is complete, move to composition
+        live_preview_job_post = self.build_live_preview(interview_result["extracted_info"])
+        yield {"event": "preview", "data": {"job_post": live_preview_job_post.model_dump(mode="json")}}
+        
+        job_post = None
         if interview_result["is_complete"]:
-            self.current_session["is_complete"] = True
-            
-            # Step 2: Composer Agent creates the full post
-            job_post = self.composer_agent.process(interview_result["extracted_info"])
-            
-            # Step 3: Formatter Agent polishes the post
-            job_post = self.formatter_agent.process(job_post)
-            
-            self.current_session["job_post"] = job_post
-            
+            fused = self.post_pipeline_mode == "fused"
+            async for event in self.composer_agent.astream(interview_result["extracted_info"], polished=fused):
+                if event["type"] == "section":
+                    yield {"event": "section", "data": {"section": event["section"], "value": event["value"]}}
+                else:
+                    job_post = event["job_post"]
+            if not fused:
+                job_post = await self.formatter_agent.aprocess(job_post)
+        
+        yield {"event": "done", "data": self._finish_turn(session_id, interview_result, job_post)}
+    
+    async def acompose_post(self, job_info: Dict[str, Any]) -> JobPost:
+        """
+        Build the final post from the extracted job info
+        
+        In "fused" mode the Composer Agent writes an already-polished post in a
+        single generation; in "quality" mode the draft gets a full Formatter pass.
+        """
+        if self.post_pipeline_mode == "fused":
+            return await self.composer_agent.aprocess(job_info, polished=True)
+        
+        # Step 2: Composer Agent creates the full post
+        job_post = await self.composer_agent.aprocess(job_info)
+        # Step 3: Formatter Agent polishes the post
+        return await self.formatter_agent.aprocess(job_post)
+    
+    def _finish_turn(self, session_id: str, interview_result: Dict[str, Any], job_post: Optional[JobPost]) -> Dict[str, Any]:
+        """
+        Build the API result for a turn (its state is stored by record_turn once saved)
+        
+        Args:
+            session_id: Session identifier
+            interview_result: Result from the Interview Agent
+            job_post: Composed post when the interview is complete, else None
+        
+        Returns:
+            Dict with agent response, completion status, and updated job post
+        """
+        if job_post is not None:
             return {
                 "session_id": session_id,
                 "response": interview_result["response"] + "\n\nGreat! I've created your hiring post. Check the preview on the right!",
                 "is_complete": True,
+                "job_info": interview_result["extracted_info"],
                 "job_post": job_post.model_dump() if hasattr(job_post, 'model_dump') else job_post.dict() if hasattr(job_post, 'dict') else job_post
             }
         else:
-            # Save partial job_post into session so preview endpoint can access it
-            self.current_session["job_post"] = live_preview_job_post
+            # BUILD LIVE PREVIEW: Create partial JobPost as user answers
+            live_preview_job_post = self.build_live_preview(interview_result["extracted_info"])
             # Interview still in progress - return live preview
             return {
                 "session_id": session_id,
                 "response": interview_result["response"],
                 "is_complete": False,
+                "job_info": interview_result["extracted_info"],
                 "job_post": live_preview_job_post.model_dump() if hasattr(live_preview_job_post, 'model_dump') else live_preview_job_post.dict() if hasattr(live_preview_job_post, 'dict') else live_preview_job_post
             }
     
-    def regenerate_section(self, session_id: str, section_type: str, job_post: JobPost) -> JobPost:
+    async def aregenerate_section(self, session_id: str, section_type: str, job_post: JobPost) -> JobPost:
         """
         Regenerate a specific section of the post
         
@@ -157,33 +266,83 @@ class AgentOrchestrator:
         Returns:
             Updated JobPost with regenerated section
         """
-        if section_type == "summary":
-            job_post.summary = self.formatter_agent.format_section("summary", job_post.summary)
-        elif section_type == "culture_and_team":
-            job_post.culture_and_team = self.formatter_agent.format_section("culture_and_team", job_post.culture_and_team)
-        elif section_type == "responsibilities":
-            job_post.responsibilities = self.formatter_agent.format_section("responsibilities", job_post.responsibilities)
-        elif section_type == "requirements":
-            job_post.requirements = self.formatter_agent.format_section("requirements", job_post.requirements)
-        elif section_type == "skills":
-            job_post.skills = self.formatter_agent.format_section("skills", job_post.skills)
-        elif section_type == "hashtags":
-            # Regenerate hashtags based on current post content
-            hashtags = self._regenerate_hashtags(job_post)
-            job_post.hashtags = hashtags
-        elif section_type == "keywords":
-            # Regenerate keywords based on current post content
-            keywords = self._regenerate_keywords(job_post)
-            job_post.keywords = keywords
+        if section_type in self.REGENERABLE_SECTIONS:
+            setattr(job_post, section_type, await self._aregenerate_section_value(section_type, job_post))
         
         # Re-format the entire post after regeneration
-        job_post = self.formatter_agent.process(job_post)
+        return await self.formatter_agent.aprocess(job_post)
+    
+    async def aregenerate_sections(
+        self,
+        session_id: str,
+        section_types: List[str],
+        job_post: JobPost,
+        reformat: bool = False,
+        max_concurrency: Optional[int] = None
+    ) -> JobPost:
+        """
+        Regenerate several sections of the post concurrently
+        
+        Every section is regenerated from the post as it was before this call,
+        with at most max_concurrency LLM calls in flight (REGENERATE_MAX_CONCURRENCY,
+        default 4). The whole-post Formatter pass only runs when reformat is True.
+        
+        Args:
+            session_id: Session identifier
+            section_types: Sections to regenerate (duplicates are ignored)
+            job_post: Current job post
+            reformat: Re-format the entire post after regeneration
+            max_concurrency: Limit on concurrent section regenerations
+        
+        Returns:
+            Updated JobPost with the regenerated sections
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("REGENERATE_MAX_CONCURRENCY", "4"))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        sections = [s for s in dict.fromkeys(section_types) if s in self.REGENERABLE_SECTIONS]
+        
+        async def regenerate(section_type: str) -> Any:
+            async with semaphore:
+                return await self._aregenerate_section_value(section_type, job_post)
         
+        values = await asyncio.gather(*(regenerate(section_type) for section_type in sections))
+        
+        job_post = job_post.model_copy(update=dict(zip(sections, values)))
+        if reformat:
+            job_post = await self.formatter_agent.aprocess(job_post)
         return job_post
     
-    def _regenerate_hashtags(self, job_post: JobPost) -> List[str]:
+    async def _aregenerate_section_value(self, section_type: str, job_post: JobPost) -> Any:
+        """New value for one regenerable section, computed from the current post"""
+        if section_type == "hashtags":
+            return await self._aregenerate_hashtags(job_post)
+        if section_type == "keywords":
+            return await self._aregenerate_keywords(job_post)
+        return await self.formatter_agent.aformat_section(section_type, getattr(job_post, section_type))
+    
+    async def _aregenerate_hashtags(self, job_post: JobPost) -> List[str]:
         """Regenerate hashtags for the post"""
-        prompt = f"""Generate 5-8 relevant LinkedIn hashtags for this job post:
+        response = await self.formatter_agent._acall_llm(
+            [{"role": "user", "content": self._build_hashtags_prompt(job_post)}],
+            temperature=0.7,
+            max_tokens=200
+        )
+        return self._parse_list_response(response, job_post.hashtags)
+    
+    async def _aregenerate_keywords(self, job_post: JobPost) -> List[str]:
+        """Regenerate keywords for the post"""
+        response = await self.formatter_agent._acall_llm(
+            [{"role": "user", "content": self._build_keywords_prompt(job_post)}],
+            temperature=0.7,
+            max_tokens=200
+        )
+        return self._parse_list_response(response, job_post.keywords)
+    
+    @staticmethod
+    def _build_hashtags_prompt(job_post: JobPost) -> str:
+        """Prompt for regenerating hashtags"""
+        return f"""Generate 5-8 relevant LinkedIn hashtags for this job post:
 
 Title: {job_post.title}
 Summary: {job_post.summary}
@@ -191,29 +350,11 @@ Skills: {', '.join(job_post.skills[:5])}
 
 Return ONLY a JSON array of hashtag strings (without the # symbol), no other text.
 Example: ["hiring", "techjobs", "softwareengineer"]"""
-
-        response = self.formatter_agent._call_llm(
-            [{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=200
-        )
-        
-        try:
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            return json.loads(response)
-        except:
-            return job_post.hashtags
     
-    def _regenerate_keywords(self, job_post: JobPost) -> List[str]:
-        """Regenerate keywords for the post"""
-        prompt = f"""Generate 5-10 LinkedIn-optimized keywords for this job post:
+    @staticmethod
+    def _build_keywords_prompt(job_post: JobPost) -> str:
+        """Prompt for regenerating keywords"""
+        return f"""Generate 5-10 LinkedIn-optimized keywords for this job post:
 
 Title: {job_post.title}
 Summary: {job_post.summary}
@@ -221,26 +362,15 @@ Skills: {', '.join(job_post.skills[:5])}
 
 Return ONLY a JSON array of keyword strings, no other text.
 Example: ["software engineer", "python", "remote work"]"""
-
-        response = self.formatter_agent._call_llm(
-            [{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=200
-        )
-        
+    
+    def _parse_list_response(self, response: str, fallback: List[str]) -> List[str]:
+        """Parse a JSON array response, keeping the current value on failure"""
         try:
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response.strip()
-            return json.loads(response)
+            return self.formatter_agent._parse_json_response(response)
         except:
-            return job_post.keywords
+            return fallback
 
-    def _build_live_preview(self, extracted_info: Dict[str, Any]) -> JobPost:
+    def build_live_preview(self, extracted_info: Dict[str, Any]) -> JobPost:
         """
         Build a live preview JobPost from partially extracted information during interview
         This shows the user what we've collected so far as they answer questions
@@ -4,6 +4,7 @@ Phase 7: AI Prompt Strategy
 Centralized prompt management for all agents
 """
 
+import json
 from typing import Optional
 
 
@@ -91,6 +92,70 @@ Extract and return ONLY a JSON object with this structure:
 
 Return ONLY the JSON, no other text."""
 
+    @staticmethod
+    def get_single_call_prompt() -> str:
+        """Prompt for generating the next question and the extracted job info in one response"""
+        return """Respond with a single JSON object (no other text) with exactly these keys:
+{
+    "reply": "your next message to the HR - one question at a time, following the interview flow",
+    "is_complete": true or false (true only when the completion criteria are met),
+    "job_info": {
+        "job_title": "string or null",
+        "company": "string or null",
+        "location": "string or null",
+        "job_type": "string or null",
+        "workplace_type": "string or null",
+        "seniority_level": "string or null",
+        "work_arrangement": "string or null",
+        "tone_type": "string or null",
+        "responsibilities": ["string"],
+        "requirements": ["string"],
+        "skills": ["string"],
+        "preferred_skills": ["string"],
+        "culture_and_team": "string or null",
+        "keywords": ["string"],
+        "hashtags": ["string"],
+        "compensation_info": "string or null",
+        "other_info": "string or null"
+    }
+}
+
+"job_info" must contain everything the HR has told you so far in this conversation, including their latest message.
+Do not include [INTERVIEW_COMPLETE] in the reply - use "is_complete" instead."""
+
+    @staticmethod
+    def get_incremental_extraction_prompt() -> str:
+        """Prompt for extracting only what changed since the previous turn"""
+        return """You maintain structured job information collected during an interview with an HR/Recruiter.
+Given the current job information and the newest messages, return ONLY a JSON object containing the fields
+that the new messages add or change. Use the same keys as the current job information:
+job_title, company, location, job_type, workplace_type, seniority_level, work_arrangement, tone_type,
+responsibilities, requirements, skills, preferred_skills, culture_and_team, keywords, hashtags,
+compensation_info, other_info.
+
+Rules:
+- Omit fields that did not change
+- For list fields, return the complete updated list (existing items plus new ones)
+- If nothing changed, return {}
+
+Return ONLY the JSON, no other text."""
+
+    @staticmethod
+    def get_incremental_single_call_prompt(job_info: dict) -> str:
+        """Single-call prompt variant that returns a patch against the previously extracted job info"""
+        return f"""Job information collected so far:
+{json.dumps(job_info)}
+
+Respond with a single JSON object (no other text) with exactly these keys:
+{{
+    "reply": "your next message to the HR - one question at a time, following the interview flow",
+    "is_complete": true or false (true only when the completion criteria are met),
+    "job_info_updates": {{ only the job information fields that the HR's latest message adds or changes }}
+}}
+
+For list fields in "job_info_updates", return the complete updated list. Use {{}} if nothing changed.
+Do not include [INTERVIEW_COMPLETE] in the reply - use "is_complete" instead."""
+
     @staticmethod
     def get_help_suggestions_prompt(job_info: dict, section: str) -> str:
         """Generate suggestions when user asks for help on a specific section"""
@@ -275,6 +340,23 @@ Return ONLY a JSON object with this exact structure:
 
 Return ONLY the JSON object, no other text."""
 
+    @staticmethod
+    def get_fused_prompt(job_info: dict) -> str:
+        """
+        System prompt for the fused compose-and-polish stage
+        
+        Combines the composer brief with the Formatter Agent's rules so a single
+        generation returns a publication-ready post.
+        """
+        return f"""{ComposerAgentPrompts.get_base_prompt(job_info)}
+
+The post is published exactly as you return it - there is no separate editing pass.
+Apply these editing rules while writing:
+
+{FormatterAgentPrompts.get_formatting_rules()}
+
+Return ONLY the JSON object described above, no other text."""
+
     @staticmethod
     def _get_tone_instruction(job_info: dict) -> str:
         """Get tone-specific instructions based on job type"""
@@ -348,9 +430,16 @@ class FormatterAgentPrompts:
     @staticmethod
     def get_base_prompt() -> str:
         """Base system prompt for Formatter Agent"""
-        return """You are an expert content editor and formatter specializing in LinkedIn hiring posts. Your expertise ensures every post is polished, professional, and ready for publication.
+        return f"""You are an expert content editor and formatter specializing in LinkedIn hiring posts. Your expertise ensures every post is polished, professional, and ready for publication.
 
-FORMATTING RULES:
+{FormatterAgentPrompts.get_formatting_rules()}
+
+Your goal is to make the post polished, professional, and LinkedIn-ready while maintaining the original intent and information."""
+
+    @staticmethod
+    def get_formatting_rules() -> str:
+        """Editing rules shared by the Formatter Agent and the fused composer"""
+        return """FORMATTING RULES:
 1. BULLET POINTS:
    - Start each bullet with a strong action verb
    - Keep bullets concise (one clear idea per bullet)
@@ -383,9 +472,7 @@ FORMATTING RULES:
    - No awkward phrasing
    - No repetitive content
    - Professional but approachable
-   - Clear and actionable
-
-Your goal is to make the post polished, professional, and LinkedIn-ready while maintaining the original intent and information."""
+   - Clear and actionable"""
 
     @staticmethod
     def get_section_formatting_prompt(section_type: str) -> str:
@@ -0,0 +1,113 @@
+"""
+Per-session state store for the AgentOrchestrator
+Keeps each interview's live state keyed by session_id so concurrent
+sessions on a shared orchestrator never overwrite each other.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+try:
+    from ..cache import LRUCache, SQLiteCache
+    from ..models import JobPost
+except ImportError:
+    from cache import LRUCache, SQLiteCache
+    from models import JobPost
+
+
+class SessionStateStore:
+    """
+    Session state keyed by session_id.
+
+    Tier 1 is an in-process LRU with TTL; tier 2 is an optional SQLite file
+    so state survives restarts and is visible to other workers on the host.
+    A state dict holds: session_id, job_info, is_complete, job_post (a
+    JobPost or None) and version - the version of the saved chat session it
+    was recorded for. The ChatSession row stays the source of truth: readers
+    pass its version and state left over from an older turn is ignored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = 7200,
+        db_path: Optional[str] = None,
+    ):
+        self.memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = None
+        if db_path:
+            self.disk = SQLiteCache(
+                db_path,
+                table="orchestrator_sessions",
+                max_entries=max_entries * 10,
+                ttl_seconds=ttl_seconds,
+            )
+
+    @classmethod
+    def from_env(cls) -> "SessionStateStore":
+        """Build a store configured from ORCHESTRATOR_SESSION_* environment variables"""
+        return cls(
+            max_entries=int(os.getenv("ORCHESTRATOR_SESSION_MAX_ENTRIES", "1000")),
+            ttl_seconds=float(os.getenv("ORCHESTRATOR_SESSION_TTL_SECONDS", "7200")),
+            db_path=os.getenv("ORCHESTRATOR_SESSION_DB_PATH") or None,
+        )
+
+    @staticmethod
+    def new_state(session_id: str) -> Dict[str, Any]:
+        """Empty state for a freshly started session"""
+        return {
+            "session_id": session_id,
+            "job_info": {},
+            "is_complete": False,
+            "job_post": None,
+            "version": None
+        }
+
+    def get(self, session_id: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a session's state from memory, falling back to the SQLite tier
+        With a version, state recorded for any other version counts as missing.
+        """
+        state = self.memory.get(session_id)
+        if state is not None and version is not None and state.get("version") != version:
+            state = None
+        if state is None and self.disk is not None:
+            stored = self.disk.get(session_id)
+            if stored is not None and (version is None or stored.get("version") == version):
+                state = self._deserialize(stored)
+                self.memory.set(session_id, state)
+        return state
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Store a session's state in every tier"""
+        session_id = state["session_id"]
+        self.memory.set(session_id, state)
+        if self.disk is not None:
+            self.disk.set(session_id, self._serialize(state))
+
+    def delete(self, session_id: str) -> None:
+        """Forget a session"""
+        self.memory.delete(session_id)
+        if self.disk is not None:
+            self.disk.delete(session_id)
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    @staticmethod
+    def _serialize(state: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON-safe copy of a state dict"""
+        job_post = state.get("job_post")
+        return {
+            **state,
+            "job_post": job_post.model_dump(mode="json") if isinstance(job_post, JobPost) else job_post,
+        }
+
+    @staticmethod
+    def _deserialize(stored: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a state dict read from the SQLite tier"""
+        job_post = stored.get("job_post")
+        return {
+            **stored,
+            "job_post": JobPost(**job_post) if isinstance(job_post, dict) else None,
+        }
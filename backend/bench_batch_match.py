@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark Job Finder batch matching
+Times MatchingAgent.match_many for a cohort of seekers (a nightly
+recommendation refresh) against a per-seeker match_jobs loop.
+
+Usage: python bench_batch_match.py [--seekers 100000] [--jobs 20000] [--workers 0,4] [--loop-sample 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_finder.job_index import JobIndex
+from job_finder.matching_agent import MatchingAgent
+from job_finder.models import JobListing, JobSeekerProfile
+
+TITLES = [
+    "Frontend Developer", "Backend Engineer", "Full Stack Developer", "Data Analyst", "Data Scientist",
+    "Product Designer", "DevOps Engineer", "iOS Developer", "QA Engineer", "Engineering Manager",
+]
+LEVELS = ["", "Junior ", "Senior ", "Lead "]
+SKILLS = [
+    "React", "TypeScript", "Node.js", "Python", "Django", "FastAPI", "SQL", "Power BI", "Figma",
+    "AWS", "Kubernetes", "Docker", "Swift", "Kotlin", "TensorFlow", "Go", "Java", "CSS",
+]
+# Team suffixes give the catalogue a realistic number of distinct titles
+TEAMS = [f"Team {i}" for i in range(300)]
+CITIES = ["Amman, Jordan", "Dubai, UAE", "Remote", "Riyadh, KSA", "Cairo, Egypt", "London, UK", "Berlin, Germany"]
+WORK_TYPES = ["remote", "onsite", "hybrid"]
+INDUSTRIES = ["Tech", "Fintech", "Healthcare", "E-commerce", "Education"]
+
+
+def synthetic_jobs(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [
+        JobListing(
+            id=str(i),
+            title=f"{rng.choice(LEVELS)}{rng.choice(TITLES)} - {rng.choice(TEAMS)}",
+            company=f"Company {rng.randint(1, 5000)}",
+            location=f"{rng.choice(CITIES)} (Office {rng.randint(1, 50)})",
+            required_skills=rng.sample(SKILLS, 3),
+            optional_skills=rng.sample(SKILLS, 2),
+            work_type=rng.choice(WORK_TYPES),
+            industries=rng.sample(INDUSTRIES, 1),
+        )
+        for i in range(count)
+    ]
+
+
+def synthetic_seekers(count: int, seed: int = 2):
+    rng = random.Random(seed)
+    return [
+        JobSeekerProfile(
+            id=f"seeker-{i}",
+            skills=rng.sample(SKILLS, rng.randint(2, 5)),
+            preferred_titles=rng.sample(TITLES, rng.randint(1, 2)),
+            preferred_locations=[city.split(",")[0] for city in rng.sample(CITIES, rng.randint(0, 2))],
+            work_type=rng.choice(WORK_TYPES + [None]),
+            industries=rng.sample(INDUSTRIES, rng.randint(0, 1)),
+        )
+        for i in range(count)
+    ]
+
+
+def main(seeker_count: int, job_count: int, workers, loop_sample: int) -> None:
+    index = JobIndex(synthetic_jobs(job_count))
+    seekers = synthetic_seekers(seeker_count)
+    agent = MatchingAgent(matching_mode="heuristic")
+    agent.get_vector_scorer(index)
+
+    sample = seekers[:loop_sample]
+    start = time.perf_counter()
+    for seeker in sample:
+        agent.match_jobs(seeker, index=index)
+    per_seeker = (time.perf_counter() - start) / max(len(sample), 1)
+    print(f"{job_count} jobs, {seeker_count} seekers")
+    print(f"{'match_jobs loop':<24}{per_seeker * seeker_count:>10.1f}s (extrapolated from {len(sample)} seekers)")
+
+    for count in workers:
+        start = time.perf_counter()
+        agent.match_many(seekers, index=index, workers=count)
+        label = f"match_many workers={count}"
+        print(f"{label:<24}{time.perf_counter() - start:>10.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seekers", type=int, default=100000, help="synthetic seekers to match")
+    parser.add_argument("--jobs", type=int, default=20000, help="synthetic listings to match against")
+    parser.add_argument("--workers", default="0,4", help="comma-separated process pool sizes to try (0 = in-process)")
+    parser.add_argument("--loop-sample", type=int, default=500, help="seekers timed with the per-seeker loop")
+    args = parser.parse_args()
+    main(args.seekers, args.jobs, [int(n) for n in args.workers.split(",") if n.strip()], args.loop_sample)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Load test the API at increasing concurrency
+Sends the same request count at each concurrency level through the ASGI
+app and reports throughput for:
+- rolevate:       /api/rolevate/health against a local stub of the Rolevate
+                  API that answers after --latency ms (a plain def route)
+- rolevate-async: the same client call made inline in an `async def` route,
+                  as the routes did before they moved off the event loop
+- post-preview:   /api/post-preview/{session_id}, SQLite reads (AsyncSession)
+
+Usage: python bench_concurrency.py [--concurrency 1,4,16,64] [--requests 256] [--latency 50] [--threads 40]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# The app binds its engine at import time
+_db_dir = tempfile.mkdtemp(prefix="bench_concurrency_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.setdefault("JOB_ALERTS_ENABLED", "false")
+
+import httpx
+
+import concurrency
+from database import SessionLocal, async_engine, init_db
+from main import app
+from repositories import ChatSessionRepository
+import rolevate_routes
+
+
+def start_stub_rolevate(latency_ms: float) -> str:
+    """A Rolevate GraphQL stand-in answering every query after latency_ms"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(latency_ms / 1000)
+            body = json.dumps({"data": {"health": True}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 256
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/api/graphql"
+
+
+@app.get("/bench/rolevate-async")
+async def rolevate_async():
+    """The pre-offloading shape: a blocking client call inside an async def"""
+    return rolevate_routes.rolevate_client.get_health()
+
+
+def seed_session() -> str:
+    init_db()
+    db = SessionLocal()
+    try:
+        ChatSessionRepository.create(db, {"session_id": "bench", "messages": [], "job_info": {}, "is_complete": 0})
+    finally:
+        db.close()
+    return "bench"
+
+
+async def throughput(client: httpx.AsyncClient, path: str, concurrency: int, requests: int) -> float:
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(levels, requests: int, latency_ms: float, threads: int) -> None:
+    concurrency.BLOCKING_THREADS = threads  # read when the loop's limiter is created
+    rolevate_routes.rolevate_client.BASE_URL = start_stub_rolevate(latency_ms)
+    session_id = seed_session()
+    paths = {
+        "rolevate": "/api/rolevate/health",
+        "rolevate-async": "/bench/rolevate-async",
+        "post-preview": f"/api/post-preview/{session_id}",
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for path in paths.values():
+            await client.get(path)  # warm up connections and lazy imports
+        print(f"{'route':<16}" + "".join(f"{f'c={c} req/s':>14}" for c in levels))
+        for name, path in paths.items():
+            rates = [await throughput(client, path, c, requests) for c in levels]
+            print(f"{name:<16}" + "".join(f"{rate:>14.1f}" for rate in rates))
+    # ASGITransport skips the app's shutdown event, which disposes the pool
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated concurrent clients")
+    parser.add_argument("--requests", type=int, default=256, help="requests per route and concurrency level")
+    parser.add_argument("--latency", type=float, default=50, help="stub Rolevate response time in ms")
+    parser.add_argument("--threads", type=int, default=40, help="worker threads (BLOCKING_THREADS)")
+    args = parser.parse_args()
+    asyncio.run(main(
+        [int(n) for n in args.concurrency.split(",") if n.strip()],
+        args.requests,
+        args.latency,
+        args.threads,
+    ))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent chat-turn writes under each database engine profile
+Every writer thread appends turns to its own chat session the way the chat
+route does (read the recent history, then append two messages and update
+the session in one transaction) while reader threads page through the
+history. Reports turns per second and failed turns ("database is locked",
+pool timeouts) for each profile and writer count.
+
+Usage: python bench_db_writes.py [--writers 1,4,16] [--turns 200] [--readers 4] [--profiles basic,production]
+                                 [--url sqlite:///...] [--dir /path/on/the/data/disk]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, ENGINE_PROFILES, create_profiled_engine
+from repositories import ChatMessageRepository, ChatSessionRepository, unit_of_work
+
+HISTORY_WINDOW = 40
+
+
+def write_turns(session_factory, session_id: str, turns: int, errors: list) -> None:
+    db = session_factory()
+    try:
+        for turn in range(turns):
+            try:
+                chat_session = ChatSessionRepository.get_by_session_id(db, session_id)
+                ChatMessageRepository.get_messages(db, chat_session, limit=HISTORY_WINDOW)
+                with unit_of_work(db):
+                    count = ChatMessageRepository.append(db, chat_session, [
+                        {"role": "user", "content": f"Answer {turn} " + "detail " * 40},
+                        {"role": "assistant", "content": f"Question {turn} " + "context " * 60},
+                    ])
+                    ChatSessionRepository.update_instance(db, chat_session, {"job_info": {"turns": count}})
+            except OperationalError as e:
+                errors.append(str(e.orig))
+            except PoolTimeoutError:
+                errors.append("timed out waiting for a pooled connection")
+    finally:
+        db.close()
+
+
+def read_history(session_factory, session_ids, stop: threading.Event) -> None:
+    db = session_factory()
+    try:
+        while not stop.is_set():
+            for session_id in session_ids:
+                try:
+                    chat_session = ChatSessionRepository.get_by_session_id(db, session_id)
+                    ChatMessageRepository.get_messages(db, chat_session, limit=HISTORY_WINDOW)
+                    db.commit()
+                except (OperationalError, PoolTimeoutError):
+                    db.rollback()
+    finally:
+        db.close()
+
+
+def run(url: str, profile: str, writers: int, turns: int, readers: int):
+    engine = create_profiled_engine(url, profile)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session_ids = [f"bench-{i}" for i in range(writers)]
+    db = session_factory()
+    for session_id in session_ids:
+        ChatSessionRepository.create(db, {"session_id": session_id, "messages": [], "job_info": {}, "is_complete": 0})
+    db.close()
+
+    errors, stop = [], threading.Event()
+    reader_threads = [
+        threading.Thread(target=read_history, args=(session_factory, session_ids, stop)) for _ in range(readers)
+    ]
+    writer_threads = [
+        threading.Thread(target=write_turns, args=(session_factory, session_id, turns, errors))
+        for session_id in session_ids
+    ]
+    for thread in reader_threads:
+        thread.start()
+    start = time.perf_counter()
+    for thread in writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+    engine.dispose()
+    completed = writers * turns - len(errors)
+    return completed / elapsed, errors
+
+
+def main(url_for, profiles, levels, turns: int, readers: int) -> None:
+    print(f"{'profile':<12}" + "".join(f"{f'w={w} turns/s':>16}{'failed':>8}" for w in levels))
+    for profile in profiles:
+        results = [run(url_for(profile), profile, writers, turns, readers) for writers in levels]
+        print(f"{profile:<12}" + "".join(f"{rate:>16.1f}{len(errors):>8}" for rate, errors in results))
+        for reason in sorted({error for _, errors in results for error in errors}):
+            print(f"{'':<12}failed: {reason}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", default="1,4,16", help="comma-separated concurrent writer threads")
+    parser.add_argument("--turns", type=int, default=200, help="turns written per writer")
+    parser.add_argument("--readers", type=int, default=4, help="threads reading history meanwhile")
+    parser.add_argument("--profiles", default=",".join(ENGINE_PROFILES), help="comma-separated engine profiles")
+    parser.add_argument("--url", help="database URL (default: a temporary SQLite file per profile)")
+    parser.add_argument("--dir", help="directory for the temporary SQLite files (default: the system temp dir)")
+    args = parser.parse_args()
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    levels = [int(n) for n in args.writers.split(",") if n.strip()]
+    with tempfile.TemporaryDirectory(prefix="bench_db_writes_", dir=args.dir) as db_dir:
+        # The tables are dropped and recreated for every run
+        main(
+            lambda profile: args.url or f"sqlite:///{os.path.join(db_dir, profile + '.db')}",
+            profiles, levels, args.turns, args.readers,
+        )
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Job Finder interview keyword extractor
+Compares one compiled-regex pass (KeywordExtractor) with a substring scan
+per vocabulary term, across vocabulary sizes and message lengths.
+
+Usage: python bench_keyword_extractor.py [--vocab 0,1000,10000,50000] [--lengths 80,800,8000] [--repeat 50]
+A vocabulary size of 0 means the shipped vocabulary.json.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_finder.keyword_extractor import DEFAULT_VOCABULARY_PATH, KeywordExtractor
+
+FILLER = (
+    "i have been working on customer facing products for a while and i would like to grow "
+    "into a role with more ownership where the team cares about quality and mentoring"
+).split()
+
+
+def load_vocabulary(size: int, rng: random.Random) -> dict:
+    with open(DEFAULT_VOCABULARY_PATH, encoding="utf-8") as f:
+        vocabulary = json.load(f)
+    if size:
+        # Pad skills and locations with synthetic multi-word terms
+        syllables = ["ka", "lo", "mi", "ra", "tu", "ve", "sin", "dor", "pex", "qua"]
+        for i in range(size):
+            term = "".join(rng.choice(syllables) for _ in range(3)) + f" {i}"
+            vocabulary["skills" if i % 2 else "locations"].append(term)
+    return vocabulary
+
+
+def message(length: int, vocabulary: dict, rng: random.Random) -> str:
+    words, terms = [], vocabulary["skills"] + vocabulary["locations"]
+    while sum(len(w) + 1 for w in words) < length:
+        words.append(rng.choice(terms) if rng.random() < 0.1 else rng.choice(FILLER))
+    return " ".join(words)[:length]
+
+
+def substring_scan(vocabulary: dict, text: str) -> dict:
+    """The per-term `term in message` approach the extractor replaces."""
+    lower = text.lower()
+    found = {}
+    for category, entries in vocabulary.items():
+        aliases = entries.items() if isinstance(entries, dict) else ((t, [t]) for t in entries)
+        found[category] = [canonical for canonical, names in aliases if any(n in lower for n in names)]
+    return found
+
+
+def timed_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(sizes, lengths, repeat: int) -> None:
+    rng = random.Random(0)
+    print(f"{'terms':>8}{'compile ms':>12}{'chars':>8}{'scan ms':>10}{'extract ms':>12}{'speedup':>9}")
+    for size in sizes:
+        vocabulary = load_vocabulary(size, rng)
+        start = time.perf_counter()
+        extractor = KeywordExtractor(vocabulary)
+        compile_ms = (time.perf_counter() - start) * 1000
+        for length in lengths:
+            text = message(length, vocabulary, rng)
+            scan = timed_ms(lambda: substring_scan(vocabulary, text), repeat)
+            extract = timed_ms(lambda: extractor.extract(text), repeat)
+            print(f"{len(extractor):>8}{compile_ms:>12.0f}{length:>8}{scan:>10.3f}{extract:>12.3f}{scan / extract:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vocab", default="0,1000,10000,50000", help="comma-separated synthetic terms to add")
+    parser.add_argument("--lengths", default="80,800,8000", help="comma-separated message lengths in characters")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per measurement")
+    args = parser.parse_args()
+    main(
+        [int(n) for n in args.vocab.split(",") if n.strip()],
+        [int(n) for n in args.lengths.split(",") if n.strip()],
+        args.repeat,
+    )
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the post pipeline modes
+Compares latency and token usage of the fused compose-and-polish stage
+against the two-stage Composer -> Formatter pipeline.
+
+Usage: python bench_post_pipeline.py [--runs 5] [--modes fused,quality]
+Requires OPENAI_API_KEY. The LLM response cache is disabled so every run
+pays for real completions.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["LLM_CACHE_ENABLED"] = "false"
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from agents.orchestrator import AgentOrchestrator
+from agents.session_store import SessionStateStore
+
+SAMPLE_JOB_INFO = {
+    "job_title": "Senior Backend Engineer",
+    "company": "Acme Analytics",
+    "location": "Amman, Jordan",
+    "work_arrangement": "hybrid",
+    "job_type": "full-time",
+    "seniority_level": "senior",
+    "responsibilities": [
+        "design and maintain python services",
+        "own the data ingestion pipeline",
+        "mentor junior engineers",
+    ],
+    "requirements": ["5+ years backend experience", "strong SQL"],
+    "skills": ["python", "fastapi", "postgresql", "aws"],
+    "preferred_skills": ["kafka"],
+    "culture_and_team": "Small product team of 8, remote-friendly, weekly demos",
+}
+
+
+def _agents(orchestrator: AgentOrchestrator):
+    return [orchestrator.composer_agent, orchestrator.formatter_agent]
+
+
+async def bench_mode(mode: str, runs: int) -> dict:
+    """Run the post pipeline `runs` times in one mode and collect latency/usage"""
+    orchestrator = AgentOrchestrator(SessionStateStore(max_entries=1), post_pipeline_mode=mode)
+    for agent in _agents(orchestrator):
+        agent.reset_usage()
+
+    latencies = []
+    for i in range(runs):
+        start = time.perf_counter()
+        job_post = await orchestrator.acompose_post(dict(SAMPLE_JOB_INFO))
+        latencies.append(time.perf_counter() - start)
+        print(f"  {mode} run {i + 1}: {latencies[-1]:.2f}s ({len(job_post.responsibilities)} responsibilities)")
+
+    usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    for agent in _agents(orchestrator):
+        for key, value in agent.reset_usage().items():
+            usage[key] += value
+
+    return {
+        "mode": mode,
+        "mean": statistics.mean(latencies),
+        "p50": statistics.median(latencies),
+        "max": max(latencies),
+        "calls": usage["calls"] / runs,
+        "prompt_tokens": usage["prompt_tokens"] / runs,
+        "completion_tokens": usage["completion_tokens"] / runs,
+        "total_tokens": usage["total_tokens"] / runs,
+    }
+
+
+async def main(runs: int, modes: list):
+    results = []
+    for mode in modes:
+        print(f"\n⏱️  Benchmarking {mode} mode ({runs} runs)...")
+        results.append(await bench_mode(mode, runs))
+
+    print("\n📊 Per-post averages")
+    print(f"{'mode':<10}{'mean s':>9}{'p50 s':>9}{'max s':>9}{'calls':>7}{'prompt':>9}{'completion':>12}{'total':>9}")
+    for r in results:
+        print(
+            f"{r['mode']:<10}{r['mean']:>9.2f}{r['p50']:>9.2f}{r['max']:>9.2f}{r['calls']:>7.1f}"
+            f"{r['prompt_tokens']:>9.0f}{r['completion_tokens']:>12.0f}{r['total_tokens']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="posts to generate per mode")
+    parser.add_argument("--modes", default="fused,quality", help="comma-separated modes to compare")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, [m.strip() for m in args.modes.split(",") if m.strip()]))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Job Finder semantic index
+Measures recall@k and latency of the IVF approximate search against
+brute-force search over the same memory-mapped embeddings, and the cost of
+adding one listing to a built index.
+
+Usage: python bench_semantic_index.py [--jobs 100000] [--queries 200] [--k 200] [--nprobe 4,8,16,32]
+Runs offline on CPU with the hashing embedder (or SEMANTIC_MODEL if set).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_finder.models import JobListing, JobSeekerProfile
+from job_finder.semantic_index import SemanticIndex, seeker_text
+
+LEVELS = ["", "Junior", "Senior", "Lead", "Staff"]
+ROLES = [
+    "Frontend Developer", "UI Engineer", "React Developer", "Backend Engineer", "API Developer",
+    "Full Stack Developer", "Data Analyst", "BI Developer", "Data Scientist", "ML Engineer",
+    "Product Designer", "UX Designer", "DevOps Engineer", "Cloud Platform Engineer",
+    "iOS Developer", "Android Developer", "Engineering Manager", "QA Engineer",
+]
+SKILLS = [
+    "React", "TypeScript", "Node.js", "Python", "Django", "FastAPI", "SQL", "Power BI", "Figma",
+    "AWS", "Kubernetes", "Docker", "Swift", "Kotlin", "TensorFlow", "Go", "Java", "CSS",
+]
+
+
+def synthetic_jobs(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        role = rng.choice(ROLES)
+        skills = rng.sample(SKILLS, 4)
+        jobs.append(JobListing(
+            id=str(i),
+            title=f"{rng.choice(LEVELS)} {role}".strip(),
+            company=f"Company {rng.randint(1, 5000)}",
+            location="Remote",
+            required_skills=skills[:3],
+            optional_skills=skills[3:],
+            description=f"Join team {rng.randint(1, 999)} to build products with {skills[0]} and {skills[1]}.",
+        ))
+    return jobs
+
+
+def synthetic_seekers(count: int, seed: int = 2):
+    rng = random.Random(seed)
+    return [
+        JobSeekerProfile(preferred_titles=[rng.choice(ROLES)], skills=rng.sample(SKILLS, 3))
+        for _ in range(count)
+    ]
+
+
+def main(job_count: int, query_count: int, k: int, nprobes) -> None:
+    jobs = synthetic_jobs(job_count)
+    start = time.perf_counter()
+    index = SemanticIndex(jobs)
+    print(f"Embedded and indexed {job_count} jobs in {time.perf_counter() - start:.1f}s "
+          f"({index.embedder.name}, dim {index.embedder.dim}, {index.ann.nlist} lists)")
+
+    start = time.perf_counter()
+    added = JobListing(id="added", title="UI Engineer", company="Company 1", location="Remote", required_skills=["CSS"])
+    index.updated(jobs + [added])
+    print(f"Added one listing to the index in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    queries = index.embedder.embed([seeker_text(seeker) for seeker in synthetic_seekers(query_count)])
+    exact, exact_ms = [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows, _ = index.ann.search_exact(query, k)
+        exact_ms.append((time.perf_counter() - start) * 1000)
+        exact.append(set(rows.tolist()))
+
+    print(f"\n{'search':<14}{'recall@' + str(k):>12}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'brute force':<14}{1.0:>12.3f}{statistics.median(exact_ms):>10.2f}"
+          f"{statistics.quantiles(exact_ms, n=20)[-1]:>10.2f}")
+    for nprobe in nprobes:
+        recalls, latencies = [], []
+        for query, truth in zip(queries, exact):
+            start = time.perf_counter()
+            rows, _ = index.ann.search(query, k, nprobe)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(len(truth & set(rows.tolist())) / len(truth))
+        print(f"{'ivf nprobe=' + str(nprobe):<14}{statistics.mean(recalls):>12.3f}"
+              f"{statistics.median(latencies):>10.2f}{statistics.quantiles(latencies, n=20)[-1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000, help="synthetic listings to index")
+    parser.add_argument("--queries", type=int, default=200, help="synthetic seekers to search for")
+    parser.add_argument("--k", type=int, default=200, help="candidates retrieved per seeker")
+    parser.add_argument("--nprobe", default="4,8,16,32", help="comma-separated IVF lists to probe")
+    args = parser.parse_args()
+    main(args.jobs, args.queries, args.k, [int(n) for n in args.nprobe.split(",") if n.strip()])
@@ -0,0 +1,47 @@
+"""
+Worker threads for blocking work done by the async routes
+Sync SQLAlchemy sessions, the `requests`-based Rolevate client and CPU-bound
+matching run through run_blocking so they never stall the event loop
+"""
+
+import functools
+import os
+from typing import Any, Callable, TypeVar
+
+import anyio
+import anyio.to_thread
+from anyio.lowlevel import RunVar
+
+# Most route calls running in worker threads at once. Route work waiting for
+# a database connection holds its slot, so keep it near the database pool
+# (pool size + overflow); a larger value only queues threads on the pool.
+BLOCKING_THREADS = int(os.getenv("BLOCKING_THREADS", "40"))
+
+T = TypeVar("T")
+
+# One limiter per event loop. It is separate from anyio's default limiter,
+# which FastAPI uses for its own thread hops (sync dependencies, response
+# validation of def routes): those must never wait behind route threads
+# blocked on a connection that only they can help release.
+_limiter: RunVar[anyio.CapacityLimiter] = RunVar("blocking_limiter")
+
+
+def blocking_limiter() -> anyio.CapacityLimiter:
+    """The running event loop's limiter for run_blocking (BLOCKING_THREADS slots)"""
+    try:
+        return _limiter.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(BLOCKING_THREADS)
+        _limiter.set(limiter)
+        return limiter
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run func(*args, **kwargs) in a worker thread and await its result
+    Exceptions (HTTPException included) are re-raised in the caller.
+    """
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs),
+        limiter=blocking_limiter()
+    )
@@ -3,9 +3,12 @@ Database configuration and session management
 Phase 4: Data Model
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, literal
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from dotenv import load_dotenv
 
@@ -17,24 +20,138 @@ DATABASE_URL = os.getenv(
     "sqlite:///./hiring_assistant.db"
 )
 
+# Named engine profiles, selected with DB_ENGINE_PROFILE (default basic):
+# - basic: SQLAlchemy defaults (5 + 10 pooled connections per engine, SQLite's
+#   own rollback journal with synchronous=FULL)
+# - production: pools sized per engine with health checks for PostgreSQL,
+#   and PRAGMAs run on every new SQLite connection so concurrent writers
+#   queue instead of failing with "database is locked"
+ENGINE_PROFILES = {
+    "basic": {},
+    "production": {
+        # Sync sessions are only used from run_blocking worker threads, so the
+        # sync pool peaks at one connection per slot of its limiter
+        # (concurrency.BLOCKING_THREADS, default 40); 10 kept open
+        "sync_pool": {"pool_size": 10, "max_overflow": 30},
+        # Async sessions are awaited on the event loop and held only for
+        # their queries; 20 at peak, 5 kept open (60 per process in all)
+        "async_pool": {"pool_size": 5, "max_overflow": 15},
+        "pool_timeout": 30,
+        # PostgreSQL only: test connections on checkout and replace them
+        # before server or proxy idle timeouts close them
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "sqlite_pragmas": {
+            "journal_mode": "WAL",  # Readers and the writer no longer block each other
+            "synchronous": "NORMAL",  # fsync at checkpoints instead of every commit (durable with WAL)
+            "busy_timeout": 15000,  # Wait up to 15s for the write lock (the drivers default to 5s)
+            "cache_size": -16384,  # 16 MiB page cache per pooled connection
+            "mmap_size": 268435456,  # Read up to 256 MiB of the file through mmap
+        },
+    },
+}
+
+DB_ENGINE_PROFILE = os.getenv("DB_ENGINE_PROFILE", "basic")
+
+# Pool options that only matter for a database server
+SERVER_POOL_OPTIONS = ("pool_pre_ping", "pool_recycle")
+# Profile entries that are not create_engine arguments as they stand
+PROFILE_SECTIONS = ("sync_pool", "async_pool", "sqlite_pragmas")
+
+
+def engine_options(url: str, profile: str = DB_ENGINE_PROFILE, kind: str = "sync") -> dict:
+    """
+    create_engine / create_async_engine keyword arguments for url under an
+    engine profile, with the pool sizes of the kind ("sync" or "async") of engine
+    """
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown database engine profile: {profile}")
+    parsed = make_url(url)
+    options = {"echo": False}  # Set echo to True for SQL query logging
+    settings = {key: value for key, value in ENGINE_PROFILES[profile].items() if key not in PROFILE_SECTIONS}
+    settings.update(ENGINE_PROFILES[profile].get(f"{kind}_pool", {}))
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.get_driver_name() == "pysqlite":
+            options["connect_args"] = {"check_same_thread": False}  # Needed for SQLite
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases use a single-connection pool
+            return options
+        settings = {key: value for key, value in settings.items() if key not in SERVER_POOL_OPTIONS}
+        if settings and parsed.get_driver_name() == "aiosqlite":
+            # aiosqlite defaults to NullPool (a new connection, and PRAGMAs, per checkout)
+            options["poolclass"] = AsyncAdaptedQueuePool
+    options.update(settings)
+    return options
+
+
+def apply_sqlite_pragmas(sync_engine, profile: str = DB_ENGINE_PROFILE) -> None:
+    """Run the profile's SQLite PRAGMAs on every new connection of sync_engine (a no-op for other databases)"""
+    pragmas = ENGINE_PROFILES[profile].get("sqlite_pragmas")
+    if sync_engine.dialect.name != "sqlite" or not pragmas:
+        return
+    
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_profiled_engine(url: str, profile: str = DB_ENGINE_PROFILE):
+    """Sync engine for url with the engine profile applied"""
+    profiled_engine = create_engine(url, **engine_options(url, profile))
+    apply_sqlite_pragmas(profiled_engine, profile)
+    return profiled_engine
+
+
+def create_profiled_async_engine(url: str, profile: str = DB_ENGINE_PROFILE):
+    """Async engine for url with the engine profile applied"""
+    profiled_engine = create_async_engine(url, **engine_options(url, profile, "async"))
+    apply_sqlite_pragmas(profiled_engine.sync_engine, profile)
+    return profiled_engine
+
+
 # Create engine
-if DATABASE_URL.startswith("sqlite"):
-    # SQLite specific configuration
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},  # Needed for SQLite
-        echo=False  # Set to True for SQL query logging
-    )
-else:
-    # PostgreSQL or other databases
-    engine = create_engine(
-        DATABASE_URL,
-        echo=False
-    )
+engine = create_profiled_engine(DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the sync URL's database (the sync engine keeps serving
+# scripts, init_db and the Job Finder's threaded matching code)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the async one (aiosqlite / asyncpg)"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Async engine - ASYNC_DATABASE_URL overrides the URL derived from DATABASE_URL
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+try:
+    async_engine = create_profiled_async_engine(ASYNC_DATABASE_URL)
+    # Objects stay readable after commit: an expired attribute would need
+    # a lazy load, which AsyncSession cannot do implicitly
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+except ImportError as e:
+    # Async driver not installed (aiosqlite, or asyncpg for PostgreSQL)
+    print(f"WARNING: Async database engine unavailable: {e}")
+    async_engine = None
+    AsyncSessionLocal = None
+
 # Base class for models
 Base = declarative_base()
 
@@ -51,6 +168,17 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency function to get an async database session
+    Use this in async FastAPI routes; queries are awaited on the event loop
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError(f"No async driver installed for {ASYNC_DATABASE_URL}")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database - create all tables"""
     # Import models to ensure they're registered
@@ -60,5 +188,53 @@ def init_db():
         import db_models  # noqa
     
     Base.metadata.create_all(bind=engine)
+    
+    # Job Finder models use their own declarative base
+    try:
+        from .job_finder.db_models import Base as JobFinderBase
+    except ImportError:
+        from job_finder.db_models import Base as JobFinderBase
+    JobFinderBase.metadata.create_all(bind=engine)
+    
+    migrate_schema(engine, (Base.metadata, JobFinderBase.metadata))
+
+
+def migrate_schema(bind, metadatas) -> None:
+    """
+    Bring tables created by an earlier version up to the current models
+    
+    create_all() only creates missing tables, so columns and indexes added
+    to existing tables since then (e.g. the job_posts.updated_at and
+    job_finder_recommendations.job_id indexes) are added here. Every step
+    checks the live schema first, so this is safe to run on each start.
+    """
+    inspector = inspect(bind)
+    for metadata in metadatas:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    _add_column(bind, table, column)
+            for index in table.indexes:
+                index.create(bind=bind, checkfirst=True)
+
+
+def _add_column(bind, table, column) -> None:
+    """ALTER TABLE ... ADD COLUMN for a column missing from an existing table"""
+    if column.primary_key:
+        print(f"ERROR: cannot add primary key column {table.name}.{column.name} to an existing table")
+        return
+    preparer = bind.dialect.identifier_preparer
+    ddl = f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=bind.dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        ddl += " DEFAULT " + str(literal(default).compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+        if not column.nullable:
+            ddl += " NOT NULL"
+    with bind.begin() as connection:
+        connection.exec_driver_sql(ddl)
+    print(f"DEBUG: added column {table.name}.{column.name}")
 
 
@@ -47,7 +47,7 @@ class JobPost(Base):
     culture_and_team = Column(Text, nullable=True)
     tone_type = Column(String(100), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Job Finder snapshot high-water mark
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
     # Relationships
@@ -60,7 +60,7 @@ class ChatSession(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String(255), unique=True, index=True, nullable=False)
-    messages = Column(JSON, default=list)  # List of message dicts
+    messages = Column(JSON, default=list)  # Legacy list of message dicts - new messages go to chat_messages
     job_info = Column(JSON, default=dict)  # Extracted job information
     is_complete = Column(Integer, default=0)  # 0 = False, 1 = True (SQLite compatibility)
     job_post_id = Column(Integer, ForeignKey("job_posts.id"), nullable=True)
@@ -72,3 +72,16 @@ class ChatSession(Base):
     job_post = relationship("JobPost", foreign_keys=[job_post_id])
 
 
+class ChatMessage(Base):
+    """
+    Chat message database model
+    One row per message, appended in order - a turn inserts two rows
+    instead of rewriting the session's whole message list.
+    """
+    __tablename__ = "chat_messages"
+    
+    session_id = Column(String(255), ForeignKey("chat_sessions.session_id", ondelete="CASCADE"), primary_key=True)
+    seq = Column(Integer, primary_key=True, autoincrement=False)  # Position in the conversation, from 0
+    role = Column(String(50), nullable=False)
+    content = Column(Text, nullable=False, default="")
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,204 @@
+"""
+Compressed bitmaps of listing slots for the facet index.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+# Slots are split by their high bits into chunks of 2**16, as in Roaring bitmaps
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+CHUNK_BYTES = (1 << CHUNK_BITS) // 8
+# A chunk holding up to this many slots is a sorted uint16 array (2 bytes a
+# slot); past it a 65536-bit int (8 KiB) is the smaller of the two
+ARRAY_MAX = CHUNK_BYTES // 2
+
+# Sorted np.uint16 array for sparse chunks, int for dense ones
+Container = Union[np.ndarray, int]
+
+
+def _dense_bytes(container: int) -> np.ndarray:
+    return np.frombuffer(container.to_bytes(CHUNK_BYTES, "little"), dtype=np.uint8)
+
+
+def _to_int(values: np.ndarray) -> int:
+    mask = np.zeros(1 << CHUNK_BITS, dtype=bool)
+    mask[values] = True
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def _to_array(container: int) -> np.ndarray:
+    bits = np.unpackbits(_dense_bytes(container), bitorder="little")
+    return np.flatnonzero(bits).astype(np.uint16)
+
+
+def _members(values: np.ndarray, container: int) -> np.ndarray:
+    """Mask of the values whose bit is set in a dense container."""
+    return (_dense_bytes(container)[values >> 3] >> (values & 7)) & 1 == 1
+
+
+def _compact(container: Container) -> Optional[Container]:
+    """The container in its smaller form, or None when it is empty."""
+    if isinstance(container, int):
+        count = container.bit_count()
+        if count > ARRAY_MAX:
+            return container
+        return _to_array(container) if count else None
+    if len(container) > ARRAY_MAX:
+        return _to_int(container)
+    return container if len(container) else None
+
+
+def _and(a: Container, b: Container) -> Optional[Container]:
+    if isinstance(a, int) and isinstance(b, int):
+        return _compact(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return _compact(a[_members(a, b)])
+    return _compact(np.intersect1d(a, b, assume_unique=True))
+
+
+def _and_count(a: Container, b: Container) -> int:
+    if isinstance(a, int) and isinstance(b, int):
+        return (a & b).bit_count()
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return int(np.count_nonzero(_members(a, b)))
+    return len(np.intersect1d(a, b, assume_unique=True))
+
+
+def _or(containers: List[Container]) -> Container:
+    if len(containers) == 1:
+        return containers[0]
+    if any(isinstance(c, int) for c in containers):
+        dense = 0
+        for c in containers:
+            dense |= c if isinstance(c, int) else _to_int(c)
+        return dense
+    return _compact(np.unique(np.concatenate(containers)))
+
+
+class Bitmap:
+    """
+    Set of slots stored Roaring-style: slots are grouped by their high 16
+    bits, and each non-empty chunk is a sorted uint16 array when it holds
+    at most ARRAY_MAX slots, else a 2**16-bit int. Memory follows the
+    number of slots set, not the highest slot, and empty chunks cost
+    nothing.
+
+    The operators return new bitmaps that may share containers with their
+    operands, so containers are never modified in place: add() and
+    discard() replace the container they change.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: Optional[Dict[int, Container]] = None) -> None:
+        self.chunks: Dict[int, Container] = chunks if chunks is not None else {}
+
+    @classmethod
+    def from_slots(cls, slots: Iterable[int]) -> "Bitmap":
+        """Bitmap of the given slots, each chunk built in one pass."""
+        values = np.unique(np.fromiter(slots, dtype=np.int64))
+        chunks: Dict[int, Container] = {}
+        if len(values):
+            keys = values >> CHUNK_BITS
+            for part in np.split(values, np.flatnonzero(np.diff(keys)) + 1):
+                chunks[int(part[0]) >> CHUNK_BITS] = _compact((part & CHUNK_MASK).astype(np.uint16))
+        return cls(chunks)
+
+    @classmethod
+    def union(cls, bitmaps: Iterable["Bitmap"]) -> "Bitmap":
+        """OR of many bitmaps, merging each chunk once."""
+        grouped: Dict[int, List[Container]] = {}
+        for bitmap in bitmaps:
+            for key, container in bitmap.chunks.items():
+                grouped.setdefault(key, []).append(container)
+        return cls({key: _or(containers) for key, containers in sorted(grouped.items())})
+
+    def copy(self) -> "Bitmap":
+        """A bitmap that add() and discard() can change without affecting this one."""
+        return Bitmap(dict(self.chunks))
+
+    def __len__(self) -> int:
+        return sum(c.bit_count() if isinstance(c, int) else len(c) for c in self.chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        for key, container in self.chunks.items():
+            values = _to_array(container) if isinstance(container, int) else container
+            if key:
+                values = values.astype(np.int64) + (key << CHUNK_BITS)
+            yield from values.tolist()
+
+    def __contains__(self, slot: int) -> bool:
+        container = self.chunks.get(slot >> CHUNK_BITS)
+        if container is None:
+            return False
+        value = slot & CHUNK_MASK
+        if isinstance(container, int):
+            return bool(container >> value & 1)
+        pos = int(np.searchsorted(container, value))
+        return pos < len(container) and int(container[pos]) == value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Bitmap) and list(self) == list(other)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        chunks: Dict[int, Container] = {}
+        for key, container in self.chunks.items():
+            other_container = other.chunks.get(key)
+            if other_container is not None:
+                result = _and(container, other_container)
+                if result is not None:
+                    chunks[key] = result
+        return Bitmap(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap.union((self, other))
+
+    def intersection_len(self, other: "Bitmap") -> int:
+        """len(self & other) without building the intersection."""
+        return sum(
+            _and_count(container, other.chunks[key])
+            for key, container in self.chunks.items()
+            if key in other.chunks
+        )
+
+    def add(self, slot: int) -> None:
+        key, value = slot >> CHUNK_BITS, slot & CHUNK_MASK
+        container = self.chunks.get(key)
+        if container is None:
+            self.chunks[key] = np.array([value], dtype=np.uint16)
+            self.chunks = dict(sorted(self.chunks.items()))
+        elif isinstance(container, int):
+            self.chunks[key] = container | (1 << value)
+        else:
+            pos = int(np.searchsorted(container, value))
+            if pos == len(container) or int(container[pos]) != value:
+                self.chunks[key] = _compact(np.insert(container, pos, value))
+
+    def discard(self, slot: int) -> None:
+        key, value = slot >> CHUNK_BITS, slot & CHUNK_MASK
+        container = self.chunks.get(key)
+        if container is None:
+            return
+        if isinstance(container, int):
+            updated = _compact(container & ~(1 << value))
+        else:
+            pos = int(np.searchsorted(container, value))
+            if pos == len(container) or int(container[pos]) != value:
+                return
+            updated = _compact(np.delete(container, pos))
+        if updated is None:
+            del self.chunks[key]
+        else:
+            self.chunks[key] = updated
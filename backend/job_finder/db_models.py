@@ -36,7 +36,7 @@ class JobSeekerProfileORM(Base):
     work_type = Column(String(50), nullable=True)
     industries = Column(JSON, default=list)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Job alerts high-water mark
     user_id = Column(String(64), nullable=True)
 
     recommendations = relationship(
@@ -73,8 +73,8 @@ class JobRecommendationORM(Base):
     __tablename__ = "job_finder_recommendations"
 
     id = Column(String, primary_key=True, index=True)
-    job_id = Column(String, ForeignKey("job_finder_listings.id"), nullable=False)
-    seeker_id = Column(String, ForeignKey("job_finder_profiles.id"), nullable=False)
+    job_id = Column(String, ForeignKey("job_finder_listings.id"), nullable=False, index=True)
+    seeker_id = Column(String, ForeignKey("job_finder_profiles.id"), nullable=False, index=True)
     match_score = Column(Integer, nullable=False)
     explanation = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -82,3 +82,19 @@ class JobRecommendationORM(Base):
     job = relationship("JobListingORM", back_populates="recommendations")
     seeker = relationship("JobSeekerProfileORM", back_populates="recommendations")
 
+
+class JobFinderSessionORM(Base):
+    """Persistent Job Finder interview session (its profile lives in job_finder_profiles)."""
+
+    __tablename__ = "job_finder_sessions"
+
+    session_id = Column(String, primary_key=True, index=True)
+    profile_id = Column(String, ForeignKey("job_finder_profiles.id"), nullable=False)
+    messages = Column(JSON, default=list)
+    is_profile_complete = Column(Integer, default=0)  # 0 = False, 1 = True (SQLite compatibility)
+    recommendation_ids = Column(JSON, default=list)  # Ordered ids of job_finder_recommendations rows
+    version = Column(Integer, nullable=False, default=0)  # Bumped on every save, for cache validation
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    profile = relationship("JobSeekerProfileORM")
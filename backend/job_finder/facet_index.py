@@ -0,0 +1,218 @@
+"""
+Bitmap facet index for Job Finder filters and filter options.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .bitmap import Bitmap
+from .models import JobListing
+
+FACETS = ("locations", "work_types", "experience_levels", "companies", "skills", "industries")
+# Facets filtered by substring (filter "new york" matches "New York, NY");
+# the others need the whole value to match, ignoring case
+SUBSTRING_FACETS = ("locations", "companies")
+
+
+def facet_values(job: JobListing) -> Dict[str, List[str]]:
+    """The values a listing contributes to each facet."""
+    return {
+        "locations": [job.location] if job.location else [],
+        "work_types": [job.work_type] if job.work_type else [],
+        "experience_levels": [job.experience_level] if job.experience_level else [],
+        "companies": [job.company] if job.company else [],
+        "skills": list(job.required_skills) + list(job.optional_skills),
+        "industries": list(job.industries or []),
+    }
+
+
+class FacetIndex:
+    """
+    One compressed bitmap (see bitmap.Bitmap) per facet value, with bit i
+    set for the listing in slot i. The index hands out the slots itself and
+    reuses freed ones lowest first, so bitmaps span the live catalogue
+    rather than every listing ever indexed. Each listing also carries a
+    rank (its JobIndex position), and jobs() returns listings by rank.
+
+    A filter is an OR of the bitmaps of the values it matches within a
+    facet, ANDed across facets, so filtering never touches listings that
+    are not selected. Counts are disjunctive like LinkedIn's: each facet's
+    counts apply every filter except that facet's own, so they show how
+    many results picking another value would add.
+    """
+
+    def __init__(self) -> None:
+        self.bitmaps: Dict[str, Dict[str, Bitmap]] = {facet: {} for facet in FACETS}
+        self.live = Bitmap()
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []  # Heap of freed slots
+        self._next_slot = 0
+        self._ranks: List[int] = []  # By slot
+        self._jobs: Dict[int, JobListing] = {}
+        self._values: Dict[int, Dict[str, List[str]]] = {}
+        # (listing, value) pairs per facet, for the counting cost model
+        self._pairs: Dict[str, int] = dict.fromkeys(FACETS, 0)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def copy(self) -> "FacetIndex":
+        """Independent copy; listings and their facet values are shared, never modified."""
+        clone = FacetIndex.__new__(FacetIndex)
+        clone.bitmaps = {
+            facet: {value: bitmap.copy() for value, bitmap in bitmaps.items()}
+            for facet, bitmaps in self.bitmaps.items()
+        }
+        clone.live = self.live.copy()
+        clone._slots = dict(self._slots)
+        clone._free = list(self._free)
+        clone._next_slot = self._next_slot
+        clone._ranks = list(self._ranks)
+        clone._jobs = dict(self._jobs)
+        clone._values = dict(self._values)
+        clone._pairs = dict(self._pairs)
+        return clone
+
+    def add(self, job: JobListing, rank: int) -> None:
+        """Index a listing, replacing any previous version with the same id."""
+        self.remove(job.id)
+        slot = self._take_slot(job, rank)
+        self.live.add(slot)
+        for facet, values in self._values[slot].items():
+            bitmaps = self.bitmaps[facet]
+            for value in values:
+                bitmaps.setdefault(value, Bitmap()).add(slot)
+
+    def add_many(self, ranked_jobs: Iterable[Tuple[int, JobListing]]) -> None:
+        """
+        Index many listings at once, building each bitmap in one pass where
+        add() per listing would rewrite containers every time.
+        """
+        slots_by_value: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        live: List[int] = []
+        for rank, job in ranked_jobs:
+            self.remove(job.id)
+            slot = self._take_slot(job, rank)
+            live.append(slot)
+            for facet, values in self._values[slot].items():
+                for value in values:
+                    slots_by_value[facet].setdefault(value, []).append(slot)
+        self.live = self.live | Bitmap.from_slots(live)
+        for facet, values in slots_by_value.items():
+            bitmaps = self.bitmaps[facet]
+            for value, slots in values.items():
+                added = Bitmap.from_slots(slots)
+                bitmaps[value] = bitmaps[value] | added if value in bitmaps else added
+
+    def remove(self, job_id: str) -> None:
+        slot = self._slots.pop(job_id, None)
+        if slot is None:
+            return
+        del self._jobs[slot]
+        heapq.heappush(self._free, slot)
+        self.live.discard(slot)
+        for facet, values in self._values.pop(slot).items():
+            self._pairs[facet] -= len(values)
+            bitmaps = self.bitmaps[facet]
+            for value in values:
+                bitmap = bitmaps.get(value)
+                if bitmap is not None:
+                    bitmap.discard(slot)
+                    if not bitmap:
+                        del bitmaps[value]
+
+    def _take_slot(self, job: JobListing, rank: int) -> int:
+        if self._free:
+            slot = heapq.heappop(self._free)
+            self._ranks[slot] = rank
+        else:
+            slot = self._next_slot
+            self._next_slot += 1
+            self._ranks.append(rank)
+        self._slots[job.id] = slot
+        self._jobs[slot] = job
+        self._values[slot] = facet_values(job)
+        for facet, values in self._values[slot].items():
+            self._pairs[facet] += len(values)
+        return slot
+
+    def options(self) -> Dict[str, List[str]]:
+        """Sorted values of every facet (MatchingAgent.extract_filter_options' shape)."""
+        return {facet: sorted(self.bitmaps[facet]) for facet in FACETS}
+
+    def select_with_counts(
+        self, filters: Optional[dict], within: Optional[Iterable[str]] = None
+    ) -> Tuple[Bitmap, Dict[str, Dict[str, int]]]:
+        """
+        Bitmap of the listings passing every facet filter, plus per-facet
+        value counts computed with every filter but the facet's own. With
+        `within` (job ids, e.g. a text search's hits) both only cover those
+        listings.
+
+        Each facet is counted the cheaper of two ways, costed in container
+        operations: tallying visits every (listing, value) pair of the
+        listings left, while intersecting visits one container per value
+        and chunk of the selection.
+        """
+        filters = filters or {}
+        selections = self._facet_selections(filters)
+        base = self.live
+        if within is not None:
+            base = Bitmap.from_slots(self._slots[job_id] for job_id in within if job_id in self._slots)
+        counts: Dict[str, Dict[str, int]] = {}
+        for facet in FACETS:
+            others = base
+            for other, bitmap in selections.items():
+                if other != facet:
+                    others = others & bitmap
+            bitmaps = self.bitmaps[facet]
+            tally_cost = len(others) * self._pairs[facet] / max(len(self._jobs), 1)
+            if tally_cost < len(bitmaps) * len(others.chunks):
+                counts[facet] = self._tally(facet, others)
+            else:
+                counts[facet] = {
+                    value: count
+                    for value, bitmap in bitmaps.items()
+                    if (count := bitmap.intersection_len(others))
+                }
+        selected = base
+        for bitmap in selections.values():
+            selected = selected & bitmap
+        return selected, counts
+
+    def jobs(self, bitmap: Bitmap) -> List[JobListing]:
+        """Listings of a bitmap, by rank."""
+        slots = list(bitmap)
+        slots.sort(key=self._ranks.__getitem__)
+        return [self._jobs[slot] for slot in slots]
+
+    def _tally(self, facet: str, bitmap: Bitmap) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for slot in bitmap:
+            for value in set(self._values[slot][facet]):
+                counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def _facet_selections(self, filters: dict) -> Dict[str, Bitmap]:
+        selections: Dict[str, Bitmap] = {}
+        for facet in FACETS:
+            wanted = filters.get(facet)
+            if wanted:
+                selections[facet] = self._match_values(facet, [w.lower() for w in wanted])
+        return selections
+
+    def _match_values(self, facet: str, wanted: List[str]) -> Bitmap:
+        if facet in SUBSTRING_FACETS:
+            if "" in wanted:
+                # An empty filter string is a substring of every listing's value
+                return self.live
+            match = lambda value: any(w in value.lower() for w in wanted)
+        else:
+            wanted_set = set(wanted)
+            match = lambda value: value.lower() in wanted_set
+        return Bitmap.union(
+            value_bitmap for value, value_bitmap in self.bitmaps[facet].items() if match(value)
+        )
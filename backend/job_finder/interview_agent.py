@@ -5,12 +5,18 @@ Phase 3: AI Logic scaffolding
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import sys
-from typing import Dict, List, Optional
-from openai import OpenAI
+from typing import Dict, List, Optional, Tuple
 
+try:
+    from ..agents.base import get_async_openai_client
+except ImportError:
+    from agents.base import get_async_openai_client
+
+from .keyword_extractor import get_keyword_extractor
 from .models import JobSeekerProfile
 
 REQUIRED_FIELDS: Dict[str, str] = {
@@ -29,14 +35,18 @@ class InterviewAgent:
 
     def __init__(self) -> None:
         self.questions_order = list(REQUIRED_FIELDS.keys())
-        # Initialize OpenAI client for LLM fallback
+        # Title/skill/industry/location/work type keywords (job_finder/vocabulary.json)
+        self.extractor = get_keyword_extractor()
+        # Shared async OpenAI client for the LLM fallback (see aprocess_message)
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
-            self.client = OpenAI(api_key=api_key)
+            self.client = get_async_openai_client()
             self.model = "gpt-4o-mini"
         else:
             self.client = None
             self.model = None
+        # Seconds a turn may spend on the LLM before asking the next question as is
+        self.llm_deadline_seconds = float(os.getenv("JOB_FINDER_LLM_DEADLINE_SECONDS", "3"))
 
     def get_next_question(self, profile: JobSeekerProfile) -> str | None:
         # Check if we have enough info to make recommendations
@@ -65,61 +75,66 @@ class InterviewAgent:
         profile: JobSeekerProfile,
     ) -> Dict[str, str | bool]:
         """
-        Extract structured data from user message with improved keyword extraction and LLM fallback.
+        Extract structured data from user message with keyword extraction only.
+
+        For callers outside an event loop; aprocess_message adds the LLM fallback.
         """
+        return self._turn_result(profile, self._extract_keywords(message, profile))
+
+    async def aprocess_message(
+        self,
+        message: str,
+        profile: JobSeekerProfile,
+        deadline_seconds: Optional[float] = None,
+    ) -> Dict[str, str | bool]:
+        """
+        Extract structured data from user message with keyword extraction and LLM fallback.
+
+        The fallback (used when no keyword matched) awaits the shared async
+        client and gets deadline_seconds (default llm_deadline_seconds) in
+        total; past the deadline it is cancelled and the turn asks the next
+        question exactly as without an LLM.
+        """
+        updates = self._extract_keywords(message, profile)
+        response = None
+        if not updates and self.client:
+            deadline = self.llm_deadline_seconds if deadline_seconds is None else deadline_seconds
+            try:
+                updates, response = await asyncio.wait_for(self._llm_fallback(message, profile), deadline)
+            except asyncio.TimeoutError:
+                print(f"DEBUG [InterviewAgent]: LLM fallback exceeded {deadline}s, asking the next question")
+        return self._turn_result(profile, updates, response)
+
+    def _extract_keywords(self, message: str, profile: JobSeekerProfile) -> Dict[str, str | List[str]]:
+        """Profile updates found deterministically in the message."""
         lower = message.lower()
         updates: Dict[str, str | List[str]] = {}
+        # One pass over the message finds the keywords of every category
+        found = self.extractor.extract(message)
 
-        # Extract work type
-        if "remote" in lower:
-            updates["work_type"] = "remote"
-        elif "hybrid" in lower:
-            updates["work_type"] = "hybrid"
-        elif "onsite" in lower or "on-site" in lower:
-            updates["work_type"] = "onsite"
+        # Extract work type (remote wins over hybrid over onsite, in vocabulary order)
+        if found["work_types"]:
+            updates["work_type"] = found["work_types"][0]
 
         # Extract preferred titles
-        title_keywords = ["frontend", "backend", "full-stack", "fullstack", "full stack", "engineer", 
-                         "developer", "product manager", "designer", "devops", "data scientist",
-                         "qa", "lead", "senior", "junior", "mid-level"]
-        found_titles = [t for t in title_keywords if t in lower]
-        if found_titles:
-            updates["preferred_titles"] = found_titles
-
-        # Extract skills - more sophisticated parsing
-        skill_keywords = ["react", "next.js", "nextjs", "angular", "vue", "svelte",
-                         "typescript", "javascript", "python", "java", "golang",
-                         "node", "nodejs", "express", "django", "flask", "fastapi", 
-                         "kubernetes", "docker", "aws", "gcp", "azure", 
-                         "sql", "postgres", "mongodb", "redis", "firebase",
-                         "figma", "sketch", "ui", "ux", "design", "testing", "selenium",
-                         "git", "agile", "scrum", "leadership", "communication", "graphql"]
-        found_skills = [s for s in skill_keywords if s in lower]
-        if found_skills:
+        if found["titles"]:
+            updates["preferred_titles"] = found["titles"]
+
+        # Extract skills, keeping the ones already in the profile
+        if found["skills"]:
             existing_skills = [s.lower() for s in profile.skills if len(s) > 3]
-            all_skills = list(set(existing_skills + found_skills))
+            all_skills = list(set(existing_skills + found["skills"]))
             updates["skills"] = sorted(all_skills)
 
         # Extract industries
-        industry_keywords = ["ai", "saas", "fintech", "healthcare", "ecommerce", "edtech",
-                           "travel", "social", "startup", "fortune 500", "crypto", "blockchain"]
-        found_industries = [ind for ind in industry_keywords if ind in lower]
-        if found_industries:
-            updates["industries"] = found_industries
-
-        # Extract preferred locations (more comprehensive)
-        location_keywords = ["remote", "san francisco", "new york", "seattle", "austin",
-                            "london", "berlin", "toronto", "us", "usa", "europe",
-                            "jordan", "amman", "beirut", "dubai", "uae", "middle east",
-                            "tokyo", "singapore", "sydney", "india", "bangalore"]
-        found_locations = [loc for loc in location_keywords if loc in lower and loc != "remote"]
-        
-        # If they mention "remote", add it to locations
-        if "remote" in lower:
-            found_locations.append("remote")
-        
-        if found_locations:
-            updates["preferred_locations"] = found_locations
+        if found["industries"]:
+            updates["industries"] = found["industries"]
+
+        # Extract preferred locations ("remote" last, if mentioned)
+        if found["locations"]:
+            updates["preferred_locations"] = [loc for loc in found["locations"] if loc != "remote"]
+            if "remote" in found["locations"]:
+                updates["preferred_locations"].append("remote")
 
         # Check if user explicitly mentioned their current role
         if any(word in lower for word in ["i'm a", "i am a", "currently", "working as", "my role"]):
@@ -127,27 +142,37 @@ class InterviewAgent:
             words = message.split()
             updates["current_role"] = message[:100]  # Take first 100 chars as current role
 
-        # If no keywords were extracted and LLM is available, use LLM to understand the message
-        if not updates and self.client and len(message.strip()) >= 2:
-            try:
-                updates = self._extract_with_llm(message, profile)
-            except Exception as e:
-                print(f"DEBUG [InterviewAgent]: LLM extraction failed: {e}, continuing with no updates")
-                # Continue without updates - will just ask next question
+        return updates
+
+    async def _llm_fallback(
+        self,
+        message: str,
+        profile: JobSeekerProfile,
+    ) -> Tuple[Dict[str, str | List[str]], Optional[str]]:
+        """(updates, conversational response) for a message no keyword matched."""
+        updates: Dict[str, str | List[str]] = {}
+        # Use the LLM to understand the message
+        if len(message.strip()) >= 2:
+            updates = await self._extract_with_llm(message, profile)
 
-        
-        next_question = self.get_next_question(profile.copy(update=updates))
-        is_complete = next_question is None
-        
         # If no updates were made (user said something like "hi" or "how are you"),
         # generate a more natural follow-up response
+        next_question = self.get_next_question(profile.copy(update=updates))
+        if not updates and next_question:
+            return updates, await self._generate_conversational_response(message, next_question, profile)
+        return updates, None
+
+    def _turn_result(
+        self,
+        profile: JobSeekerProfile,
+        updates: Dict[str, str | List[str]],
+        response: Optional[str] = None,
+    ) -> Dict[str, str | bool]:
+        next_question = self.get_next_question(profile.copy(update=updates))
+        is_complete = next_question is None
         final_response = next_question or "[PROFILE_COMPLETE]"
-        if not updates and next_question and self.client:
-            try:
-                final_response = self._generate_conversational_response(message, next_question, profile)
-            except Exception as e:
-                print(f"DEBUG [InterviewAgent]: Failed to generate conversational response: {e}")
-                # Fall back to just the question
+        if response and next_question:
+            final_response = response
 
         return {
             "question": final_response,
@@ -155,7 +180,7 @@ class InterviewAgent:
             "updates": updates,
         }
 
-    def _extract_with_llm(self, message: str, profile: JobSeekerProfile) -> Dict[str, str | List[str]]:
+    async def _extract_with_llm(self, message: str, profile: JobSeekerProfile) -> Dict[str, str | List[str]]:
         """
         Use LLM to extract job seeker information from conversational input.
         
@@ -207,7 +232,7 @@ For casual messages like 'hi', 'how are you', 'thanks', etc with no job info, re
 Return ONLY valid JSON, no markdown formatting."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,  # Low temperature for structured extraction
@@ -231,7 +256,7 @@ Return ONLY valid JSON, no markdown formatting."""
             print(f"DEBUG [InterviewAgent]: LLM extraction error: {e}")
             return {}
 
-    def _generate_conversational_response(self, user_message: str, next_question: str, profile: JobSeekerProfile) -> str:
+    async def _generate_conversational_response(self, user_message: str, next_question: str, profile: JobSeekerProfile) -> str:
         """
         Generate a natural, conversational response that acknowledges the user's message 
         and smoothly transitions to the next interview question.
@@ -259,7 +284,7 @@ Your task: Write a natural, friendly response that:
 Write ONLY the response, no preamble. End with the question."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,  # Slightly higher for natural tone
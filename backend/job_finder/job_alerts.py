@@ -0,0 +1,223 @@
+"""
+Job alerts - push new and updated job posts to the seekers they match.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete
+
+from .db_models import JobFinderSessionORM, JobListingORM, JobRecommendationORM, JobSeekerProfileORM
+from .job_index import JobFeatures
+from .listing_snapshot import listing_from_row
+from .matching_agent import MatchingAgent
+from .models import JobListing, JobSeekerProfile
+from .seeker_index import SeekerIndex
+from .session_store import listing_values, profile_from_row, profile_row, upsert_rows
+
+
+class JobAlertService:
+    """
+    Matches each created or updated JobPost against the SeekerIndex of
+    completed profiles and stores the results as JobRecommendationORM rows.
+
+    Only seekers sharing a signal with the job are scored, so the work per
+    post is independent of how many seekers exist. The index is refreshed
+    before every match with the profiles whose updated_at passed its
+    high-water mark, which picks up profiles completed on other workers the
+    way ListingSnapshot picks up job posts. Posts arrive through the
+    JobPostRepository listener and are processed on one background thread,
+    each in its own session and transaction: the job's mirror row in
+    job_finder_listings and its recommendations are upserted in bulk, and
+    recommendations it no longer earns are deleted.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], matching_agent: Optional[MatchingAgent] = None) -> None:
+        self.session_factory = session_factory
+        self.matching_agent = matching_agent or MatchingAgent(matching_mode="heuristic")
+        self._index: Optional[SeekerIndex] = None
+        self._index_lock = threading.Lock()
+        # Profiles committed late can carry an updated_at slightly behind the
+        # high-water mark, so each refresh re-reads this window
+        self.lookback = timedelta(seconds=float(os.getenv("JOB_SNAPSHOT_LOOKBACK_SECONDS", "5")))
+        self._stamps: Dict[str, Tuple[Optional[datetime], bool]] = {}
+        self._high_water: Optional[datetime] = None
+        self._queue: "queue.Queue[Tuple[str, int]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    # -- seeker profiles -------------------------------------------------
+
+    def seeker_index(self, db: Any) -> SeekerIndex:
+        """
+        Index of the stored profiles: loaded from the database on first use,
+        then refreshed with the profiles changed since the last call.
+        Profiles of Job Finder sessions still being interviewed are left out.
+        """
+        with self._index_lock:
+            if self._index is None:
+                self._index = SeekerIndex()
+                self._stamps = {}
+                self._high_water = None
+            self._refresh_profiles(db)
+            return self._index
+
+    def _refresh_profiles(self, db: Any) -> None:
+        query = (
+            db.query(JobSeekerProfileORM, JobFinderSessionORM.session_id, JobFinderSessionORM.is_profile_complete)
+            .outerjoin(JobFinderSessionORM, JobFinderSessionORM.profile_id == JobSeekerProfileORM.id)
+        )
+        if self._high_water is not None:
+            query = query.filter(JobSeekerProfileORM.updated_at >= self._high_water - self.lookback)
+        rows: Dict[str, JobSeekerProfileORM] = {}
+        complete: Dict[str, bool] = {}
+        for row, session_id, is_profile_complete in query:
+            rows[row.id] = row
+            complete[row.id] = complete.get(row.id, False) or session_id is None or is_profile_complete == 1
+        for profile_id, row in rows.items():
+            stamp = (row.updated_at, complete[profile_id])
+            if self._stamps.get(profile_id) == stamp:
+                continue
+            self._stamps[profile_id] = stamp
+            if complete[profile_id]:
+                self._index.add(profile_from_row(row))
+            else:
+                self._index.remove(profile_id)
+            if row.updated_at is not None and (self._high_water is None or row.updated_at > self._high_water):
+                self._high_water = row.updated_at
+
+    def upsert_profile(self, db: Any, profile: JobSeekerProfile) -> None:
+        """Store a completed profile and index it so later posts can reach it."""
+        db.merge(profile_row(profile))
+        db.commit()
+        self.add_profile(db, profile)
+
+    def add_profile(self, db: Any, profile: JobSeekerProfile) -> None:
+        """Index an already stored completed profile."""
+        self.seeker_index(db).add(profile)
+
+    # -- matching --------------------------------------------------------
+
+    def match_job(self, db: Any, job: JobListing) -> List[Tuple[int, JobSeekerProfile]]:
+        """(score, profile) of every seeker the job reaches MIN_MATCH_SCORE for."""
+        index = self.seeker_index(db)
+        features = JobFeatures.from_listing(job)
+        matches = []
+        for seeker_id in index.candidates(features, self.matching_agent.MIN_MATCH_SCORE):
+            score = self.matching_agent.score_features(index.features(seeker_id), features)
+            if score >= self.matching_agent.MIN_MATCH_SCORE:
+                matches.append((score, index.get(seeker_id)))
+        return matches
+
+    def push_job(self, db: Any, job: JobListing) -> int:
+        """Replace a job's stored recommendations with its current matches; returns how many."""
+        matches = self.match_job(db, job)
+        upsert_rows(db, JobListingORM, [listing_values(job)])
+        ids = [f"rec-{job.id}-{seeker.id}" for _, seeker in matches]
+        db.execute(
+            delete(JobRecommendationORM)
+            .where(JobRecommendationORM.job_id == job.id, JobRecommendationORM.id.not_in(ids))
+        )
+        if matches:
+            now = datetime.utcnow()
+            # Upserted so a session save writing the same rec-{job}-{seeker}
+            # row concurrently cannot make either transaction fail
+            upsert_rows(db, JobRecommendationORM, [
+                {
+                    "id": f"rec-{job.id}-{seeker.id}",
+                    "job_id": job.id,
+                    "seeker_id": seeker.id,
+                    "match_score": score,
+                    "explanation": self.matching_agent.build_explanation(seeker, job, score),
+                    "created_at": now,
+                }
+                for score, seeker in matches
+            ])
+        db.commit()
+        return len(matches)
+
+    def retract_job(self, db: Any, job_id: str) -> None:
+        """Drop a deleted job's recommendations and mirror row."""
+        db.execute(delete(JobRecommendationORM).where(JobRecommendationORM.job_id == job_id))
+        db.execute(delete(JobListingORM).where(JobListingORM.id == job_id))
+        db.commit()
+
+    # -- background processing -------------------------------------------
+
+    def on_job_post_change(self, event: str, post_id: Optional[int]) -> None:
+        """JobPostRepository listener: queue the post for the alert worker."""
+        if post_id is None:
+            return
+        self._queue.put((event, post_id))
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="job-alerts", daemon=True)
+            self._worker.start()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued post has been processed (for tests and shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            event, post_id = self._queue.get()
+            try:
+                self._process(event, post_id)
+            except Exception as e:
+                print(f"ERROR in job alerts for post {post_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _process(self, event: str, post_id: int) -> None:
+        try:
+            from ..db_models import JobPost
+        except ImportError:
+            from db_models import JobPost
+        db = self.session_factory()
+        try:
+            if event == "delete":
+                self.retract_job(db, str(post_id))
+                return
+            # Notifications arrive after the write committed; a missing row
+            # was deleted again before the worker got to it
+            post = db.get(JobPost, post_id)
+            if post is None:
+                return
+            count = self.push_job(db, listing_from_row(post))
+            print(f"DEBUG: job post {post_id} pushed to {count} seekers")
+        finally:
+            db.close()
+
+
+_service: Optional[JobAlertService] = None
+_service_lock = threading.Lock()
+
+
+def get_job_alert_service() -> JobAlertService:
+    """
+    The process-wide alert service, registered as a JobPostRepository
+    listener (unless JOB_ALERTS_ENABLED=false).
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            try:
+                from ..database import SessionLocal
+                from ..repositories import JobPostRepository
+            except ImportError:
+                from database import SessionLocal
+                from repositories import JobPostRepository
+            _service = JobAlertService(SessionLocal)
+            if os.getenv("JOB_ALERTS_ENABLED", "true").lower() not in ("false", "0", "no"):
+                JobPostRepository.add_listener(_service.on_job_post_change)
+        return _service
@@ -0,0 +1,342 @@
+"""
+Inverted index over job listings for candidate retrieval.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .facet_index import FacetIndex
+from .models import JobListing, JobSeekerProfile
+from .text_index import TextIndex
+
+# Points a job can earn in MatchingAgent.score_job without sharing anything
+# with the seeker: the tech-role bonus plus the remote work type fallback.
+TECH_TITLE_BONUS = 5
+UNMATCHED_WORK_TYPE_BONUS = 15
+HYBRID_WORK_TYPE_POINTS = 10
+TECH_KEYWORDS = ("engineer", "developer", "architect", "programmer")
+
+# Per-signal points of MatchingAgent.score_job, used for score upper bounds
+REQUIRED_SKILL_POINTS, REQUIRED_SKILL_CAP = 20, 60
+OPTIONAL_SKILL_POINTS, OPTIONAL_SKILL_CAP = 8, 20
+TITLE_MATCH_POINTS = 30
+WORK_TYPE_MATCH_POINTS = 25
+LOCATION_MATCH_POINTS = 35
+REMOTE_LOCATION_POINTS = 20
+INDUSTRY_MATCH_POINTS = 10
+
+
+class JobFeatures(NamedTuple):
+    """Lowercased fields of a listing, computed once per job for scoring."""
+
+    required_skills: FrozenSet[str]
+    optional_skills: FrozenSet[str]
+    title: str
+    work_type: str
+    location: str
+    industries: FrozenSet[str]
+
+    @classmethod
+    def from_listing(cls, job: JobListing) -> "JobFeatures":
+        return cls(
+            required_skills=frozenset(s.lower() for s in job.required_skills),
+            optional_skills=frozenset(s.lower() for s in job.optional_skills),
+            title=job.title.lower(),
+            work_type=(job.work_type or "").lower(),
+            location=(job.location or "").lower(),
+            industries=frozenset(i.lower() for i in job.industries or []),
+        )
+
+
+class SeekerFeatures(NamedTuple):
+    """Lowercased seeker preferences, computed once per matching call."""
+
+    skills: FrozenSet[str]
+    titles: List[str]
+    work_type: str
+    locations: FrozenSet[str]
+    industries: FrozenSet[str]
+
+    @classmethod
+    def from_profile(cls, seeker: JobSeekerProfile) -> "SeekerFeatures":
+        return cls(
+            skills=frozenset(s.lower() for s in seeker.skills),
+            titles=[t.lower() for t in seeker.preferred_titles],
+            work_type=(seeker.work_type or "").lower(),
+            locations=frozenset(loc.lower() for loc in seeker.preferred_locations),
+            industries=frozenset(i.lower() for i in seeker.industries),
+        )
+
+
+class JobIndex:
+    """
+    Posting lists from skill, title, work type, location and industry to job ids.
+
+    candidates() returns every job that shares at least one scoring signal
+    with the seeker, which is a superset of the jobs able to reach a match
+    threshold above the no-overlap bonus. Title and location matches in
+    score_job are substring checks, so they are resolved against the
+    vocabulary of distinct titles/locations rather than per job.
+    Listings can be added and removed incrementally, or applied to a copy()
+    while readers keep using the original.
+    """
+
+    POSTING_LISTS = ("required_skills", "optional_skills", "industries", "work_types", "titles", "locations")
+
+    def __init__(self, jobs: Iterable[JobListing] = ()) -> None:
+        self._lock = threading.RLock()
+        self._listings: Dict[str, JobListing] = {}
+        self._features: Dict[str, JobFeatures] = {}
+        # Insertion position, so candidates come back in listing order
+        self._position: Dict[str, int] = {}
+        self._next_position = 0
+        # Bumped on every add/remove so derived structures know when to rebuild;
+        # copies keep the lineage, so (lineage, version) identifies the contents
+        self.version = 0
+        self.lineage = object()
+        self.required_skills: Dict[str, Set[str]] = {}
+        self.optional_skills: Dict[str, Set[str]] = {}
+        self.industries: Dict[str, Set[str]] = {}
+        self.work_types: Dict[str, Set[str]] = {}
+        self.titles: Dict[str, Set[str]] = {}
+        self.locations: Dict[str, Set[str]] = {}
+        self.remote_locations: Set[str] = set()
+        # Filter bitmaps
+        self.facets = FacetIndex()
+        self.text = TextIndex()
+        with self._lock:
+            for job in jobs:
+                self._add(job)
+            self.facets.add_many((self._position[job_id], job) for job_id, job in self._listings.items())
+
+    def __len__(self) -> int:
+        return len(self._listings)
+
+    def copy(self) -> "JobIndex":
+        """
+        Independent copy with the same lineage and version. Listings and their
+        features are immutable and shared; posting lists are copied.
+        """
+        with self._lock:
+            clone = JobIndex.__new__(JobIndex)
+            clone._lock = threading.RLock()
+            clone._listings = dict(self._listings)
+            clone._features = dict(self._features)
+            clone._position = dict(self._position)
+            clone._next_position = self._next_position
+            clone.version = self.version
+            clone.lineage = self.lineage
+            for name in self.POSTING_LISTS:
+                setattr(clone, name, {key: set(ids) for key, ids in getattr(self, name).items()})
+            clone.remote_locations = set(self.remote_locations)
+            clone.facets = self.facets.copy()
+            clone.text = self.text.copy()
+            return clone
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._listings
+
+    def add(self, job: JobListing) -> None:
+        """Index a listing, replacing any previous version with the same id in place."""
+        with self._lock:
+            self._add(job)
+            self.facets.add(job, self._position[job.id])
+
+    def _add(self, job: JobListing) -> None:
+        if job.id in self._features:
+            self._unindex(job.id, self._features[job.id])
+        else:
+            self._position[job.id] = self._next_position
+            self._next_position += 1
+        features = JobFeatures.from_listing(job)
+        self.text.add(job)
+        self.version += 1
+        self._listings[job.id] = job
+        self._features[job.id] = features
+        for skill in features.required_skills:
+            self.required_skills.setdefault(skill, set()).add(job.id)
+        for skill in features.optional_skills:
+            self.optional_skills.setdefault(skill, set()).add(job.id)
+        for industry in features.industries:
+            self.industries.setdefault(industry, set()).add(job.id)
+        self.titles.setdefault(features.title, set()).add(job.id)
+        if features.work_type:
+            self.work_types.setdefault(features.work_type, set()).add(job.id)
+        if features.location:
+            self.locations.setdefault(features.location, set()).add(job.id)
+            if "remote" in features.location:
+                self.remote_locations.add(job.id)
+
+    def remove(self, job_id: str) -> None:
+        """Drop a listing from every posting list."""
+        with self._lock:
+            features = self._features.pop(job_id, None)
+            self._listings.pop(job_id, None)
+            self._position.pop(job_id, None)
+            self.facets.remove(job_id)
+            self.text.remove(job_id)
+            if features is not None:
+                self.version += 1
+                self._unindex(job_id, features)
+
+    def _unindex(self, job_id: str, features: JobFeatures) -> None:
+        for skill in features.required_skills:
+            self._discard(self.required_skills, skill, job_id)
+        for skill in features.optional_skills:
+            self._discard(self.optional_skills, skill, job_id)
+        for industry in features.industries:
+            self._discard(self.industries, industry, job_id)
+        self._discard(self.titles, features.title, job_id)
+        self._discard(self.work_types, features.work_type, job_id)
+        self._discard(self.locations, features.location, job_id)
+        self.remote_locations.discard(job_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, job_id: str) -> None:
+        ids = postings.get(key)
+        if ids is not None:
+            ids.discard(job_id)
+            if not ids:
+                del postings[key]
+
+    def get(self, job_id: str) -> Optional[JobListing]:
+        return self._listings.get(job_id)
+
+    def features(self, job_id: str) -> JobFeatures:
+        return self._features[job_id]
+
+    def listings(self) -> List[JobListing]:
+        """All indexed listings, in insertion order."""
+        with self._lock:
+            return list(self._listings.values())
+
+    def filter(
+        self, filters: Optional[dict], within: Optional[Iterable[str]] = None
+    ) -> Tuple[List[JobListing], Dict[str, Dict[str, int]]]:
+        """
+        Listings passing LinkedIn-style filters (MatchingAgent.filter_jobs
+        semantics) in listing order, plus per-facet value counts. The keyword
+        filter is answered from the text index postings; `within` limits
+        results and counts to those ids (a text query's hits).
+        """
+        with self._lock:
+            selected, counts = self.facets.select_with_counts(filters, self._text_selection(filters, within))
+            return self.facets.jobs(selected), counts
+
+    def facet_counts(self, filters: Optional[dict]) -> Dict[str, Dict[str, int]]:
+        """Per-facet value counts under filters, each facet ignoring its own filter."""
+        with self._lock:
+            return self.facets.select_with_counts(filters, self._text_selection(filters, None))[1]
+
+    def _text_selection(self, filters: Optional[dict], within: Optional[Iterable[str]]) -> Optional[Set[str]]:
+        keyword = (filters or {}).get("keyword")
+        ids = self.text.matching(keyword) if keyword else None
+        if within is not None:
+            ids = set(within) if ids is None else ids.intersection(within)
+        return ids
+
+    def filter_options(self) -> Dict[str, List[str]]:
+        """Sorted values of every facet (MatchingAgent.extract_filter_options' shape)."""
+        with self._lock:
+            return self.facets.options()
+
+    def text_scores(self, query: str) -> Dict[str, float]:
+        """BM25 relevance of the listings matching a free-text query, by job id."""
+        with self._lock:
+            return self.text.scores(query)
+
+    @staticmethod
+    def max_unmatched_score(wanted: SeekerFeatures) -> int:
+        """Highest score a job sharing no signal with the seeker can get."""
+        return TECH_TITLE_BONUS + (UNMATCHED_WORK_TYPE_BONUS if wanted.work_type else 0)
+
+    def position(self, job_id: str) -> int:
+        """Insertion position of a listing (ties in scoring keep this order)."""
+        return self._position[job_id]
+
+    def matching_titles(self, wanted: SeekerFeatures) -> Set[str]:
+        """Ids of jobs whose title passes score_job's substring title check."""
+        ids: Set[str] = set()
+        if wanted.titles:
+            for title, title_ids in self.titles.items():
+                if any(t in title or title in t for t in wanted.titles):
+                    ids |= title_ids
+        return ids
+
+    def matching_locations(self, wanted: SeekerFeatures) -> Set[str]:
+        """Ids of jobs whose location contains one of the seeker's locations."""
+        ids: Set[str] = set()
+        if wanted.locations:
+            for location, location_ids in self.locations.items():
+                if any(loc in location for loc in wanted.locations):
+                    ids |= location_ids
+        return ids
+
+    def work_type_matches(self, wanted: SeekerFeatures) -> Set[str]:
+        """Ids of jobs whose work type matches the seeker's exactly."""
+        if not wanted.work_type:
+            return set()
+        ids = set(self.work_types.get(wanted.work_type, set()))
+        if wanted.work_type == "onsite":
+            ids |= self.work_types.get("on-site", set())
+        return ids
+
+    def candidates(self, seeker: JobSeekerProfile, min_score: int) -> List[str]:
+        """
+        Ids of jobs that may score at least min_score for this seeker, in listing order.
+
+        When min_score is within reach of a job with no overlap at all, no
+        pruning is possible and every indexed id is returned.
+        """
+        wanted = SeekerFeatures.from_profile(seeker)
+        with self._lock:
+            if min_score <= self.max_unmatched_score(wanted):
+                return list(self._listings)
+
+            ids = set(self.upper_bounds(wanted)) | self.work_type_matches(wanted)
+            return sorted(ids, key=self._position.__getitem__)
+
+    def upper_bounds(self, wanted: SeekerFeatures) -> Dict[str, int]:
+        """
+        Upper bound of the score of every job sharing a skill, title, location
+        or industry with the seeker.
+
+        Any job missing from the result scores at most
+        WORK_TYPE_MATCH_POINTS + TECH_TITLE_BONUS.
+        """
+        with self._lock:
+            required: Counter = Counter()
+            optional: Counter = Counter()
+            for skill in wanted.skills:
+                required.update(self.required_skills.get(skill, ()))
+                optional.update(self.optional_skills.get(skill, ()))
+            titles = self.matching_titles(wanted)
+            locations = self.matching_locations(wanted)
+            remote = self.remote_locations if any("remote" in loc for loc in wanted.locations) else set()
+            industries: Set[str] = set()
+            for industry in wanted.industries:
+                industries |= self.industries.get(industry, set())
+
+            # Every job starts from what it could get without a title match,
+            # then each signal it shares adds its points (bounds may exceed 100)
+            base = TECH_TITLE_BONUS + (WORK_TYPE_MATCH_POINTS if wanted.work_type else 0)
+            bounds: Dict[str, int] = dict.fromkeys(
+                set(required) | set(optional) | titles | locations | remote | industries, base
+            )
+            for job_id, count in required.items():
+                bounds[job_id] += min(count * REQUIRED_SKILL_POINTS, REQUIRED_SKILL_CAP)
+            for job_id, count in optional.items():
+                bounds[job_id] += min(count * OPTIONAL_SKILL_POINTS, OPTIONAL_SKILL_CAP)
+            for job_id in titles:
+                bounds[job_id] += TITLE_MATCH_POINTS - TECH_TITLE_BONUS
+            for job_id in locations:
+                bounds[job_id] += LOCATION_MATCH_POINTS
+            for job_id in remote - locations:
+                bounds[job_id] += REMOTE_LOCATION_POINTS
+            for job_id in industries:
+                bounds[job_id] += INDUSTRY_MATCH_POINTS
+            return bounds
@@ -0,0 +1,104 @@
+"""
+Compiled keyword extractor for Job Finder interview messages.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+DEFAULT_VOCABULARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vocabulary.json")
+
+# A category is a list of terms, or a mapping from canonical value to aliases
+Category = Union[Sequence[str], Mapping[str, Sequence[str]]]
+
+
+def trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Regex alternation of the terms with shared prefixes factored out, so
+    matching at a position follows one trie path instead of trying every
+    term. Longer terms are preferred over their prefixes.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # The term may also end here; the greedy ? tries the longer terms first
+        pattern = "(?:" + pattern + ")?"
+    return pattern
+
+
+class KeywordExtractor:
+    """
+    Finds vocabulary terms in a message with one compiled regex.
+
+    Terms only match as whole words (not inside a longer word: "ai" is not
+    found in "maintain"), case-insensitively, and one finditer pass over
+    the message finds every category at once. Where terms overlap the
+    longest wins. Results keep vocabulary order, so they do not depend on
+    where in the message a term appeared.
+    """
+
+    def __init__(self, vocabulary: Mapping[str, Category]) -> None:
+        self.categories: List[str] = list(vocabulary)
+        # term -> [(category, canonical value, vocabulary rank)]
+        self.terms: Dict[str, List[Tuple[str, str, int]]] = {}
+        for category, entries in vocabulary.items():
+            pairs = entries.items() if isinstance(entries, Mapping) else ((term, [term]) for term in entries)
+            for rank, (canonical, aliases) in enumerate(pairs):
+                for alias in aliases:
+                    self.terms.setdefault(alias.lower(), []).append((category, canonical, rank))
+        pattern = trie_pattern(self.terms) if self.terms else "(?!)"
+        self.regex = re.compile(r"(?<![a-z0-9])" + pattern + r"(?![a-z0-9])", re.IGNORECASE)
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordExtractor":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def extract(self, message: str) -> Dict[str, List[str]]:
+        """Canonical values found per category (every category present, maybe empty)."""
+        found: Dict[str, Dict[str, int]] = {category: {} for category in self.categories}
+        for match in self.regex.finditer(message):
+            for category, canonical, rank in self.terms[match.group().lower()]:
+                found[category][canonical] = rank
+        return {
+            category: sorted(values, key=values.__getitem__)
+            for category, values in found.items()
+        }
+
+
+_extractor: Optional[KeywordExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_keyword_extractor() -> KeywordExtractor:
+    """
+    The process-wide extractor, compiled once from JOB_FINDER_VOCABULARY_PATH
+    (default: vocabulary.json next to this module).
+    """
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = KeywordExtractor.from_file(
+                os.getenv("JOB_FINDER_VOCABULARY_PATH") or DEFAULT_VOCABULARY_PATH
+            )
+        return _extractor
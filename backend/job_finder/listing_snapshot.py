@@ -0,0 +1,241 @@
+"""
+Process-wide snapshot of the job listings, refreshed incrementally.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set
+
+from .job_index import JobIndex
+from .models import JobListing, SAMPLE_JOB_LISTINGS
+
+
+def listing_from_row(job: Any) -> JobListing:
+    """Convert a database JobPost row to a JobListing."""
+    return JobListing(
+        id=str(job.id),
+        title=job.title or "",
+        company=job.company or "",
+        location=job.location or "",
+        required_skills=job.requirements if isinstance(job.requirements, list) else [],
+        optional_skills=job.skills if isinstance(job.skills, list) else [],
+        experience_level=None,
+        salary_range=None,
+        work_type=job.workplace_type or "",
+        industries=[],
+        description=job.summary or "",
+        responsibilities=job.responsibilities if isinstance(job.responsibilities, list) else [],
+        created_at=job.created_at or None
+    )
+
+
+class ListingSnapshot:
+    """
+    JobIndex over every JobPost, loaded once and then kept current.
+
+    After the first full load only rows whose updated_at is past the
+    high-water mark (or NULL, for rows written outside the ORM) are fetched
+    and converted; rows already held with the same updated_at are skipped.
+    A refresh runs when JobPostRepository reports a write (see
+    on_job_post_change) or, to pick up writes from other processes, at
+    most every JOB_SNAPSHOT_REFRESH_SECONDS. Deleted rows are dropped from
+    the listener's ids or, on those interval refreshes, from an id recount.
+    Without database rows the snapshot serves SAMPLE_JOB_LISTINGS.
+
+    An index handed out by get_index() is never modified: a refresh applies
+    its changes to a copy and swaps that in, so callers can read the index
+    they hold without locking while the next one is prepared.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: Optional[float] = None,
+        lookback_seconds: Optional[float] = None,
+    ) -> None:
+        if refresh_seconds is None:
+            refresh_seconds = float(os.getenv("JOB_SNAPSHOT_REFRESH_SECONDS", "30"))
+        if lookback_seconds is None:
+            lookback_seconds = float(os.getenv("JOB_SNAPSHOT_LOOKBACK_SECONDS", "5"))
+        self.refresh_seconds = refresh_seconds
+        # Rows committed late can carry an updated_at slightly behind the
+        # high-water mark, so each refresh re-reads this window
+        self.lookback = timedelta(seconds=lookback_seconds)
+        self._lock = threading.RLock()
+        # Guards only the pending changes from the listener, which must not
+        # wait for a refresh in progress (async writers call it on the event loop)
+        self._pending_lock = threading.Lock()
+        self._index: Optional[JobIndex] = None
+        self._sample_index: Optional[JobIndex] = None
+        self._stamps: Dict[int, Optional[datetime]] = {}
+        self._high_water: Optional[datetime] = None
+        self._dirty = False
+        self._deleted: Set[int] = set()
+        self._checked_at = 0.0
+        self._recounted_at = 0.0
+
+    def get_index(self, db: Any) -> JobIndex:
+        """Current listings index, refreshing it first if anything may have changed."""
+        if db is None:
+            return self._samples()
+        with self._lock:
+            try:
+                if self._index is None:
+                    self._load_all(db)
+                elif self._dirty or time.monotonic() - self._checked_at >= self.refresh_seconds:
+                    self._refresh(db)
+            except Exception as e:
+                print(f"Error refreshing job listing snapshot: {e}")
+                if self._index is None:
+                    return self._samples()
+            return self._index
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next get_index() reloads every row."""
+        with self._lock:
+            self._index = None
+            self._stamps = {}
+            self._high_water = None
+            self._take_pending()
+
+    def on_job_post_change(self, event: str, post_id: Optional[int]) -> None:
+        """JobPostRepository listener: schedule a refresh for a created, updated or deleted post."""
+        with self._pending_lock:
+            if event == "delete" and post_id is not None:
+                self._deleted.add(post_id)
+            self._dirty = True
+
+    def _samples(self) -> JobIndex:
+        if self._sample_index is None:
+            self._sample_index = JobIndex(SAMPLE_JOB_LISTINGS)
+        return self._sample_index
+
+    def _take_pending(self) -> Set[int]:
+        """Deleted ids reported since the last refresh; changes reported after this schedule another."""
+        with self._pending_lock:
+            deleted, self._deleted = self._deleted, set()
+            self._dirty = False
+        return deleted
+
+    def _load_all(self, db: Any) -> None:
+        JobPost = _job_post_model()
+        self._take_pending()
+        rows = db.query(JobPost).order_by(JobPost.updated_at, JobPost.id).all()
+        stamps = {row.id: row.updated_at for row in rows}
+        self._index = JobIndex(listing_from_row(row) for row in rows) if rows else self._samples()
+        self._stamps = stamps
+        self._high_water = max((stamp for stamp in stamps.values() if stamp is not None), default=None)
+        self._mark_checked()
+        self._recounted_at = self._checked_at
+
+    def _refresh(self, db: Any) -> None:
+        JobPost = _job_post_model()
+        if not self._stamps:
+            # Serving samples - reload once real rows exist
+            self._take_pending()
+            if db.query(JobPost.id).first() is not None:
+                self._load_all(db)
+            else:
+                self._mark_checked()
+            return
+
+        deleted = self._take_pending()
+        try:
+            self._apply_changes(db, deleted)
+        except Exception:
+            # Nothing was swapped in, so the reported deletes are retried next time
+            with self._pending_lock:
+                self._deleted |= deleted
+                self._dirty = True
+            raise
+
+    def _apply_changes(self, db: Any, deleted: Set[int]) -> None:
+        """
+        Bring a copy of the index up to date and swap it in, together with
+        the row stamps and high-water mark it corresponds to.
+        """
+        JobPost = _job_post_model()
+        stamps = dict(self._stamps)
+        high_water = self._high_water
+        index: Optional[JobIndex] = None  # Copied on the first change
+
+        def changing() -> JobIndex:
+            nonlocal index
+            if index is None:
+                index = self._index.copy()
+            return index
+
+        for post_id in deleted:
+            if post_id in stamps:
+                del stamps[post_id]
+                changing().remove(str(post_id))
+
+        query = db.query(JobPost)
+        if high_water is not None:
+            query = query.filter(
+                (JobPost.updated_at >= high_water - self.lookback) | JobPost.updated_at.is_(None)
+            )
+        for row in query.order_by(JobPost.updated_at, JobPost.id):
+            if row.id in stamps and stamps[row.id] == row.updated_at:
+                continue
+            changing().add(listing_from_row(row))
+            stamps[row.id] = row.updated_at
+            if row.updated_at is not None and (high_water is None or row.updated_at > high_water):
+                high_water = row.updated_at
+
+        # Rows deleted by other processes never reach the listener; look for
+        # them once per interval rather than on every write-driven refresh
+        recount = time.monotonic() - self._recounted_at >= self.refresh_seconds
+        if recount and db.query(JobPost.id).count() != len(stamps):
+            live = {post_id for (post_id,) in db.query(JobPost.id)}
+            if not live:
+                self._load_all(db)
+                return
+            for post_id in set(stamps) - live:
+                del stamps[post_id]
+                changing().remove(str(post_id))
+
+        if index is not None:
+            self._index = index
+        self._stamps = stamps
+        self._high_water = high_water
+        if recount:
+            self._recounted_at = time.monotonic()
+        self._mark_checked()
+
+    def _mark_checked(self) -> None:
+        self._checked_at = time.monotonic()
+
+
+def _job_post_model() -> Any:
+    # Import at function level to avoid circular imports
+    try:
+        from ..db_models import JobPost
+    except ImportError:
+        from db_models import JobPost
+    return JobPost
+
+
+_snapshot: Optional[ListingSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_listing_snapshot() -> ListingSnapshot:
+    """
+    The process-wide snapshot, registered as a JobPostRepository listener
+    so hiring-side writes refresh it on the next read.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = ListingSnapshot()
+            try:
+                from ..repositories import JobPostRepository
+            except ImportError:
+                from repositories import JobPostRepository
+            JobPostRepository.add_listener(_snapshot.on_job_post_change)
+        return _snapshot
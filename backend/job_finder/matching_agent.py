@@ -5,19 +5,67 @@ Phase 3: AI Logic scaffolding
 
 from __future__ import annotations
 
-from typing import List, Optional, Any
+import heapq
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Any, Tuple
 
 try:
     from sqlalchemy.orm import Session
 except ImportError:
     Session = Any
 
+from .job_index import (
+    HYBRID_WORK_TYPE_POINTS,
+    TECH_KEYWORDS,
+    TECH_TITLE_BONUS,
+    UNMATCHED_WORK_TYPE_BONUS,
+    WORK_TYPE_MATCH_POINTS,
+    JobFeatures,
+    JobIndex,
+    SeekerFeatures,
+)
+from .listing_snapshot import get_listing_snapshot, listing_from_row
 from .models import JobListing, JobRecommendation, JobSeekerProfile
+from .semantic_index import SemanticIndex
+from .text_index import listing_terms, tokenize
+from .vector_scorer import VectorizedScorer, init_worker, numpy_available, top_many_in_worker
 
 
 class MatchingAgent:
     """Scores jobs against a seeker profile using heuristic rules."""
 
+    # Lowest score that becomes a recommendation
+    MIN_MATCH_SCORE = 30
+    # Recommendations returned per match
+    MAX_RECOMMENDATIONS = 5
+    # Default share of text relevance in a blended search score
+    TEXT_WEIGHT = 0.5
+    # "heuristic" scores every job; "semantic" scores embedding-retrieved candidates
+    MATCHING_MODES = ("heuristic", "semantic")
+
+    def __init__(self, matching_mode: Optional[str] = None) -> None:
+        # (index id, index version) -> derived structure, swapped as one tuple so
+        # routes running in worker threads never pair a key with another's value
+        self._vector_scorer: Optional[Tuple[Tuple[int, int], VectorizedScorer]] = None
+        matching_mode = matching_mode or os.getenv("JOB_MATCHING_MODE", "heuristic")
+        if matching_mode not in self.MATCHING_MODES:
+            raise ValueError(f"Unknown job matching mode: {matching_mode}")
+        self.matching_mode = matching_mode
+        # Semantic mode: candidates retrieved per seeker, and the cosine
+        # similarity at which a job title counts as matching a preferred title
+        self.semantic_candidates = int(os.getenv("SEMANTIC_CANDIDATES", "200"))
+        self.semantic_title_threshold = float(os.getenv("SEMANTIC_TITLE_THRESHOLD", "0.5"))
+        self._semantic_index: Optional[Tuple[Tuple[int, int], SemanticIndex]] = None
+        # One thread updates the semantic index at a time; retraining runs in the background
+        self._semantic_lock = threading.Lock()
+        self._semantic_retraining = False
+        # match_many's worker processes hold a copy of one scorer; the pool is
+        # kept until the index (or the requested worker count) changes
+        self._worker_pool: Optional[Tuple[Tuple[Any, int, int], ProcessPoolExecutor]] = None
+        self._worker_pool_lock = threading.Lock()
+
     def extract_filter_options(self, jobs: List[JobListing]) -> dict:
         """
         Extract unique filter options from jobs (LinkedIn-style filtering).
@@ -76,7 +124,8 @@ class MatchingAgent:
         - industries: List of industries
         - salary_min: Minimum salary
         - salary_max: Maximum salary
-        - keyword: Search keyword in title/description
+        - keyword: Search terms, all of which must occur in the listing's
+          text (title, description, responsibilities, requirements)
         """
         if not filters:
             return jobs
@@ -136,26 +185,37 @@ class MatchingAgent:
                 )
             ]
         
-        # Filter by keyword search
+        # Filter by keyword search, matched by term like the text index
         if filters.get("keyword"):
-            keyword = filters["keyword"].lower()
-            filtered = [
-                job for job in filtered
-                if keyword in job.title.lower()
-                or (job.description and keyword in job.description.lower())
-            ]
+            terms = set(tokenize(filters["keyword"]))
+            filtered = [job for job in filtered if terms.issubset(listing_terms(job))]
         
         return filtered
 
-    def score_job(self, seeker: JobSeekerProfile, job: JobListing) -> int:
+    def score_job(
+        self,
+        seeker: JobSeekerProfile,
+        job: JobListing,
+        features: Optional[JobFeatures] = None,
+    ) -> int:
+        """Score a job 0-100 for a seeker (pass cached JobFeatures to skip re-lowercasing)."""
+        return self.score_features(
+            SeekerFeatures.from_profile(seeker),
+            features or JobFeatures.from_listing(job),
+        )
+
+    @staticmethod
+    def score_features(seeker: SeekerFeatures, job: JobFeatures, similar_title: bool = False) -> int:
+        """
+        Score from pre-lowercased features. similar_title marks the job title
+        as matching a preferred title even without a substring match (the
+        semantic matcher sets it from embedding similarity).
+        """
         score = 0
-        seeker_skills = {s.lower() for s in seeker.skills}
-        job_required = {s.lower() for s in job.required_skills}
-        job_optional = {s.lower() for s in job.optional_skills}
 
         # Skill matching (most important)
-        skill_overlap = seeker_skills & job_required
-        optional_overlap = seeker_skills & job_optional
+        skill_overlap = seeker.skills & job.required_skills
+        optional_overlap = seeker.skills & job.optional_skills
         
         # Required skill matches are worth more
         required_skill_score = min(len(skill_overlap) * 20, 60)
@@ -164,63 +224,158 @@ class MatchingAgent:
 
         # Title matching - check if user's preferred titles match job title
         title_match = False
-        if seeker.preferred_titles:
-            job_title_lower = job.title.lower()
-            for title in seeker.preferred_titles:
-                title_lower = title.lower()
+        if seeker.titles and similar_title:
+            score += 30
+            title_match = True
+        elif seeker.titles:
+            job_title_lower = job.title
+            for title_lower in seeker.titles:
                 # Match "full stack" in job title, or "frontend", "backend", etc.
-                if (title_lower in job_title_lower or 
-                    job_title_lower in title_lower or
-                    (title_lower == "full stack" and "full stack" in job_title_lower)):
+                if title_lower in job_title_lower or job_title_lower in title_lower:
                     score += 30  # Strong boost for title match
                     title_match = True
                     break
         
         # If no exact title match but job is clearly tech/developer related
         if not title_match:
-            tech_keywords = ["engineer", "developer", "architect", "programmer"]
-            if any(kw in job.title.lower() for kw in tech_keywords):
-                score += 5  # Small bonus for tech roles
+            if any(kw in job.title for kw in TECH_KEYWORDS):
+                score += TECH_TITLE_BONUS  # Small bonus for tech roles
 
         # Work type matching (high importance)
         if seeker.work_type and job.work_type:
-            seeker_type = seeker.work_type.lower()
-            job_type = job.work_type.lower()
+            seeker_type = seeker.work_type
+            job_type = job.work_type
             
             if seeker_type == job_type:
                 score += 25  # Exact match
             elif seeker_type == "onsite" and job_type in ["onsite", "on-site"]:
                 score += 25
             elif job_type == "remote":
-                score += 15  # Remote is often acceptable
+                score += UNMATCHED_WORK_TYPE_BONUS  # Remote is often acceptable
             elif job_type == "hybrid":
-                score += 10  # Hybrid is partially acceptable
+                score += HYBRID_WORK_TYPE_POINTS  # Hybrid is partially acceptable
 
         # Location matching (high importance)
-        if seeker.preferred_locations and job.location:
-            seeker_locs = {loc.lower() for loc in seeker.preferred_locations}
-            job_loc_lower = job.location.lower()
+        if seeker.locations and job.location:
+            job_loc_lower = job.location
             
-            for loc in seeker_locs:
+            for loc in seeker.locations:
                 # Check if location is mentioned in job location
                 if loc in job_loc_lower:
                     score += 35  # Strong location match (highest weight)
                     break
             else:
                 # Check if it's remote and user accepts remote
-                if "remote" in job_loc_lower and any("remote" in loc.lower() for loc in seeker_locs):
+                if "remote" in job_loc_lower and any("remote" in loc for loc in seeker.locations):
                     score += 20
 
         # Industry matching
         if seeker.industries and job.industries:
-            industry_overlap = set(i.lower() for i in seeker.industries) & set(
-                i.lower() for i in job.industries
-            )
+            industry_overlap = seeker.industries & job.industries
             if industry_overlap:
                 score += 10
 
         return min(score, 100)
 
+    def get_job_index(self, db: Any) -> JobIndex:
+        """
+        Index over the current job listings from the process-wide snapshot,
+        which only reloads rows changed since its last refresh.
+        """
+        return get_listing_snapshot().get_index(db)
+
+    def get_vector_scorer(self, index: JobIndex) -> Optional[VectorizedScorer]:
+        """
+        Columnar scorer for the index's current listings, or None without numpy.
+        Rebuilt whenever the index changes.
+        """
+        if not numpy_available():
+            return None
+        key = (index.lineage, index.version)
+        cached = self._vector_scorer
+        if cached is None or cached[0] != key:
+            cached = self._vector_scorer = (key, VectorizedScorer.from_index(index))
+        return cached[1]
+
+    def get_semantic_index(self, index: JobIndex) -> Optional[SemanticIndex]:
+        """
+        Embeddings of the index's current listings, or None without numpy.
+        When the index changes only its new and changed listings are
+        embedded (SemanticIndex.updated); k-means is retrained on a
+        background thread once enough has changed. Concurrent callers wait
+        for the one thread doing the update instead of repeating it.
+        """
+        if not numpy_available():
+            return None
+        key = (index.lineage, index.version)
+        cached = self._semantic_index
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with self._semantic_lock:
+            cached = self._semantic_index
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            if cached is None or cached[0][0] is not index.lineage:
+                semantic = SemanticIndex(index.listings(), embedder=cached[1].embedder if cached else None)
+            else:
+                semantic = cached[1].updated(index.listings())
+            self._semantic_index = (key, semantic)
+            if semantic.needs_retrain() and not self._semantic_retraining:
+                self._semantic_retraining = True
+                threading.Thread(
+                    target=self._retrain_semantic_index, args=(index, semantic.embedder),
+                    name="semantic-retrain", daemon=True,
+                ).start()
+            return semantic
+
+    def _retrain_semantic_index(self, index: JobIndex, embedder: Any) -> None:
+        """Rebuild the semantic index with fresh k-means and swap it in."""
+        try:
+            key = (index.lineage, index.version)
+            semantic = SemanticIndex(index.listings(), embedder=embedder)
+            with self._semantic_lock:
+                cached = self._semantic_index
+                if cached is not None and cached[0][0] is index.lineage:
+                    # Changes made during the rebuild are applied on the next call
+                    self._semantic_index = (key, semantic)
+        except Exception as e:
+            print(f"ERROR retraining semantic index: {e}")
+        finally:
+            self._semantic_retraining = False
+
+    def score_listings(
+        self,
+        seeker: JobSeekerProfile,
+        jobs: List[JobListing],
+        index: JobIndex,
+    ) -> List[int]:
+        """Scores of indexed jobs for a seeker (vectorized when numpy is available)."""
+        scorer = self.get_vector_scorer(index)
+        if scorer is None:
+            wanted = SeekerFeatures.from_profile(seeker)
+            return [self.score_features(wanted, index.features(job.id)) for job in jobs]
+        scores = scorer.score_all(seeker)
+        return [int(scores[scorer.rows[job.id]]) for job in jobs]
+
+    @staticmethod
+    def blend_scores(
+        match_scores: List[int],
+        text_scores: List[float],
+        text_weight: float,
+    ) -> List[int]:
+        """
+        Combine 0-100 match scores with BM25 relevance, scaled so the most
+        relevant job counts as 100.
+        """
+        best = max(text_scores, default=0.0) or 1.0
+        return [
+            round((1 - text_weight) * match + text_weight * 100 * text / best)
+            for match, text in zip(match_scores, text_scores)
+        ]
+
+    def invalidate_job_index(self) -> None:
+        """Force the next get_job_index() call to reload every listing."""
+        get_listing_snapshot().invalidate()
 
     def get_jobs_from_database(self, db: Any) -> List[JobListing]:
         """
@@ -248,23 +403,7 @@ class MatchingAgent:
                 return SAMPLE_JOB_LISTINGS
             
             # Convert database JobPost objects to JobListing models
-            job_listings = []
-            for job in db_jobs:
-                listing = JobListing(
-                    id=str(job.id),
-                    title=job.title or "",
-                    company=job.company or "",
-                    location=job.location or "",
-                    required_skills=job.requirements if isinstance(job.requirements, list) else [],
-                    optional_skills=job.skills if isinstance(job.skills, list) else [],
-                    experience_level=None,
-                    salary_range=None,
-                    work_type=job.workplace_type or "",
-                    industries=[],
-                    description=job.summary or "",
-                    created_at=job.created_at or None
-                )
-                job_listings.append(listing)
+            job_listings = [listing_from_row(job) for job in db_jobs]
             
             return job_listings if job_listings else SAMPLE_JOB_LISTINGS
         
@@ -277,26 +416,229 @@ class MatchingAgent:
     def match_jobs(
         self,
         seeker: JobSeekerProfile,
-        jobs: List[JobListing],
+        jobs: Optional[List[JobListing]] = None,
+        index: Optional[JobIndex] = None,
     ) -> List[JobRecommendation]:
-        recommendations: List[JobRecommendation] = []
-        for job in jobs:
-            score = self.score_job(seeker, job)
-            # Lower threshold from 40 to 30 to accommodate more matches
-            if score < 30:
-                continue
-            explanation = self.build_explanation(seeker, job, score)
-            recommendations.append(
+        """
+        Top recommendations for a seeker.
+
+        With an index, all jobs are scored at once by the VectorizedScorer when
+        numpy is installed, or else only jobs that can still make the top
+        results are scored; otherwise every job in `jobs` is. All these paths
+        give the same result. In semantic matching mode only the seeker's
+        nearest listings in embedding space are scored (see _match_semantic).
+        """
+        wanted = SeekerFeatures.from_profile(seeker)
+        semantic = None
+        if self.matching_mode == "semantic" and index is not None:
+            semantic = self.get_semantic_index(index)
+        scorer = self.get_vector_scorer(index) if index is not None and semantic is None else None
+        if semantic is not None:
+            matches = self._match_semantic(seeker, wanted, index, semantic)
+        elif scorer is not None:
+            matches = [
+                (score, index.get(job_id))
+                for score, job_id in scorer.top(seeker, self.MAX_RECOMMENDATIONS, self.MIN_MATCH_SCORE)
+            ]
+        elif index is not None:
+            matches = self._match_indexed(wanted, index)
+        else:
+            scored = []
+            for position, job in enumerate(jobs or []):
+                score = self.score_features(wanted, JobFeatures.from_listing(job))
+                # Lower threshold from 40 to 30 to accommodate more matches
+                if score >= self.MIN_MATCH_SCORE:
+                    scored.append((score, position, job))
+            matches = [(score, job) for score, _, job in self.top_scored(scored, self.MAX_RECOMMENDATIONS)]
+
+        return [
+            JobRecommendation(
+                id=f"rec-{job.id}-{seeker.id or 'anon'}",
+                job_id=job.id,
+                seeker_id=seeker.id or "anonymous",
+                match_score=score,
+                explanation=self.build_explanation(seeker, job, score),
+            )
+            for score, job in matches
+        ]
+
+    def match_many(
+        self,
+        seekers: List[JobSeekerProfile],
+        jobs: Optional[List[JobListing]] = None,
+        k: Optional[int] = None,
+        index: Optional[JobIndex] = None,
+        workers: int = 0,
+    ) -> List[List[JobRecommendation]]:
+        """
+        Top k (default MAX_RECOMMENDATIONS) recommendations for each of many
+        seekers, in seeker order - the heuristic match_jobs() result for each.
+
+        With numpy, (seekers x jobs) score matrices are computed a chunk of
+        seekers at a time (VectorizedScorer.top_many); `workers` > 1 spreads
+        the chunks over a process pool, which is kept for later calls until
+        the index changes (close() shuts it down). Without numpy each seeker
+        is matched on its own through the index.
+        """
+        k = k or self.MAX_RECOMMENDATIONS
+        if index is None:
+            index = JobIndex(jobs or [])
+        scorer = self.get_vector_scorer(index)
+        if scorer is None:
+            matches = []
+            for seeker in seekers:
+                found = self._match_indexed(SeekerFeatures.from_profile(seeker), index, k)
+                matches.append([(score, job.id) for score, job in found])
+        elif workers > 1 and len(seekers) > 1:
+            size = -(-len(seekers) // (workers * 4))
+            chunks = [seekers[start:start + size] for start in range(0, len(seekers), size)]
+            with self._worker_pool_lock:
+                # Submitted under the lock so a concurrent call cannot shut the pool down first
+                pool = self._get_worker_pool(index, scorer, workers)
+                results = pool.map(top_many_in_worker, chunks, [k] * len(chunks), [self.MIN_MATCH_SCORE] * len(chunks))
+            matches = [found for chunk in results for found in chunk]
+        else:
+            matches = scorer.top_many(seekers, k, self.MIN_MATCH_SCORE)
+
+        return [
+            [
                 JobRecommendation(
-                    id=f"rec-{job.id}-{seeker.id or 'anon'}",
-                    job_id=job.id,
+                    id=f"rec-{job_id}-{seeker.id or 'anon'}",
+                    job_id=job_id,
                     seeker_id=seeker.id or "anonymous",
                     match_score=score,
-                    explanation=explanation,
+                    explanation=self.build_explanation(seeker, index.get(job_id), score),
                 )
+                for score, job_id in found
+            ]
+            for seeker, found in zip(seekers, matches)
+        ]
+
+    def _get_worker_pool(self, index: JobIndex, scorer: VectorizedScorer, workers: int) -> ProcessPoolExecutor:
+        """
+        Process pool whose workers were initialized with the scorer of the
+        index's current version. A pool for an older version is shut down
+        without waiting: work already submitted to it still completes.
+        Call with _worker_pool_lock held.
+        """
+        key = (index.lineage, index.version, workers)
+        cached = self._worker_pool
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if cached is not None:
+            cached[1].shutdown(wait=False)
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(scorer,))
+        self._worker_pool = (key, pool)
+        return pool
+
+    def close(self) -> None:
+        """Shut down match_many's worker processes (a later call starts new ones)."""
+        with self._worker_pool_lock:
+            cached, self._worker_pool = self._worker_pool, None
+        if cached is not None:
+            cached[1].shutdown()
+
+    def _match_semantic(
+        self,
+        seeker: JobSeekerProfile,
+        wanted: SeekerFeatures,
+        index: JobIndex,
+        semantic: SemanticIndex,
+    ) -> List[Tuple[int, JobListing]]:
+        """
+        Top (score, job) pairs among the seeker's nearest listings in
+        embedding space. A job whose title is semantically close to a
+        preferred title ("frontend" / "UI Engineer") is scored as a title
+        match; everything else is score_job's heuristic.
+        """
+        candidates = semantic.candidates(seeker, self.semantic_candidates)
+        if not candidates:
+            return self._match_indexed(wanted, index)
+        similar_titles = semantic.title_similarity(seeker, candidates)
+        scored = []
+        for job_id in candidates:
+            score = self.score_features(
+                wanted,
+                index.features(job_id),
+                similar_title=similar_titles.get(job_id, 0.0) >= self.semantic_title_threshold,
             )
-        recommendations.sort(key=lambda rec: rec.match_score, reverse=True)
-        return recommendations[:5]
+            if score >= self.MIN_MATCH_SCORE:
+                scored.append((score, index.position(job_id), job_id))
+        return [
+            (score, index.get(job_id))
+            for score, _, job_id in self.top_scored(scored, self.MAX_RECOMMENDATIONS)
+        ]
+
+    def _match_indexed(
+        self,
+        wanted: SeekerFeatures,
+        index: JobIndex,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[int, JobListing]]:
+        """
+        Top (score, job) pairs using the index's score upper bounds.
+
+        Jobs are scored in descending bound order until no remaining bound
+        can reach the current top results; jobs outside the bounds (sharing
+        nothing but possibly the work type) are only scored when they still
+        could. Ties keep listing order, exactly like a full scan.
+        """
+        limit = limit or self.MAX_RECOMMENDATIONS
+        found: List[Tuple[int, int, str]] = []
+        top: List[int] = []  # min-heap of the best `limit` scores so far
+
+        def consider(job_id: str) -> None:
+            score = self.score_features(wanted, index.features(job_id))
+            if score < self.MIN_MATCH_SCORE:
+                return
+            found.append((score, index.position(job_id), job_id))
+            if len(top) < limit:
+                heapq.heappush(top, score)
+            elif score > top[0]:
+                heapq.heapreplace(top, score)
+
+        bounds = index.upper_bounds(wanted)
+        by_bound: dict = {}
+        for job_id, bound in bounds.items():
+            by_bound.setdefault(bound, []).append(job_id)
+        for bound in sorted(by_bound, reverse=True):
+            if len(top) >= limit and bound < top[0]:
+                break
+            for job_id in by_bound[bound]:
+                consider(job_id)
+
+        unmatched_bound = TECH_TITLE_BONUS + (WORK_TYPE_MATCH_POINTS if wanted.work_type else 0)
+        if unmatched_bound >= self.MIN_MATCH_SCORE and (len(top) < limit or top[0] <= unmatched_bound):
+            if self.MIN_MATCH_SCORE <= index.max_unmatched_score(wanted):
+                rest = (job.id for job in index.listings())
+            else:
+                rest = index.work_type_matches(wanted)
+            for job_id in rest:
+                if job_id not in bounds:
+                    consider(job_id)
+
+        return [(score, index.get(job_id)) for score, _, job_id in self.top_scored(found, limit)]
+
+    @staticmethod
+    def top_scored(
+        scored: Iterable[Tuple[int, int, Any]],
+        limit: int,
+        offset: int = 0,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> List[Tuple[int, int, Any]]:
+        """
+        One page of (score, position, item) triples, best score first and ties
+        in position order, picked with a heap in O(N log(offset + limit)).
+
+        `after` is the (score, position) of the previous page's last item
+        (a keyset cursor); when given, offset is ignored.
+        """
+        if after is not None:
+            cursor = (-after[0], after[1])
+            scored = (entry for entry in scored if (-entry[0], entry[1]) > cursor)
+            offset = 0
+        best = heapq.nsmallest(offset + limit, scored, key=lambda entry: (-entry[0], entry[1]))
+        return best[offset:]
 
     @staticmethod
     def build_explanation(
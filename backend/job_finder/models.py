@@ -41,6 +41,7 @@ class JobListing(BaseModel):
     work_type: Optional[str] = None
     industries: List[str] = Field(default_factory=list)
     description: Optional[str] = None
+    responsibilities: List[str] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -63,6 +64,7 @@ class JobFinderSession(BaseModel):
     messages: List[dict] = Field(default_factory=list)
     recommendations: List[JobRecommendation] = Field(default_factory=list)
     is_profile_complete: bool = False
+    version: int = 0  # Row version the session was read at; saves compare-and-set on it
 
 
 SAMPLE_JOB_LISTINGS: List[JobListing] = [
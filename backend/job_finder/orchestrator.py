@@ -8,7 +8,13 @@ from __future__ import annotations
 import uuid
 from typing import Dict, Optional, Any
 
+try:
+    from ..concurrency import run_blocking
+except ImportError:
+    from concurrency import run_blocking
+
 from .interview_agent import InterviewAgent
+from .job_alerts import get_job_alert_service
 from .matching_agent import MatchingAgent
 from .formatter_agent import FormatterAgent
 from .models import (
@@ -17,39 +23,104 @@ from .models import (
     JobSeekerProfile,
     SAMPLE_JOB_LISTINGS,
 )
+from .session_store import JobFinderSessionStore, SessionConflict
+
+# Times a turn is re-applied to a freshly loaded session when a concurrent
+# request saved the session first
+SAVE_RETRIES = 3
 
 
 class JobFinderOrchestrator:
     """Coordinates the interview, matching, and formatting agents."""
 
-    def __init__(self, db: Optional[Any] = None) -> None:
-        self.sessions: Dict[str, JobFinderSession] = {}
+    def __init__(self, db: Optional[Any] = None, session_store: Optional[JobFinderSessionStore] = None) -> None:
+        # Sessions persist through the db passed to each call (self.db when
+        # omitted); the store caches recently used ones
+        self.sessions = session_store if session_store is not None else JobFinderSessionStore.from_env()
         self.interview_agent = InterviewAgent()
         self.matching_agent = MatchingAgent()
         self.formatter_agent = FormatterAgent()
         self.db = db
 
-    def start_session(self) -> JobFinderSession:
+    def start_session(self, db: Optional[Any] = None) -> JobFinderSession:
         session_id = str(uuid.uuid4())
         profile = JobSeekerProfile(id=session_id)
         session = JobFinderSession(
             session_id=session_id,
             seeker_profile=profile,
         )
-        self.sessions[session_id] = session
+        self.sessions.save(self._db(db), session)
         return session
 
-    def get_session(self, session_id: str) -> Optional[JobFinderSession]:
-        return self.sessions.get(session_id)
+    def get_session(self, session_id: str, db: Optional[Any] = None) -> Optional[JobFinderSession]:
+        return self.sessions.get(self._db(db), session_id)
 
     def process_user_message(
         self,
         session_id: str,
         message: str,
+        db: Optional[Any] = None,
     ) -> Dict[str, str | bool | list]:
-        session = self.sessions[session_id]
+        """Handle a message with keyword extraction only (no LLM fallback)."""
+        db = self._db(db)
+        session = self._require_session(session_id, db)
         result = self.interview_agent.process_message(message, session.seeker_profile)
+        return self._apply_turn(db, session, message, result)
+
+    async def aprocess_user_message(
+        self,
+        session_id: str,
+        message: str,
+        db: Optional[Any] = None,
+    ) -> Dict[str, str | bool | list]:
+        """
+        Handle a message, using the deadline-bound async LLM fallback when keywords find nothing.
+        Session reads/writes and matching run in worker threads, off the event loop.
+        """
+        db = self._db(db)
+        session = await run_blocking(self._load_for_turn, session_id, db)
+        result = await self.interview_agent.aprocess_message(message, session.seeker_profile)
+        return await run_blocking(self._apply_turn, db, session, message, result)
+
+    def _db(self, db: Optional[Any]) -> Optional[Any]:
+        return self.db if db is None else db
+
+    def _load_for_turn(self, session_id: str, db: Optional[Any]) -> JobFinderSession:
+        session = self._require_session(session_id, db)
+        if db is not None:
+            # End the read transaction so its connection is not held while the LLM runs
+            db.commit()
+        return session
 
+    def _require_session(self, session_id: str, db: Optional[Any]) -> JobFinderSession:
+        session = self.get_session(session_id, db)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def _apply_turn(
+        self,
+        db: Optional[Any],
+        session: JobFinderSession,
+        message: str,
+        result: Dict[str, Any],
+    ) -> Dict[str, str | bool | list]:
+        for attempt in range(SAVE_RETRIES + 1):
+            try:
+                return self._save_turn(db, session, message, result)
+            except SessionConflict:
+                if attempt == SAVE_RETRIES:
+                    raise
+                # Another request saved the session first: apply this turn on top of its version
+                session = self._require_session(session.session_id, db)
+
+    def _save_turn(
+        self,
+        db: Optional[Any],
+        session: JobFinderSession,
+        message: str,
+        result: Dict[str, Any],
+    ) -> Dict[str, str | bool | list]:
         if result["updates"]:
             session.seeker_profile = session.seeker_profile.copy(update=result["updates"])
 
@@ -57,16 +128,23 @@ class JobFinderOrchestrator:
         session.messages.append({"role": "assistant", "content": result["question"]})
         session.is_profile_complete = bool(result["is_complete"])
 
+        listings = []
         if session.is_profile_complete:
-            # Fetch jobs from database, with fallback to sample jobs
-            jobs = self.matching_agent.get_jobs_from_database(self.db)
-            raw_recs = self.matching_agent.match_jobs(
-                session.seeker_profile,
-                jobs,
-            )
+            # Match against the indexed jobs (database, with fallback to sample jobs)
+            index = self.matching_agent.get_job_index(db)
+            raw_recs = self.matching_agent.match_jobs(session.seeker_profile, index=index)
+            listings = [index.get(rec.job_id) for rec in raw_recs]
             formatted = self.formatter_agent.format_recommendations(raw_recs)
             session.recommendations = formatted
 
+        self.sessions.save(db, session, [job for job in listings if job is not None])
+        if session.is_profile_complete and db is not None:
+            # Index the stored profile so future job posts can be pushed to it
+            try:
+                get_job_alert_service().add_profile(db, session.seeker_profile)
+            except Exception as e:
+                print(f"Error indexing job seeker profile: {e}")
+
         return {
             "next_question": result["question"],
             "profile": session.seeker_profile.model_dump(),
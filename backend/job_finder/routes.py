@@ -5,44 +5,60 @@ Phase 5: Backend Structure
 
 from __future__ import annotations
 
+import base64
+import json
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, Optional
+from pydantic import ValidationError
+from typing import Dict, List, Optional, Tuple
 
-from database import get_db
+from concurrency import run_blocking
+from database import get_async_db, get_db
 from repositories import (
-    JobPostRepository,
-    JobPostRepository as SavedJobRepository,  # alias for clarity
+    AsyncJobPostRepository,
+    AsyncJobPostRepository as SavedJobRepository,  # alias for clarity
 )
+from job_finder.db_models import JobRecommendationORM
 from job_finder.orchestrator import JobFinderOrchestrator
 from job_finder.models import JobSeekerProfile
+from job_finder.session_store import SessionConflict
 
 router = APIRouter(prefix="/job-finder", tags=["Job Finder"])
 
-# Global orchestrator instance - will be initialized with db on first request
+# /search page size when the payload has no limit, and the largest allowed
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+# Most seekers one /batch-match request may carry
+BATCH_MATCH_MAX_SEEKERS = 10000
+
+# Routes using only the repositories take an AsyncSession (get_async_db); the
+# session store, listing snapshot and matching are sync and run their
+# database work through run_blocking with a sync Session (get_db).
+
+# Global orchestrator instance - initialized on first request. Requests share
+# it from concurrent worker threads (see run_blocking), so each call is handed
+# its request's db instead of the orchestrator holding one.
 orchestrator: Optional[JobFinderOrchestrator] = None
 
 
-def get_orchestrator(db: Session) -> JobFinderOrchestrator:
-    """Get or initialize orchestrator with database connection"""
+def get_orchestrator() -> JobFinderOrchestrator:
+    """Get or initialize the shared orchestrator"""
     global orchestrator
     if orchestrator is None:
-        orchestrator = JobFinderOrchestrator(db=db)
-    else:
-        # Update db connection for each request
-        orchestrator.db = db
+        orchestrator = JobFinderOrchestrator()
     return orchestrator
 
 
 @router.post("/start-chat")
 async def start_chat(db: Session = Depends(get_db)):
     """Initialize a new job seeker session."""
-    orch = get_orchestrator(db)
-    session = orch.start_session()
+    orch = get_orchestrator()
+    session = await run_blocking(orch.start_session, db)
     return {
         "session_id": session.session_id,
         "message": "Hi! I'm your Job Finder Agent. Let's build your profile. What role are you targeting next?",
@@ -52,39 +68,74 @@ async def start_chat(db: Session = Depends(get_db)):
 @router.post("/send-message")
 async def send_message(payload: Dict[str, str], db: Session = Depends(get_db)):
     """Process user message and return recommendations if profile is complete."""
-    orch = get_orchestrator(db)
+    orch = get_orchestrator()
     session_id = payload.get("session_id")
     message = payload.get("message")
     if not session_id or not message:
         raise HTTPException(status_code=400, detail="session_id and message required")
 
-    session = orch.get_session(session_id)
+    session = await run_blocking(orch.get_session, session_id, db)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    result = orch.process_user_message(session_id, message)
+    try:
+        result = await orch.aprocess_user_message(session_id, message, db)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="Session was updated by another request, please retry")
     return result
 
 
 @router.get("/recommendations/{session_id}")
 async def get_recommendations(session_id: str, db: Session = Depends(get_db)):
     """Get job recommendations for a completed profile."""
-    orch = get_orchestrator(db)
-    session = orch.get_session(session_id)
+    orch = get_orchestrator()
+    session = await run_blocking(orch.get_session, session_id, db)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return [rec.model_dump() for rec in session.recommendations]
 
 
+@router.get("/alerts/{session_id}")
+async def get_job_alerts(session_id: str, limit: int = 20, db: Session = Depends(get_db)):
+    """Stored recommendations for a seeker (its session's matches and jobs pushed to it since), best first."""
+    return {"alerts": await run_blocking(load_job_alerts, db, session_id, limit)}
+
+
+def load_job_alerts(db: Session, session_id: str, limit: int) -> List[Dict]:
+    """The seeker's stored recommendations as /alerts entries."""
+    rows = (
+        db.query(JobRecommendationORM)
+        .filter(JobRecommendationORM.seeker_id == session_id)
+        .order_by(JobRecommendationORM.match_score.desc(), JobRecommendationORM.created_at.desc())
+        .limit(min(max(limit, 1), SEARCH_MAX_LIMIT))
+        .all()
+    )
+    return [
+        {
+            "job_id": row.job_id,
+            "match_score": row.match_score,
+            "explanation": row.explanation,
+            "created_at": row.created_at,
+            "job": {
+                "title": row.job.title,
+                "company": row.job.company,
+                "location": row.job.location,
+                "work_type": row.job.work_type,
+            } if row.job else None,
+        }
+        for row in rows
+    ]
+
+
 @router.post("/save-job")
-async def save_job(payload: Dict[str, str], db: Session = Depends(get_db)):
+async def save_job(payload: Dict[str, str], db: AsyncSession = Depends(get_async_db)):
     session_id = payload.get("session_id")
     job_id = payload.get("job_id")
     if not session_id or not job_id:
         raise HTTPException(status_code=400, detail="session_id and job_id required")
 
     # Placeholder: reuse existing JobPostRepository structure
-    job = JobPostRepository.get_by_id(db, int(job_id))  # adapt as needed
+    job = await AsyncJobPostRepository.get_by_id(db, int(job_id))  # adapt as needed
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -92,17 +143,22 @@ async def save_job(payload: Dict[str, str], db: Session = Depends(get_db)):
 
 
 @router.get("/saved-jobs")
-async def saved_jobs(user_id: int, db: Session = Depends(get_db)):
-    posts = SavedJobRepository.get_by_user(db, user_id)
+async def saved_jobs(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    posts = await SavedJobRepository.get_by_user(db, user_id)
     return {"posts": posts}
 
 
 @router.get("/filters")
 async def get_available_filters(db: Session = Depends(get_db)):
-    """Get available filter options (LinkedIn-style) from all jobs."""
-    orch = get_orchestrator(db)
-    jobs = orch.matching_agent.get_jobs_from_database(db)
-    filters = orch.matching_agent.extract_filter_options(jobs)
+    """Get available filter options (LinkedIn-style) from all jobs, with job counts per option."""
+    return await run_blocking(load_filter_options, get_orchestrator(), db)
+
+
+def load_filter_options(orch: JobFinderOrchestrator, db: Session) -> Dict:
+    """Filter options of the indexed jobs, with job counts per option."""
+    index = orch.matching_agent.get_job_index(db)
+    filters = index.filter_options()
+    filters["counts"] = index.facet_counts({})
     return filters
 
 
@@ -119,55 +175,186 @@ async def search_jobs(payload: Dict, db: Session = Depends(get_db)):
             "experience_levels": ["Senior"],
             "skills": ["Python", "React"],
             "keyword": "backend"
-        }
+        },
+        "query": "python api design",
+        "text_weight": 0.5,
+        "limit": 20,
+        "cursor": "..."
     }
+    
+    "query" is a ranked full-text search over titles, descriptions,
+    responsibilities and requirements: only jobs matching one of its terms
+    are returned, and match_score blends the profile score with BM25
+    relevance (text_weight is relevance's share, default 0.5).
+    
+    Results are paged: pass the returned next_cursor to get the following
+    page, or an "offset" instead of a cursor. next_cursor is null on the
+    last page.
     """
-    orch = get_orchestrator(db)
+    orch = get_orchestrator()
     session_id = payload.get("session_id")
     filters = payload.get("filters", {})
     
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id required")
     
-    session = orch.get_session(session_id)
+    try:
+        limit = int(payload.get("limit") or SEARCH_DEFAULT_LIMIT)
+        offset = int(payload.get("offset") or 0)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="limit and offset must be integers")
+    if limit < 1 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be positive and offset non-negative")
+    limit = min(limit, SEARCH_MAX_LIMIT)
+    query = (payload.get("query") or "").strip()
+    try:
+        text_weight = float(payload.get("text_weight", orch.matching_agent.TEXT_WEIGHT))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="text_weight must be a number")
+    if not 0 <= text_weight <= 1:
+        raise HTTPException(status_code=400, detail="text_weight must be between 0 and 1")
+    after = decode_search_cursor(payload["cursor"]) if payload.get("cursor") else None
+    
+    # Session lookup, index refresh and scoring run in a worker thread
+    return await run_blocking(
+        search_page, orch, db, session_id, filters, query, text_weight, limit, offset, after
+    )
+
+
+def search_page(
+    orch: JobFinderOrchestrator,
+    db: Session,
+    session_id: str,
+    filters: Dict,
+    query: str,
+    text_weight: float,
+    limit: int,
+    offset: int,
+    after: Optional[Tuple[int, int]],
+) -> Dict:
+    """One page of /search results (see search_jobs)."""
+    session = orch.get_session(session_id, db)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Get all jobs from database
-    jobs = orch.matching_agent.get_jobs_from_database(db)
+    # Get all jobs from the index (reuses their precomputed scoring features)
+    index = orch.matching_agent.get_job_index(db)
     
-    # Apply filters
-    filtered_jobs = orch.matching_agent.filter_jobs(jobs, filters)
+    # A text query keeps the jobs its terms' postings lead to
+    text_scores: Dict[str, float] = {}
+    if query:
+        text_scores = index.text_scores(query)
+    
+    # Apply filters with the facet bitmaps, within the query's hits (counts
+    # are per option, given the other filters and the query)
+    filtered_jobs, facet_counts = index.filter(filters, within=text_scores if query else None)
     
     # Score remaining jobs against seeker profile
-    recommendations = []
-    for job in filtered_jobs:
-        score = orch.matching_agent.score_job(session.seeker_profile, job)
-        if score > 0:  # Only include jobs with positive score
-            recommendation = {
-                "job_id": job.id,
-                "match_score": score,
-                "explanation": f"Match based on skills and preferences",
-                "job": {
-                    "id": job.id,
-                    "title": job.title,
-                    "company": job.company,
-                    "location": job.location,
-                    "work_type": job.work_type,
-                    "experience_level": job.experience_level,
-                    "required_skills": job.required_skills,
-                    "optional_skills": job.optional_skills,
-                    "industries": job.industries,
-                    "description": job.description,
-                }
+    scores = orch.matching_agent.score_listings(session.seeker_profile, filtered_jobs, index)
+    if query:
+        scores = orch.matching_agent.blend_scores(
+            scores, [text_scores[job.id] for job in filtered_jobs], text_weight
+        )
+    scored = [
+        (score, index.position(job.id), job)
+        for job, score in zip(filtered_jobs, scores)
+        if score > 0  # Only include jobs with positive score
+    ]
+    
+    # Best scores first; only the requested page is built
+    page = orch.matching_agent.top_scored(scored, limit, offset=offset, after=after)
+    recommendations = [
+        {
+            "job_id": job.id,
+            "match_score": score,
+            "explanation": f"Match based on skills and preferences",
+            "job": {
+                "id": job.id,
+                "title": job.title,
+                "company": job.company,
+                "location": job.location,
+                "work_type": job.work_type,
+                "experience_level": job.experience_level,
+                "required_skills": job.required_skills,
+                "optional_skills": job.optional_skills,
+                "industries": job.industries,
+                "description": job.description,
             }
-            recommendations.append(recommendation)
+        }
+        for score, _, job in page
+    ]
     
-    # Sort by match score
-    recommendations.sort(key=lambda x: x["match_score"], reverse=True)
+    # A full page may have more after it; the cursor resumes after its last item
+    next_cursor = None
+    if len(page) == limit:
+        last_score, last_position, _ = page[-1]
+        if any((-score, position) > (-last_score, last_position) for score, position, _ in scored):
+            next_cursor = encode_search_cursor(last_score, last_position)
     
     return {
-        "total_results": len(recommendations),
+        "total_results": len(scored),
         "filters_applied": filters,
+        "facet_counts": facet_counts,
+        "limit": limit,
+        "next_cursor": next_cursor,
         "recommendations": recommendations
     }
+
+
+@router.post("/batch-match")
+async def batch_match(payload: Dict, db: Session = Depends(get_db)):
+    """Top matches for many seeker profiles at once.
+    
+    Example payload:
+    {
+        "seekers": [{"id": "s1", "skills": ["Python"], "preferred_titles": ["Backend Engineer"]}, ...],
+        "k": 5
+    }
+    
+    Seekers are scored against the whole catalogue in chunked score
+    matrices; BATCH_MATCH_WORKERS > 1 spreads the chunks over processes.
+    """
+    raw_seekers = payload.get("seekers")
+    if not isinstance(raw_seekers, list) or not raw_seekers:
+        raise HTTPException(status_code=400, detail="seekers must be a non-empty list")
+    if len(raw_seekers) > BATCH_MATCH_MAX_SEEKERS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MATCH_MAX_SEEKERS} seekers per request")
+    try:
+        seekers = [JobSeekerProfile.model_validate(seeker) for seeker in raw_seekers]
+        k = int(payload.get("k") or 0)
+    except (ValidationError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid seekers or k")
+    if k < 0:
+        raise HTTPException(status_code=400, detail="k must not be negative")
+    
+    orch = get_orchestrator()
+    index = await run_blocking(orch.matching_agent.get_job_index, db)
+    matches = await run_blocking(
+        orch.matching_agent.match_many,
+        seekers,
+        k=min(k, SEARCH_MAX_LIMIT) or None,
+        index=index,
+        workers=int(os.getenv("BATCH_MATCH_WORKERS", "0")),
+    )
+    return {
+        "results": [
+            {
+                "seeker_id": seeker.id,
+                "recommendations": [rec.model_dump() for rec in recommendations],
+            }
+            for seeker, recommendations in zip(seekers, matches)
+        ]
+    }
+
+
+def encode_search_cursor(score: int, position: int) -> str:
+    """Opaque /search cursor for the (score, listing position) of a page's last result"""
+    return base64.urlsafe_b64encode(json.dumps([score, position]).encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        score, position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(score), int(position)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
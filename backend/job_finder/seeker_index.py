@@ -0,0 +1,128 @@
+"""
+Reverse index over seeker profiles for job alerts.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from .job_index import TECH_KEYWORDS, TECH_TITLE_BONUS, WORK_TYPE_MATCH_POINTS, JobFeatures, SeekerFeatures
+from .models import JobSeekerProfile
+
+
+class SeekerIndex:
+    """
+    Posting lists from skill, title, location, work type and industry to
+    seeker ids - the mirror image of JobIndex.
+
+    candidates() returns every seeker sharing a scoring signal with a job,
+    which covers every seeker the job can reach MatchingAgent.MIN_MATCH_SCORE
+    for: without any shared signal score_job gives at most the tech-role
+    bonus plus the remote/hybrid work type fallback (20 points). A shared
+    work type alone is worth 25 points, 30 with the tech-role bonus, so
+    seekers matching only on work type are left out below that min_score.
+    """
+
+    def __init__(self, profiles: Iterable[JobSeekerProfile] = ()) -> None:
+        self._lock = threading.RLock()
+        self._profiles: Dict[str, JobSeekerProfile] = {}
+        self._features: Dict[str, SeekerFeatures] = {}
+        self.skills: Dict[str, Set[str]] = {}
+        self.industries: Dict[str, Set[str]] = {}
+        self.work_types: Dict[str, Set[str]] = {}
+        self.titles: Dict[str, Set[str]] = {}
+        self.locations: Dict[str, Set[str]] = {}
+        # Seekers with a preferred location mentioning remote
+        self.remote_seekers: Set[str] = set()
+        for profile in profiles:
+            self.add(profile)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, seeker_id: str) -> bool:
+        return seeker_id in self._profiles
+
+    def add(self, profile: JobSeekerProfile) -> None:
+        """Index a profile (it needs an id), replacing any previous version."""
+        if not profile.id:
+            raise ValueError("Only profiles with an id can be indexed")
+        with self._lock:
+            self.remove(profile.id)
+            features = SeekerFeatures.from_profile(profile)
+            self._profiles[profile.id] = profile
+            self._features[profile.id] = features
+            for skill in features.skills:
+                self.skills.setdefault(skill, set()).add(profile.id)
+            for industry in features.industries:
+                self.industries.setdefault(industry, set()).add(profile.id)
+            for title in features.titles:
+                self.titles.setdefault(title, set()).add(profile.id)
+            for location in features.locations:
+                self.locations.setdefault(location, set()).add(profile.id)
+                if "remote" in location:
+                    self.remote_seekers.add(profile.id)
+            if features.work_type:
+                self.work_types.setdefault(features.work_type, set()).add(profile.id)
+
+    def remove(self, seeker_id: str) -> None:
+        with self._lock:
+            features = self._features.pop(seeker_id, None)
+            self._profiles.pop(seeker_id, None)
+            if features is None:
+                return
+            for skill in features.skills:
+                self._discard(self.skills, skill, seeker_id)
+            for industry in features.industries:
+                self._discard(self.industries, industry, seeker_id)
+            for title in features.titles:
+                self._discard(self.titles, title, seeker_id)
+            for location in features.locations:
+                self._discard(self.locations, location, seeker_id)
+            self._discard(self.work_types, features.work_type, seeker_id)
+            self.remote_seekers.discard(seeker_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, seeker_id: str) -> None:
+        ids = postings.get(key)
+        if ids is not None:
+            ids.discard(seeker_id)
+            if not ids:
+                del postings[key]
+
+    def get(self, seeker_id: str) -> Optional[JobSeekerProfile]:
+        return self._profiles.get(seeker_id)
+
+    def features(self, seeker_id: str) -> SeekerFeatures:
+        return self._features[seeker_id]
+
+    def candidates(self, job: JobFeatures, min_score: int = 0) -> List[str]:
+        """Ids of the seekers sharing a scoring signal with a job that can reach min_score."""
+        with self._lock:
+            ids: Set[str] = set()
+            for skill in job.required_skills | job.optional_skills:
+                ids |= self.skills.get(skill, set())
+            for industry in job.industries:
+                ids |= self.industries.get(industry, set())
+            # Title and location matches are substring checks, resolved
+            # against the distinct seeker values rather than per seeker
+            for title, seekers in self.titles.items():
+                if title in job.title or job.title in title:
+                    ids |= seekers
+            if job.location:
+                for location, seekers in self.locations.items():
+                    if location in job.location:
+                        ids |= seekers
+                if "remote" in job.location:
+                    ids |= self.remote_seekers
+            # The work type posting lists hold every seeker with that
+            # preference, so they are only worth reading when a work type
+            # match plus the tech-role bonus can reach min_score on its own
+            tech_bonus = TECH_TITLE_BONUS if any(kw in job.title for kw in TECH_KEYWORDS) else 0
+            if job.work_type and WORK_TYPE_MATCH_POINTS + tech_bonus >= min_score:
+                ids |= self.work_types.get(job.work_type, set())
+                if job.work_type == "on-site":
+                    ids |= self.work_types.get("onsite", set())
+            return sorted(ids)
@@ -0,0 +1,346 @@
+"""
+Embedding-based candidate retrieval for semantic job matching.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import tempfile
+import weakref
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - semantic matching is then unavailable
+    np = None
+
+from .models import JobListing, JobSeekerProfile
+from .text_index import tokenize
+
+# Related role words, added to each other's features by the hashing embedder
+# so "frontend" and "ui engineer" land close without a learned model
+ROLE_CONCEPTS = (
+    ("frontend", "front", "ui", "react", "vue", "angular", "web", "javascript", "typescript"),
+    ("backend", "server", "api", "node", "django", "fastapi", "microservice"),
+    ("fullstack", "full", "stack", "mern"),
+    ("data", "analyst", "analytic", "bi", "sql", "dashboard", "insight"),
+    ("scientist", "ml", "machine", "learn", "ai", "model"),
+    ("designer", "design", "ux", "figma", "product"),
+    ("devops", "sre", "infrastructure", "cloud", "aws", "kubernete", "docker", "platform"),
+    ("mobile", "ios", "android", "flutter", "swift", "kotlin"),
+    ("manager", "lead", "head", "director", "mentor"),
+)
+CONCEPT_OF = {word: f"concept:{i}" for i, words in enumerate(ROLE_CONCEPTS) for word in words}
+CONCEPT_WEIGHT = 2.0
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class HashingEmbedder:
+    """
+    Offline CPU embedder: signed feature hashing of stemmed words, word
+    bigrams, character trigrams and ROLE_CONCEPTS ids into `dim` buckets,
+    L2-normalised so dot products are cosine similarities.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                bucket, sign = self._bucket(feature)
+                vectors[row, bucket] += sign * weight
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _features(self, text: str):
+        words = tokenize(text.replace("-", ""))
+        for word in words:
+            yield word, 1.0
+            if word in CONCEPT_OF:
+                yield CONCEPT_OF[word], CONCEPT_WEIGHT
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                yield "#" + padded[i:i + 3], 0.3
+        for first, second in zip(words, words[1:]):
+            yield f"{first} {second}", 0.5
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            # crc32 is stable across processes, unlike hash()
+            code = zlib.crc32(feature.encode())
+            bucket = self._buckets[feature] = (code % self.dim, 1.0 if code & (1 << 31) else -1.0)
+        return bucket
+
+
+class SentenceTransformerEmbedder:
+    """Embedder backed by a locally available sentence-transformers model."""
+
+    def __init__(self, model_name: str) -> None:
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        return self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def get_embedder():
+    """
+    SEMANTIC_MODEL names a sentence-transformers model to use when that
+    package (and the model files) are installed; otherwise the hashing
+    embedder is used.
+    """
+    model_name = os.getenv("SEMANTIC_MODEL")
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            print(f"DEBUG: semantic model {model_name} unavailable ({e}), using hashing embedder")
+    return HashingEmbedder(int(os.getenv("SEMANTIC_HASH_DIM", "256")))
+
+
+def memmap_vectors(vectors: "np.ndarray", directory: Optional[str] = None) -> "np.memmap":
+    """
+    Copy vectors into a fresh read-only memory-mapped file and return the map.
+
+    The file (job_vectors_*.f32 in SEMANTIC_INDEX_DIR, else the temp dir)
+    lives as long as the returned map: it is deleted once the map is garbage
+    collected, i.e. when the last SemanticIndex sharing it is replaced, or
+    at interpreter exit. Files left behind by a killed process are never
+    reopened and can be removed at any time.
+    """
+    directory = directory or os.getenv("SEMANTIC_INDEX_DIR") or tempfile.gettempdir()
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="job_vectors_", suffix=".f32", dir=directory)
+    os.close(fd)
+    stored = np.memmap(path, dtype=np.float32, mode="w+", shape=vectors.shape)
+    stored[:] = vectors
+    stored.flush()
+    del stored
+    readonly = np.memmap(path, dtype=np.float32, mode="r", shape=vectors.shape)
+    weakref.finalize(readonly, _remove_file, path)
+    return readonly
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass  # Windows cannot unlink a file a view still maps - it stays until the dir is cleaned
+
+
+class VectorStore:
+    """
+    Row-addressed vectors: a memory-mapped base written once, plus the rows
+    appended in memory since. appended() returns a new store sharing the
+    base, so readers of this one are unaffected.
+    """
+
+    def __init__(self, base: "np.ndarray", extra: Optional["np.ndarray"] = None) -> None:
+        self.base = base
+        self.extra = extra if extra is not None else np.zeros((0, base.shape[1]), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.extra)
+
+    def __getitem__(self, rows) -> "np.ndarray":
+        if not len(self.extra):
+            return self.base[rows]
+        rows = np.arange(len(self))[rows] if isinstance(rows, slice) else np.asarray(rows, dtype=np.int64)
+        vectors = np.empty((len(rows), self.base.shape[1]), dtype=np.float32)
+        in_base = rows < len(self.base)
+        vectors[in_base] = self.base[rows[in_base]]
+        vectors[~in_base] = self.extra[rows[~in_base] - len(self.base)]
+        return vectors
+
+    def appended(self, vectors: "np.ndarray") -> "VectorStore":
+        return VectorStore(self.base, np.concatenate([self.extra, vectors.astype(np.float32)]))
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index: k-means centroids partition the vectors, and a
+    query scans only the lists of its `nprobe` closest centroids.
+    updated() adds and drops rows against the trained centroids; `drift`
+    counts those changes so callers know when retraining is due.
+    """
+
+    def __init__(self, vectors: "np.ndarray", nlist: Optional[int] = None, iterations: int = 8, seed: int = 0) -> None:
+        self.vectors = vectors
+        count = len(vectors)
+        self.nlist = max(1, min(nlist or int(np.sqrt(count)), count))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(count, size=min(count, self.nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(self.nlist):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self.centroids = centroids
+
+        assignment = np.concatenate([
+            np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, count, 65536)
+        ]) if count else np.zeros(0, dtype=np.int64)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(self.nlist + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.nlist)]
+        # List of every row, -1 once dropped
+        self.assignment = assignment.astype(np.int64)
+        self.trained = count
+        self.drift = 0
+
+    def updated(self, vectors, added_rows: "np.ndarray", dropped_rows: "np.ndarray") -> "IVFIndex":
+        """
+        Copy of the index over `vectors` (this index's rows plus `added_rows`
+        appended after them) with each added row in its nearest centroid's
+        list and `dropped_rows` removed. The centroids are not retrained.
+        """
+        ann = copy.copy(self)
+        ann.vectors = vectors
+        ann.lists = list(self.lists)
+        clusters = np.argmax(vectors[added_rows] @ self.centroids.T, axis=1) if len(added_rows) else added_rows
+        ann.assignment = np.concatenate([self.assignment, clusters.astype(np.int64)])
+        for row in dropped_rows:
+            cluster = ann.assignment[row]
+            if cluster >= 0:
+                ann.lists[cluster] = ann.lists[cluster][ann.lists[cluster] != row]
+                ann.assignment[row] = -1
+        for cluster in np.unique(clusters):
+            ann.lists[cluster] = np.concatenate([ann.lists[cluster], added_rows[clusters == cluster]])
+        ann.drift = self.drift + len(added_rows) + len(dropped_rows)
+        return ann
+
+    def search(self, query: "np.ndarray", k: int, nprobe: int = 16) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Approximate top-k (rows, similarities) for one query vector."""
+        closest = np.argsort(-(self.centroids @ query))[:nprobe]
+        rows = np.concatenate([self.lists[c] for c in closest])
+        return top_k(rows, self.vectors[rows] @ query, k)
+
+    def search_exact(self, query: "np.ndarray", k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Brute-force top-k over every vector (the recall baseline)."""
+        rows = np.flatnonzero(self.assignment >= 0)
+        return top_k(rows, self.vectors[rows] @ query, k)
+
+
+def top_k(rows: "np.ndarray", similarities: "np.ndarray", k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    if len(rows) > k:
+        best = np.argpartition(-similarities, k - 1)[:k]
+        rows, similarities = rows[best], similarities[best]
+    order = np.argsort(-similarities, kind="stable")
+    return rows[order], similarities[order]
+
+
+def listing_text(job: JobListing) -> str:
+    return " ".join([job.title, job.description or "", *job.required_skills, *job.optional_skills])
+
+
+def seeker_text(seeker: JobSeekerProfile) -> str:
+    return " ".join([*seeker.preferred_titles, *seeker.skills, seeker.current_role or ""])
+
+
+class SemanticIndex:
+    """
+    Embeddings of every listing (title + description + skills, and title
+    alone) in memory-mapped arrays, with an IVF index over the former for
+    candidate generation.
+
+    updated() follows changes to the listings without a rebuild: only new
+    and changed listings are embedded, and they join the existing IVF lists.
+    needs_retrain() reports when those changes reach SEMANTIC_RETRAIN_DRIFT
+    (a share of the listings the centroids were trained on).
+    """
+
+    def __init__(self, jobs: Sequence[JobListing], embedder=None, nprobe: Optional[int] = None) -> None:
+        if np is None:
+            raise ImportError("numpy is required for SemanticIndex")
+        self.embedder = embedder or get_embedder()
+        self.nprobe = nprobe or int(os.getenv("SEMANTIC_NPROBE", "16"))
+        self.retrain_drift = float(os.getenv("SEMANTIC_RETRAIN_DRIFT", "0.2"))
+        self.jobs: Dict[str, JobListing] = {job.id: job for job in jobs}
+        # Row -> job id; rows of replaced or removed listings stay, unreachable
+        self.job_ids: List[str] = [job.id for job in jobs]
+        self.rows = {job_id: row for row, job_id in enumerate(self.job_ids)}
+        self.vectors = VectorStore(memmap_vectors(self._embed([listing_text(job) for job in jobs])))
+        self.title_vectors = VectorStore(memmap_vectors(self._embed([job.title for job in jobs])))
+        self.ann = IVFIndex(self.vectors) if jobs else None
+
+    def updated(self, jobs: Sequence[JobListing]) -> "SemanticIndex":
+        """
+        Index over `jobs` built from this one: listings that are new or
+        changed are embedded and appended, removed ones dropped. This index
+        is left as it was for readers still using it.
+        """
+        current = {job.id: job for job in jobs}
+        dropped = [job_id for job_id in self.jobs if job_id not in current]
+        changed = [
+            job for job_id, job in current.items()
+            if self.jobs.get(job_id) is not job and self.jobs.get(job_id) != job
+        ]
+        if not dropped and not changed:
+            return self
+        if self.ann is None:
+            return SemanticIndex(jobs, self.embedder, self.nprobe)
+
+        dropped_rows = np.array(
+            [self.rows[job_id] for job_id in dropped] + [self.rows[job.id] for job in changed if job.id in self.rows],
+            dtype=np.int64,
+        )
+        added_rows = np.arange(len(self.job_ids), len(self.job_ids) + len(changed), dtype=np.int64)
+        index = copy.copy(self)
+        index.jobs = current
+        index.job_ids = self.job_ids + [job.id for job in changed]
+        index.rows = dict(self.rows)
+        for job_id in dropped:
+            del index.rows[job_id]
+        for row, job in zip(added_rows.tolist(), changed):
+            index.rows[job.id] = row
+        index.vectors = self.vectors.appended(self._embed([listing_text(job) for job in changed]))
+        index.title_vectors = self.title_vectors.appended(self._embed([job.title for job in changed]))
+        index.ann = self.ann.updated(index.vectors, added_rows, dropped_rows)
+        return index
+
+    def needs_retrain(self) -> bool:
+        """Whether the listings changed enough since k-means ran to train it again."""
+        return self.ann is not None and self.ann.drift > self.retrain_drift * max(self.ann.trained, 1)
+
+    def _embed(self, texts: List[str]) -> "np.ndarray":
+        if not texts:
+            return np.zeros((0, self.embedder.dim), dtype=np.float32)
+        return np.concatenate([
+            self.embedder.embed(texts[start:start + 4096]) for start in range(0, len(texts), 4096)
+        ])
+
+    def candidates(self, seeker: JobSeekerProfile, k: int) -> List[str]:
+        """Ids of the k listings closest to the seeker's titles and skills (approximate)."""
+        text = seeker_text(seeker).strip()
+        if self.ann is None or not text or k < 1:
+            return []
+        rows, _ = self.ann.search(self.embedder.embed([text])[0], k, self.nprobe)
+        return [self.job_ids[row] for row in rows]
+
+    def title_similarity(self, seeker: JobSeekerProfile, job_ids: Sequence[str]) -> Dict[str, float]:
+        """Best cosine similarity between any preferred title and each job's title."""
+        if not seeker.preferred_titles or not job_ids:
+            return {}
+        wanted = self.embedder.embed(seeker.preferred_titles)
+        titles = self.title_vectors[[self.rows[job_id] for job_id in job_ids]]
+        best = (titles @ wanted.T).max(axis=1)
+        return dict(zip(job_ids, best.tolist()))
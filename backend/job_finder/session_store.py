@@ -0,0 +1,246 @@
+"""
+Persistent Job Finder sessions behind a bounded in-memory cache.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+try:
+    from ..cache import LRUCache
+except ImportError:
+    from cache import LRUCache
+
+from .db_models import JobFinderSessionORM, JobListingORM, JobRecommendationORM, JobSeekerProfileORM
+from .models import JobFinderSession, JobListing, JobRecommendation, JobSeekerProfile
+
+PROFILE_FIELDS = (
+    "current_role", "skills", "years_experience", "preferred_titles",
+    "preferred_locations", "salary_expectation", "work_type", "industries",
+)
+
+
+def profile_row(profile: JobSeekerProfile) -> JobSeekerProfileORM:
+    return JobSeekerProfileORM(
+        id=profile.id,
+        updated_at=datetime.utcnow(),
+        **{field: getattr(profile, field) for field in PROFILE_FIELDS},
+    )
+
+
+def profile_from_row(row: JobSeekerProfileORM) -> JobSeekerProfile:
+    return JobSeekerProfile(
+        id=row.id,
+        **{field: getattr(row, field) for field in PROFILE_FIELDS if getattr(row, field) is not None},
+    )
+
+
+def listing_values(job: JobListing) -> Dict[str, Any]:
+    """Column values of a listing's job_finder_listings mirror row."""
+    return job.model_dump(exclude={"responsibilities"})
+
+
+def upsert_rows(db: Any, model: Any, rows: List[Dict[str, Any]], update_existing: bool = True) -> None:
+    """
+    Insert rows keyed by their primary key `id`, replacing (or, with
+    update_existing=False, keeping) rows that already exist.
+
+    Recommendation and listing rows are written both by session saves and
+    by job alerts, each in its own transaction, so a plain insert after a
+    delete can still collide with the other writer's commit. SQLite and
+    PostgreSQL resolve the conflict in the statement itself; on other
+    databases the rows are deleted and re-inserted.
+    """
+    if not rows:
+        return
+    dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(db.get_bind().dialect.name)
+    if dialect is None:
+        ids = [row["id"] for row in rows]
+        if not update_existing:
+            existing = {row_id for (row_id,) in db.query(model.id).filter(model.id.in_(ids))}
+            rows = [row for row in rows if row["id"] not in existing]
+        else:
+            db.execute(delete(model).where(model.id.in_(ids)))
+        if rows:
+            db.execute(insert(model), rows)
+        return
+    statement = dialect.insert(model)
+    if update_existing:
+        columns = [column for column in rows[0] if column != "id"]
+        statement = statement.on_conflict_do_update(
+            index_elements=["id"],
+            set_={column: statement.excluded[column] for column in columns},
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=["id"])
+    db.execute(statement, rows)
+
+
+class SessionConflict(Exception):
+    """The session was saved by another request since it was read."""
+
+
+class JobFinderSessionStore:
+    """
+    Job Finder sessions keyed by session_id.
+
+    The database (job_finder_sessions, with the profile in
+    job_finder_profiles and recommendations in job_finder_recommendations)
+    is the source of truth, so sessions survive restarts and every worker
+    sees them. In front of it an LRU with TTL holds recently used sessions
+    with the row version they were read or written at; a hit costs one
+    primary-key lookup of that version, and only a changed version (another
+    worker saved the session) reloads the rows. Without a db the store is
+    memory-only.
+
+    Callers get their own copy of a session, stamped with the version it was
+    read at, and save() only writes it if the row still has that version
+    (raising SessionConflict otherwise), so concurrent turns cannot silently
+    overwrite each other or the cached copy.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: Optional[float] = 3600) -> None:
+        self.memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    @classmethod
+    def from_env(cls) -> "JobFinderSessionStore":
+        """Build a store configured from JOB_FINDER_SESSION_* environment variables"""
+        return cls(
+            max_entries=int(os.getenv("JOB_FINDER_SESSION_MAX_ENTRIES", "1000")),
+            ttl_seconds=float(os.getenv("JOB_FINDER_SESSION_TTL_SECONDS", "3600")),
+        )
+
+    def get(self, db: Any, session_id: str) -> Optional[JobFinderSession]:
+        """A copy of the session from the cache if still current, else from the database."""
+        cached: Optional[Tuple[Optional[int], JobFinderSession]] = self.memory.get(session_id)
+        if db is None:
+            return cached[1].model_copy(deep=True) if cached else None
+        version = (
+            db.query(JobFinderSessionORM.version)
+            .filter(JobFinderSessionORM.session_id == session_id)
+            .scalar()
+        )
+        if version is None:
+            return None
+        if cached is not None and cached[0] == version:
+            return cached[1].model_copy(deep=True)
+        session = self._load(db, session_id)
+        if session is not None:
+            self.memory.set(session_id, (session.version, session.model_copy(deep=True)))
+        return session
+
+    def save(self, db: Any, session: JobFinderSession, listings: Iterable[JobListing] = ()) -> None:
+        """
+        Write a session, its profile and its recommendations in one
+        transaction. `listings` are the recommended jobs, mirrored into
+        job_finder_listings for the recommendation rows to refer to.
+
+        The session row is only written if its version is still
+        session.version (0 for a new session); otherwise nothing is written
+        and SessionConflict is raised. On success session.version is the
+        new version.
+        """
+        if db is None:
+            self.memory.set(session.session_id, (None, session.model_copy(deep=True)))
+            return
+        expected = session.version
+        values = dict(
+            profile_id=session.seeker_profile.id,
+            messages=session.messages,
+            is_profile_complete=1 if session.is_profile_complete else 0,
+            recommendation_ids=[rec.id for rec in session.recommendations],
+            updated_at=datetime.utcnow(),
+        )
+        try:
+            db.merge(profile_row(session.seeker_profile))
+            if expected == 0:
+                db.add(JobFinderSessionORM(session_id=session.session_id, version=1, **values))
+                try:
+                    db.flush()
+                except IntegrityError:
+                    raise SessionConflict(session.session_id)
+            else:
+                written = db.execute(
+                    update(JobFinderSessionORM)
+                    .where(
+                        JobFinderSessionORM.session_id == session.session_id,
+                        JobFinderSessionORM.version == expected,
+                    )
+                    .values(version=JobFinderSessionORM.version + 1, **values)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if written != 1:
+                    raise SessionConflict(session.session_id)
+            if session.recommendations:
+                self._write_recommendations(db, session, listings)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.memory.delete(session.session_id)
+            raise
+        session.version = expected + 1
+        self.memory.set(session.session_id, (session.version, session.model_copy(deep=True)))
+
+    def delete(self, db: Any, session_id: str) -> None:
+        """Forget a session (its profile and recommendations are kept)"""
+        self.memory.delete(session_id)
+        if db is not None:
+            db.execute(delete(JobFinderSessionORM).where(JobFinderSessionORM.session_id == session_id))
+            db.commit()
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    @staticmethod
+    def _write_recommendations(db: Any, session: JobFinderSession, listings: Iterable[JobListing]) -> None:
+        """
+        Upsert the session's recommendation rows (and any listing rows they
+        need) with two bulk statements; rows job alerts wrote for the same
+        job and seeker are overwritten rather than conflicting.
+        """
+        jobs = {job.id: job for job in listings}
+        upsert_rows(db, JobListingORM, [listing_values(job) for job in jobs.values()], update_existing=False)
+        upsert_rows(db, JobRecommendationORM, [
+            {
+                "id": rec.id,
+                "job_id": rec.job_id,
+                "seeker_id": session.seeker_profile.id,
+                "match_score": rec.match_score,
+                "explanation": rec.explanation,
+                "created_at": rec.created_at,
+            }
+            for rec in session.recommendations
+        ])
+
+    @staticmethod
+    def _load(db: Any, session_id: str) -> Optional[JobFinderSession]:
+        row = db.get(JobFinderSessionORM, session_id)
+        if row is None:
+            return None
+        ids = list(row.recommendation_ids or [])
+        recommendations: Dict[str, JobRecommendation] = {}
+        if ids:
+            for rec in db.query(JobRecommendationORM).filter(JobRecommendationORM.id.in_(ids)):
+                recommendations[rec.id] = JobRecommendation(
+                    id=rec.id,
+                    job_id=rec.job_id,
+                    seeker_id=rec.seeker_id,
+                    match_score=rec.match_score,
+                    explanation=rec.explanation,
+                    created_at=rec.created_at,
+                )
+        return JobFinderSession(
+            session_id=row.session_id,
+            seeker_profile=profile_from_row(row.profile) if row.profile else JobSeekerProfile(id=row.profile_id),
+            messages=list(row.messages or []),
+            recommendations=[recommendations[rec_id] for rec_id in ids if rec_id in recommendations],
+            is_profile_complete=bool(row.is_profile_complete),
+            version=row.version,
+        )
@@ -0,0 +1,145 @@
+"""
+BM25 full-text index over job listing text.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+from .models import JobListing
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "their this to we will with you your".split()
+)
+# Title words count this many times, so "python" in the title outranks one
+# mention in the responsibilities
+TITLE_WEIGHT = 2.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def stem(token: str) -> str:
+    """Light suffix stripping: developing/developed -> develop, engineers -> engineer."""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            # running -> run, planned -> plan
+            if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lsz":
+                token = token[:-1]
+            return token
+    if token.endswith(("sses", "xes", "ches", "shes", "zes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed tokens of a text, without stopwords."""
+    return [stem(token) for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def listing_terms(job: JobListing) -> Counter:
+    """Weighted term frequencies of a listing's title, description, responsibilities and requirements."""
+    terms: Counter = Counter()
+    for token in tokenize(job.title):
+        terms[token] += TITLE_WEIGHT
+    body = [job.description or "", *job.responsibilities, *job.required_skills]
+    for token in tokenize(" ".join(body)):
+        terms[token] += 1
+    return terms
+
+
+class TextIndex:
+    """
+    Inverted index from stemmed term to per-listing term frequency, ranked
+    with Okapi BM25. Only the postings of the query's terms are read, and
+    listings can be added and removed incrementally.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self._terms: Dict[str, Counter] = {}
+        self._lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def copy(self) -> "TextIndex":
+        """Independent copy; per-listing term counts are shared, never modified."""
+        clone = TextIndex()
+        clone.postings = {term: dict(listings) for term, listings in self.postings.items()}
+        clone._terms = dict(self._terms)
+        clone._lengths = dict(self._lengths)
+        clone._total_length = self._total_length
+        return clone
+
+    def add(self, job: JobListing) -> None:
+        """Index a listing, replacing any previous version with the same id."""
+        self.remove(job.id)
+        terms = listing_terms(job)
+        self._terms[job.id] = terms
+        length = sum(terms.values())
+        self._lengths[job.id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[job.id] = frequency
+
+    def remove(self, job_id: str) -> None:
+        terms = self._terms.pop(job_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(job_id)
+        for term in terms:
+            listings = self.postings[term]
+            del listings[job_id]
+            if not listings:
+                del self.postings[term]
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """BM25 score of every listing containing at least one query term."""
+        if not self._terms:
+            return {}
+        count = len(self._terms)
+        average_length = self._total_length / count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            listings = self.postings.get(term)
+            if not listings:
+                continue
+            idf = math.log(1 + (count - len(listings) + 0.5) / (len(listings) + 0.5))
+            for job_id, frequency in listings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[job_id] / average_length)
+                scores[job_id] = scores.get(job_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return scores
+
+    def matching(self, query: str) -> Set[str]:
+        """
+        Ids of the listings containing every term of the query, intersected
+        from its terms' postings (every listing when it has no terms).
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return set(self._terms)
+        postings = sorted((self.postings.get(term, {}) for term in terms), key=len)
+        ids = set(postings[0])
+        for listings in postings[1:]:
+            ids = {job_id for job_id in ids if job_id in listings}
+        return ids
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[float, str]]:
+        """Best (score, job_id) pairs for a query, most relevant first."""
+        hits = ((score, job_id) for job_id, score in self.scores(query).items())
+        return heapq.nlargest(limit, hits, key=lambda hit: hit[0])
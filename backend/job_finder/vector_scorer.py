@@ -0,0 +1,354 @@
+"""
+Columnar NumPy scorer computing MatchingAgent.score_job for every job at once.
+Phase 3: AI Logic scaffolding
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - MatchingAgent falls back to scalar scoring
+    np = None
+
+from .job_index import (
+    HYBRID_WORK_TYPE_POINTS,
+    INDUSTRY_MATCH_POINTS,
+    LOCATION_MATCH_POINTS,
+    OPTIONAL_SKILL_CAP,
+    OPTIONAL_SKILL_POINTS,
+    REMOTE_LOCATION_POINTS,
+    REQUIRED_SKILL_CAP,
+    REQUIRED_SKILL_POINTS,
+    TECH_KEYWORDS,
+    TECH_TITLE_BONUS,
+    TITLE_MATCH_POINTS,
+    UNMATCHED_WORK_TYPE_BONUS,
+    WORK_TYPE_MATCH_POINTS,
+    JobFeatures,
+    SeekerFeatures,
+)
+from .models import JobSeekerProfile
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class _Postings:
+    """Skill-major (CSC-style) job lists: value id -> rows of the jobs having it."""
+
+    def __init__(self, rows_by_value: Dict[str, List[int]]) -> None:
+        self.vocabulary = {value: i for i, value in enumerate(rows_by_value)}
+        lengths = [len(rows) for rows in rows_by_value.values()]
+        self.offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.rows = np.fromiter(
+            (row for rows in rows_by_value.values() for row in rows),
+            dtype=np.int64,
+            count=int(self.offsets[-1]),
+        )
+
+    def counts(self, values: Iterable[str], size: int) -> "np.ndarray":
+        """Per-job number of the given (distinct) values the job has."""
+        ids = [self.vocabulary[v] for v in values if v in self.vocabulary]
+        if not ids:
+            return np.zeros(size, dtype=np.int64)
+        rows = np.concatenate([self.rows[self.offsets[i]:self.offsets[i + 1]] for i in ids])
+        return np.bincount(rows, minlength=size)
+
+    def mark(self, matrix: "np.ndarray", values_per_row: Sequence[Iterable[str]], amount: int, combine=np.add) -> None:
+        """
+        Apply `amount` to matrix[row, job] (a rows x jobs matrix) for every
+        value of row's set the job has. The work is one scatter per (row,
+        value) over the value's jobs, so it grows with the actual overlaps.
+        """
+        rows_by_id: Dict[int, List[int]] = {}
+        for row, values in enumerate(values_per_row):
+            for value in values:
+                if value in self.vocabulary:
+                    rows_by_id.setdefault(self.vocabulary[value], []).append(row)
+        for i, rows in rows_by_id.items():
+            jobs = self.rows[self.offsets[i]:self.offsets[i + 1]]
+            for row in rows:
+                line = matrix[row]
+                line[jobs] = combine(line[jobs], amount)
+
+
+class _Categories:
+    """Categorical codes of a string column plus the distinct values."""
+
+    def __init__(self, values: Sequence[str]) -> None:
+        self.vocabulary: List[str] = []
+        codes_by_value: Dict[str, int] = {}
+        codes = np.empty(len(values), dtype=np.int64)
+        for row, value in enumerate(values):
+            code = codes_by_value.get(value)
+            if code is None:
+                code = codes_by_value[value] = len(self.vocabulary)
+                self.vocabulary.append(value)
+            codes[row] = code
+        self.codes = codes
+
+
+# Layout of the packed overlap counts used by VectorizedScorer.score_matrix
+_OPTIONAL_MASK = 0x7F
+_REQUIRED_UNIT = 0x80
+_INDUSTRY_BIT = 0x4000
+_OVERLAP_POINTS: Optional["np.ndarray"] = None
+
+
+def _overlap_points() -> "np.ndarray":
+    """Skill + industry points for every packed overlap value."""
+    global _OVERLAP_POINTS
+    if _OVERLAP_POINTS is None:
+        packed = np.arange(1 << 16)
+        required = (packed & (_INDUSTRY_BIT - 1)) // _REQUIRED_UNIT
+        points = np.minimum(required * REQUIRED_SKILL_POINTS, REQUIRED_SKILL_CAP)
+        points += np.minimum((packed & _OPTIONAL_MASK) * OPTIONAL_SKILL_POINTS, OPTIONAL_SKILL_CAP)
+        points += np.where(packed & _INDUSTRY_BIT, INDUSTRY_MATCH_POINTS, 0)
+        _OVERLAP_POINTS = points.astype(np.int16)
+    return _OVERLAP_POINTS
+
+
+class VectorizedScorer:
+    """
+    Scores every listing against a seeker with array operations.
+
+    Listings are encoded once as columns: skill and industry postings for
+    np.bincount overlap counts, and categorical codes for title, work type
+    and location. Per seeker, the string checks score_job does per job
+    (substring title/location matches) run once per distinct value and are
+    broadcast back through the codes. Scores are identical to score_job.
+
+    score_matrix()/top_many() score many seekers at once: the string checks
+    run once per distinct seeker preference across the batch, and a job's
+    title/work type/location points are gathered from its combination of
+    the three.
+    """
+
+    def __init__(self, job_ids: Sequence[str], features: Sequence[JobFeatures]) -> None:
+        if np is None:
+            raise ImportError("numpy is required for VectorizedScorer")
+        self.job_ids = list(job_ids)
+        self.rows: Dict[str, int] = {job_id: row for row, job_id in enumerate(self.job_ids)}
+        self.size = len(self.job_ids)
+
+        required: Dict[str, List[int]] = {}
+        optional: Dict[str, List[int]] = {}
+        industries: Dict[str, List[int]] = {}
+        for row, job in enumerate(features):
+            for skill in job.required_skills:
+                required.setdefault(skill, []).append(row)
+            for skill in job.optional_skills:
+                optional.setdefault(skill, []).append(row)
+            for industry in job.industries:
+                industries.setdefault(industry, []).append(row)
+        self.required = _Postings(required)
+        self.optional = _Postings(optional)
+        self.industries = _Postings(industries)
+
+        self.titles = _Categories([job.title for job in features])
+        self.work_types = _Categories([job.work_type for job in features])
+        self.locations = _Categories([job.location for job in features])
+        self.tech_titles = np.array(
+            [any(kw in title for kw in TECH_KEYWORDS) for title in self.titles.vocabulary],
+            dtype=bool,
+        )
+        # Batch scoring: title vocabulary matches per distinct seeker title,
+        # and each job's (title, work type, location) combination, so a batch
+        # scores the distinct combinations and gathers them once per job
+        self._title_hits: Dict[str, "np.ndarray"] = {}
+        combos = (
+            self.titles.codes * len(self.work_types.vocabulary) + self.work_types.codes
+        ) * len(self.locations.vocabulary) + self.locations.codes
+        combos, self.combo_codes = np.unique(combos, return_inverse=True)
+        self.combo_titles = combos // (len(self.work_types.vocabulary) * len(self.locations.vocabulary))
+        self.combo_work_types = combos // len(self.locations.vocabulary) % len(self.work_types.vocabulary)
+        self.combo_locations = combos % len(self.locations.vocabulary)
+        self._tiebreak = np.arange(self.size - 1, -1, -1, dtype=np.int32 if 101 * self.size < 2 ** 31 else np.int64)
+
+    @classmethod
+    def from_index(cls, index) -> "VectorizedScorer":
+        """Encode the listings of a JobIndex (in its listing order)."""
+        jobs = index.listings()
+        return cls([job.id for job in jobs], [index.features(job.id) for job in jobs])
+
+    def score_all(self, seeker: JobSeekerProfile) -> "np.ndarray":
+        """Scores (0-100) of every job, aligned with self.job_ids."""
+        wanted = SeekerFeatures.from_profile(seeker)
+        scores = np.minimum(self.required.counts(wanted.skills, self.size) * REQUIRED_SKILL_POINTS, REQUIRED_SKILL_CAP)
+        scores += np.minimum(self.optional.counts(wanted.skills, self.size) * OPTIONAL_SKILL_POINTS, OPTIONAL_SKILL_CAP)
+        scores += self._title_points(wanted)[self.titles.codes]
+        scores += self._work_type_points(wanted)[self.work_types.codes]
+        scores += self._location_points(wanted)[self.locations.codes]
+        if wanted.industries:
+            scores += np.where(self.industries.counts(wanted.industries, self.size) > 0, INDUSTRY_MATCH_POINTS, 0)
+        return np.minimum(scores, 100)
+
+    def top(self, seeker: JobSeekerProfile, limit: int, min_score: int) -> List[Tuple[int, str]]:
+        """Best (score, job_id) pairs with score >= min_score; ties keep listing order."""
+        scores = self.score_all(seeker)
+        rows = np.flatnonzero(scores >= min_score)
+        if len(rows) > limit:
+            # Partition on the limit-th best score, then order the survivors stably
+            cutoff = np.partition(scores[rows], len(rows) - limit)[len(rows) - limit]
+            rows = rows[scores[rows] >= cutoff]
+        rows = rows[np.argsort(-scores[rows], kind="stable")][:limit]
+        return [(int(scores[row]), self.job_ids[row]) for row in rows]
+
+    def score_matrix(self, seekers: Sequence[JobSeekerProfile]) -> "np.ndarray":
+        """(seekers x jobs) scores, identical to stacking score_all() per seeker."""
+        if not seekers:
+            return np.zeros((0, self.size), dtype=np.int16)
+        wanted = [SeekerFeatures.from_profile(seeker) for seeker in seekers]
+        # Skill and industry overlaps are packed into one uint16 per cell
+        # (required count, optional count, any industry) and turned into
+        # points with a lookup table. Overlaps are bounded by the seeker's
+        # skill count; the rare seeker with more skills than a count field
+        # holds is scored on its own.
+        packed = np.zeros((len(wanted), self.size), dtype=np.uint16)
+        oversized = [row for row, w in enumerate(wanted) if len(w.skills) > _OPTIONAL_MASK]
+        skills = [frozenset() if len(w.skills) > _OPTIONAL_MASK else w.skills for w in wanted]
+        self.required.mark(packed, skills, _REQUIRED_UNIT)
+        self.optional.mark(packed, skills, 1)
+        if any(w.industries for w in wanted):
+            self.industries.mark(packed, [w.industries for w in wanted], _INDUSTRY_BIT, np.bitwise_or)
+        scores = np.take(_overlap_points(), packed)
+
+        # Title, work type and location points depend on one categorical value
+        # per job: tables of (seekers x distinct values), computed once per
+        # distinct preference, are summed per combination and gathered
+        titles = self._per_seeker(wanted, lambda w: tuple(w.titles), self._batch_title_points)
+        work_types = self._per_seeker(wanted, lambda w: w.work_type, self._work_type_points)
+        locations = self._per_seeker(wanted, lambda w: w.locations, self._location_points)
+        combos = titles[:, self.combo_titles] + work_types[:, self.combo_work_types] + locations[:, self.combo_locations]
+        scores += np.take(combos, self.combo_codes, axis=1)
+        np.minimum(scores, 100, out=scores)
+        for row in oversized:
+            scores[row] = self.score_all(seekers[row])
+        return scores
+
+    def top_many(
+        self,
+        seekers: Sequence[JobSeekerProfile],
+        limit: int,
+        min_score: int,
+        chunk_cells: Optional[int] = None,
+    ) -> List[List[Tuple[int, str]]]:
+        """
+        top() for every seeker, scoring score_matrix() chunks of seekers
+        sized so a chunk holds about `chunk_cells` (seeker, job) scores
+        (BATCH_MATCH_CHUNK_CELLS, default 4M).
+        """
+        chunk_cells = chunk_cells or int(os.getenv("BATCH_MATCH_CHUNK_CELLS", str(1 << 22)))
+        chunk = max(1, chunk_cells // max(self.size, 1))
+        results: List[List[Tuple[int, str]]] = []
+        for start in range(0, len(seekers), chunk):
+            results.extend(self._top_rows(self.score_matrix(seekers[start:start + chunk]), limit, min_score))
+        return results
+
+    def _top_rows(self, scores: "np.ndarray", limit: int, min_score: int) -> List[List[Tuple[int, str]]]:
+        if limit < 1 or self.size == 0:
+            return [[] for _ in range(len(scores))]
+        # One sortable key per cell: score first, then earlier rows first.
+        # Keys order by score, so the best `limit` keys hold every qualifying
+        # cell there is room for; the rest are dropped after selection.
+        keys = scores.astype(self._tiebreak.dtype)
+        keys *= self.size
+        keys += self._tiebreak
+        if self.size > limit:
+            best = np.argpartition(-keys, limit - 1, axis=1)[:, :limit]
+        else:
+            best = np.broadcast_to(np.arange(self.size), (len(keys), self.size))
+        best_keys = np.take_along_axis(keys, best, axis=1)
+        order = np.argsort(-best_keys, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_keys = np.take_along_axis(best_keys, order, axis=1)
+        return [
+            [
+                (key // self.size, self.job_ids[row])
+                for row, key in zip(rows.tolist(), keys_row.tolist())
+                if key // self.size >= min_score
+            ]
+            for rows, keys_row in zip(best, best_keys)
+        ]
+
+    @staticmethod
+    def _per_seeker(wanted: Sequence[SeekerFeatures], key, points) -> "np.ndarray":
+        """(seekers x distinct values) points, computed once per distinct key(seeker)."""
+        tables: Dict[object, int] = {}
+        rows: List["np.ndarray"] = []
+        codes = []
+        for w in wanted:
+            k = key(w)
+            if k not in tables:
+                tables[k] = len(rows)
+                rows.append(points(w))
+            codes.append(tables[k])
+        return np.stack(rows).astype(np.int16)[codes]
+
+    def _batch_title_points(self, wanted: SeekerFeatures) -> "np.ndarray":
+        """_title_points() with the vocabulary scanned once per distinct title across calls."""
+        matched = np.zeros(len(self.titles.vocabulary), dtype=bool)
+        for t in wanted.titles:
+            hits = self._title_hits.get(t)
+            if hits is None:
+                hits = self._title_hits[t] = np.array(
+                    [t in title or title in t for title in self.titles.vocabulary], dtype=bool
+                )
+            matched |= hits
+        return np.where(matched, TITLE_MATCH_POINTS, np.where(self.tech_titles, TECH_TITLE_BONUS, 0))
+
+    def _title_points(self, wanted: SeekerFeatures) -> "np.ndarray":
+        points = np.where(self.tech_titles, TECH_TITLE_BONUS, 0)
+        if wanted.titles:
+            for code, title in enumerate(self.titles.vocabulary):
+                if any(t in title or title in t for t in wanted.titles):
+                    points[code] = TITLE_MATCH_POINTS
+        return points
+
+    def _work_type_points(self, wanted: SeekerFeatures) -> "np.ndarray":
+        points = np.zeros(len(self.work_types.vocabulary), dtype=np.int64)
+        if not wanted.work_type:
+            return points
+        for code, work_type in enumerate(self.work_types.vocabulary):
+            if not work_type:
+                continue
+            if work_type == wanted.work_type or (wanted.work_type == "onsite" and work_type == "on-site"):
+                points[code] = WORK_TYPE_MATCH_POINTS
+            elif work_type == "remote":
+                points[code] = UNMATCHED_WORK_TYPE_BONUS
+            elif work_type == "hybrid":
+                points[code] = HYBRID_WORK_TYPE_POINTS
+        return points
+
+    def _location_points(self, wanted: SeekerFeatures) -> "np.ndarray":
+        points = np.zeros(len(self.locations.vocabulary), dtype=np.int64)
+        if not wanted.locations:
+            return points
+        accepts_remote = any("remote" in loc for loc in wanted.locations)
+        for code, location in enumerate(self.locations.vocabulary):
+            if not location:
+                continue
+            if any(loc in location for loc in wanted.locations):
+                points[code] = LOCATION_MATCH_POINTS
+            elif accepts_remote and "remote" in location:
+                points[code] = REMOTE_LOCATION_POINTS
+        return points
+
+
+# Process pool workers for MatchingAgent.match_many: each worker receives the
+# scorer once (through the pool initializer) rather than with every chunk
+_worker_scorer: Optional[VectorizedScorer] = None
+
+
+def init_worker(scorer: VectorizedScorer) -> None:
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def top_many_in_worker(seekers: Sequence[JobSeekerProfile], limit: int, min_score: int) -> List[List[Tuple[int, str]]]:
+    return _worker_scorer.top_many(seekers, limit, min_score)
@@ -37,6 +37,32 @@ async def startup_event():
         print("Database initialized")
     except Exception as e:
         print(f"Database initialization error: {e}")
+    try:
+        # Start listening for job posts to push to matching seekers
+        from job_finder.job_alerts import get_job_alert_service
+        get_job_alert_service()
+    except Exception as e:
+        print(f"Job alerts initialization error: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled database connections and worker processes"""
+    try:
+        from database import async_engine, engine
+        # Pooled aiosqlite connections each hold a thread that keeps the process alive
+        if async_engine is not None:
+            await async_engine.dispose()
+        engine.dispose()
+    except Exception as e:
+        print(f"Database shutdown error: {e}")
+    try:
+        # Stop the batch matching worker processes
+        from job_finder import routes as job_finder_routes
+        if job_finder_routes.orchestrator is not None:
+            job_finder_routes.orchestrator.matching_agent.close()
+    except Exception as e:
+        print(f"Job Finder shutdown error: {e}")
 
 
 @app.get("/")
@@ -84,3 +84,10 @@ class RegenerateSectionRequest(BaseModel):
     session_id: str
     section_type: str  # "summary", "responsibilities", "requirements", "skills", "hashtags", "keywords"
 
+
+class RegenerateSectionsRequest(BaseModel):
+    """Request to regenerate several sections at once"""
+    session_id: str
+    section_types: List[str]
+    reformat: bool = False  # Re-run the whole-post Formatter pass afterwards
+
@@ -3,15 +3,38 @@ Repository layer for database operations
 Phase 4: Data Model
 """
 
+from contextlib import asynccontextmanager, contextmanager
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import AsyncIterator, Callable, Iterator, List, Optional
 from datetime import datetime
 try:
-    from .db_models import User, JobPost, ChatSession
-    from .models import JobPost as JobPostPydantic, User as UserPydantic, ChatMessage
+    from .db_models import User, JobPost, ChatSession, ChatMessage
+    from .models import JobPost as JobPostPydantic, User as UserPydantic
 except ImportError:
-    from db_models import User, JobPost, ChatSession
-    from models import JobPost as JobPostPydantic, User as UserPydantic, ChatMessage
+    from db_models import User, JobPost, ChatSession, ChatMessage
+    from models import JobPost as JobPostPydantic, User as UserPydantic
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Group repository writes into one transaction
+    
+    Use the commit=False / flush-only repository methods inside the block;
+    everything is committed once on exit and rolled back on error.
+    
+        with unit_of_work(db):
+            post = JobPostRepository.create(db, data, commit=False)
+            ChatSessionRepository.update_instance(db, chat_session, {"job_post_id": post.id})
+    """
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
 
 class UserRepository:
@@ -42,17 +65,54 @@ class UserRepository:
         return db.query(User).offset(skip).limit(limit).all()
 
 
+# Session.info key of the job post notifications waiting for the transaction to commit
+PENDING_JOB_POST_EVENTS = "pending_job_post_events"
+
+
 class JobPostRepository:
     """Repository for JobPost operations"""
     
+    # Callbacks run as listener(event, post_id) once a write has committed,
+    # with event "create", "update" or "delete" - used to keep derived caches
+    # current. Writes that are rolled back notify nobody.
+    _listeners: List[Callable[[str, Optional[int]], None]] = []
+    
     @staticmethod
-    def create(db: Session, job_post_data: dict) -> JobPost:
-        """Create a new job post"""
+    def add_listener(listener: Callable[[str, Optional[int]], None]) -> None:
+        """Register a callback for job post writes"""
+        if listener not in JobPostRepository._listeners:
+            JobPostRepository._listeners.append(listener)
+    
+    @staticmethod
+    def remove_listener(listener: Callable[[str, Optional[int]], None]) -> None:
+        """Unregister a write callback"""
+        if listener in JobPostRepository._listeners:
+            JobPostRepository._listeners.remove(listener)
+    
+    @staticmethod
+    def _notify(event: str, post_id: Optional[int]) -> None:
+        for listener in list(JobPostRepository._listeners):
+            try:
+                listener(event, post_id)
+            except Exception as e:
+                print(f"ERROR in JobPostRepository listener: {e}")
+    
+    @staticmethod
+    def _notify_on_commit(db, event: str, post_id: Optional[int]) -> None:
+        """Queue a notification on db (a Session or AsyncSession) for after its commit"""
+        db.info.setdefault(PENDING_JOB_POST_EVENTS, []).append((event, post_id))
+    
+    @staticmethod
+    def create(db: Session, job_post_data: dict, commit: bool = True) -> JobPost:
+        """Create a new job post (commit=False only flushes, e.g. inside unit_of_work)"""
         job_post = JobPost(**job_post_data)
         job_post.updated_at = datetime.utcnow()
         db.add(job_post)
-        db.commit()
-        db.refresh(job_post)
+        db.flush()
+        JobPostRepository._notify_on_commit(db, "create", job_post.id)
+        if commit:
+            db.commit()
+            db.refresh(job_post)
         return job_post
     
     @staticmethod
@@ -73,6 +133,7 @@ class JobPostRepository:
             for key, value in job_post_data.items():
                 setattr(job_post, key, value)
             job_post.updated_at = datetime.utcnow()
+            JobPostRepository._notify_on_commit(db, "update", job_post.id)
             db.commit()
             db.refresh(job_post)
         return job_post
@@ -83,6 +144,7 @@ class JobPostRepository:
         job_post = db.query(JobPost).filter(JobPost.id == post_id).first()
         if job_post:
             db.delete(job_post)
+            JobPostRepository._notify_on_commit(db, "delete", post_id)
             db.commit()
             return True
         return False
@@ -93,16 +155,31 @@ class JobPostRepository:
         return db.query(JobPost).offset(skip).limit(limit).all()
 
 
+# AsyncSession runs its commits on a sync Session, so these cover both
+@event.listens_for(Session, "after_commit")
+def _notify_committed_job_posts(session: Session) -> None:
+    for event_name, post_id in session.info.pop(PENDING_JOB_POST_EVENTS, []):
+        JobPostRepository._notify(event_name, post_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_job_posts(session: Session) -> None:
+    session.info.pop(PENDING_JOB_POST_EVENTS, None)
+
+
 class ChatSessionRepository:
     """Repository for ChatSession operations"""
     
     @staticmethod
-    def create(db: Session, session_data: dict) -> ChatSession:
-        """Create a new chat session"""
+    def create(db: Session, session_data: dict, commit: bool = True) -> ChatSession:
+        """Create a new chat session (commit=False only flushes, e.g. inside unit_of_work)"""
         chat_session = ChatSession(**session_data)
         db.add(chat_session)
-        db.commit()
-        db.refresh(chat_session)
+        if commit:
+            db.commit()
+            db.refresh(chat_session)
+        else:
+            db.flush()
         return chat_session
     
     @staticmethod
@@ -122,14 +199,27 @@ class ChatSessionRepository:
             db.refresh(chat_session)
         return chat_session
     
+    @staticmethod
+    def update_instance(db: Session, chat_session: ChatSession, session_data: dict, commit: bool = False) -> ChatSession:
+        """
+        Update a chat session row already loaded in this db session
+        
+        Skips the SELECT done by update(); by default only marks the row dirty
+        so the change is written with the surrounding unit_of_work.
+        """
+        for key, value in session_data.items():
+            setattr(chat_session, key, value)
+        chat_session.updated_at = datetime.utcnow()
+        if commit:
+            db.commit()
+        return chat_session
+    
     @staticmethod
     def add_message(db: Session, session_id: str, message: dict) -> Optional[ChatSession]:
-        """Add a message to the chat session"""
+        """Add a message to the chat session (appended to chat_messages)"""
         chat_session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
         if chat_session:
-            if chat_session.messages is None:
-                chat_session.messages = []
-            chat_session.messages.append(message)
+            ChatMessageRepository.append(db, chat_session, [message])
             chat_session.updated_at = datetime.utcnow()
             db.commit()
             db.refresh(chat_session)
@@ -145,12 +235,347 @@ class ChatSessionRepository:
         """Delete a chat session"""
         chat_session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
         if chat_session:
+            db.query(ChatMessage).filter(ChatMessage.session_id == session_id).delete(synchronize_session=False)
             db.delete(chat_session)
             db.commit()
             return True
         return False
 
 
+class ChatMessageRepository:
+    """
+    Repository for ChatMessage operations
+    
+    Messages are stored one row per message keyed by (session_id, seq), so a
+    turn appends rows instead of rewriting the session's message list, and
+    readers can fetch just the most recent window. Sessions created before the
+    chat_messages table still keep their messages in ChatSession.messages;
+    get_messages() reads those transparently and append() moves them over
+    the first time the session grows.
+    
+    append() claims the session row (an UPDATE of its updated_at) before
+    reading max(seq), so concurrent appends to one session queue on that
+    row's write lock until the earlier transaction commits, and each reads
+    the sequence the other left instead of both taking the same seq.
+    """
+    
+    @staticmethod
+    def append(db: Session, chat_session: ChatSession, messages: List[dict]) -> int:
+        """
+        Add messages after the last stored one (flushed, not committed)
+        
+        Returns:
+            Number of messages in the session afterwards
+        """
+        session_id = chat_session.session_id
+        db.execute(ChatMessageRepository._claim_session(session_id))
+        last_seq = db.query(func.max(ChatMessage.seq)).filter(ChatMessage.session_id == session_id).scalar()
+        next_seq = last_seq + 1 if last_seq is not None else 0
+        
+        if last_seq is None and chat_session.messages:
+            # One-time move of a legacy JSON message list into chat_messages
+            messages = [m for m in chat_session.messages if isinstance(m, dict)] + list(messages)
+            chat_session.messages = []
+        
+        for message in messages:
+            db.add(ChatMessageRepository._to_row(session_id, next_seq, message))
+            next_seq += 1
+        db.flush()
+        return next_seq
+    
+    @staticmethod
+    def get_messages(db: Session, chat_session: ChatSession, limit: Optional[int] = None) -> List[dict]:
+        """
+        Messages of a session in conversation order, as role/content/timestamp dicts
+        
+        Args:
+            chat_session: The session row (its legacy JSON list is used when no rows exist)
+            limit: Only return the last `limit` messages
+        """
+        query = db.query(ChatMessage).filter(ChatMessage.session_id == chat_session.session_id)
+        if limit:
+            rows = query.order_by(ChatMessage.seq.desc()).limit(limit).all()
+            rows.reverse()
+        else:
+            rows = query.order_by(ChatMessage.seq).all()
+        
+        if not rows:
+            legacy = chat_session.messages if isinstance(chat_session.messages, list) else []
+            return legacy[-limit:] if limit else list(legacy)
+        
+        return [
+            {
+                "role": row.role,
+                "content": row.content,
+                "timestamp": row.created_at.isoformat() if row.created_at else None
+            }
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _claim_session(session_id: str):
+        """UPDATE taking the session row's write lock until commit (see the class docstring)"""
+        return (
+            update(ChatSession)
+            .where(ChatSession.session_id == session_id)
+            .values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session="evaluate")
+        )
+    
+    @staticmethod
+    def _to_row(session_id: str, seq: int, message: dict) -> ChatMessage:
+        """Build a ChatMessage row from a role/content/timestamp dict"""
+        timestamp = message.get("timestamp")
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp)
+            except ValueError:
+                timestamp = None
+        return ChatMessage(
+            session_id=session_id,
+            seq=seq,
+            role=message.get("role", "user"),
+            content=message.get("content", "") or "",
+            created_at=timestamp or datetime.utcnow()
+        )
+
+
+# Async repositories - the same operations for an AsyncSession (get_async_db).
+# Rows come back fully loaded (AsyncSessionLocal does not expire on commit);
+# relationships are never lazy-loaded, read the foreign key columns instead.
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """unit_of_work for an AsyncSession: one commit on exit, rollback on error"""
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+
+class AsyncUserRepository:
+    """Async repository for User operations"""
+    
+    @staticmethod
+    async def create(db: AsyncSession, user_data: dict) -> User:
+        """Create a new user"""
+        user = User(**user_data)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID"""
+        return await db.get(User, user_id)
+    
+    @staticmethod
+    async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        """Get user by email"""
+        return await db.scalar(select(User).where(User.email == email).limit(1))
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+        """Get all users with pagination"""
+        return list(await db.scalars(select(User).offset(skip).limit(limit)))
+
+
+class AsyncJobPostRepository:
+    """
+    Async repository for JobPost operations
+    Writes notify the JobPostRepository listeners on commit like the sync methods do.
+    """
+    
+    @staticmethod
+    async def create(db: AsyncSession, job_post_data: dict, commit: bool = True) -> JobPost:
+        """Create a new job post (commit=False only flushes, e.g. inside async_unit_of_work)"""
+        job_post = JobPost(**job_post_data)
+        job_post.updated_at = datetime.utcnow()
+        db.add(job_post)
+        await db.flush()
+        JobPostRepository._notify_on_commit(db, "create", job_post.id)
+        if commit:
+            await db.commit()
+            await db.refresh(job_post)
+        return job_post
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, post_id: int) -> Optional[JobPost]:
+        """Get job post by ID"""
+        return await db.get(JobPost, post_id)
+    
+    @staticmethod
+    async def get_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[JobPost]:
+        """Get all job posts for a user"""
+        query = select(JobPost).where(JobPost.user_id == user_id).offset(skip).limit(limit)
+        return list(await db.scalars(query))
+    
+    @staticmethod
+    async def update(db: AsyncSession, post_id: int, job_post_data: dict) -> Optional[JobPost]:
+        """Update a job post"""
+        job_post = await db.get(JobPost, post_id)
+        if job_post:
+            for key, value in job_post_data.items():
+                setattr(job_post, key, value)
+            job_post.updated_at = datetime.utcnow()
+            JobPostRepository._notify_on_commit(db, "update", job_post.id)
+            await db.commit()
+            await db.refresh(job_post)
+        return job_post
+    
+    @staticmethod
+    async def delete(db: AsyncSession, post_id: int) -> bool:
+        """Delete a job post"""
+        job_post = await db.get(JobPost, post_id)
+        if job_post:
+            await db.delete(job_post)
+            JobPostRepository._notify_on_commit(db, "delete", post_id)
+            await db.commit()
+            return True
+        return False
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[JobPost]:
+        """Get all job posts with pagination"""
+        return list(await db.scalars(select(JobPost).offset(skip).limit(limit)))
+
+
+class AsyncChatSessionRepository:
+    """Async repository for ChatSession operations"""
+    
+    @staticmethod
+    async def create(db: AsyncSession, session_data: dict, commit: bool = True) -> ChatSession:
+        """Create a new chat session (commit=False only flushes, e.g. inside async_unit_of_work)"""
+        chat_session = ChatSession(**session_data)
+        db.add(chat_session)
+        if commit:
+            await db.commit()
+            await db.refresh(chat_session)
+        else:
+            await db.flush()
+        return chat_session
+    
+    @staticmethod
+    async def get_by_session_id(db: AsyncSession, session_id: str) -> Optional[ChatSession]:
+        """Get chat session by session_id"""
+        return await db.scalar(select(ChatSession).where(ChatSession.session_id == session_id).limit(1))
+    
+    @staticmethod
+    async def update(db: AsyncSession, session_id: str, session_data: dict) -> Optional[ChatSession]:
+        """Update a chat session"""
+        chat_session = await AsyncChatSessionRepository.get_by_session_id(db, session_id)
+        if chat_session:
+            await AsyncChatSessionRepository.update_instance(db, chat_session, session_data, commit=True)
+            await db.refresh(chat_session)
+        return chat_session
+    
+    @staticmethod
+    async def update_instance(
+        db: AsyncSession, chat_session: ChatSession, session_data: dict, commit: bool = False
+    ) -> ChatSession:
+        """
+        Update a chat session row already loaded in this db session
+        
+        By default only marks the row dirty so the change is written with the
+        surrounding async_unit_of_work.
+        """
+        for key, value in session_data.items():
+            setattr(chat_session, key, value)
+        chat_session.updated_at = datetime.utcnow()
+        if commit:
+            await db.commit()
+        return chat_session
+    
+    @staticmethod
+    async def add_message(db: AsyncSession, session_id: str, message: dict) -> Optional[ChatSession]:
+        """Add a message to the chat session (appended to chat_messages)"""
+        chat_session = await AsyncChatSessionRepository.get_by_session_id(db, session_id)
+        if chat_session:
+            await AsyncChatMessageRepository.append(db, chat_session, [message])
+            chat_session.updated_at = datetime.utcnow()
+            await db.commit()
+            await db.refresh(chat_session)
+        return chat_session
+    
+    @staticmethod
+    async def get_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[ChatSession]:
+        """Get all chat sessions for a user"""
+        query = select(ChatSession).where(ChatSession.user_id == user_id).offset(skip).limit(limit)
+        return list(await db.scalars(query))
+    
+    @staticmethod
+    async def delete(db: AsyncSession, session_id: str) -> bool:
+        """Delete a chat session"""
+        chat_session = await AsyncChatSessionRepository.get_by_session_id(db, session_id)
+        if chat_session:
+            await db.execute(delete(ChatMessage).where(ChatMessage.session_id == session_id))
+            await db.delete(chat_session)
+            await db.commit()
+            return True
+        return False
+
+
+class AsyncChatMessageRepository:
+    """Async repository for ChatMessage operations (see ChatMessageRepository)"""
+    
+    @staticmethod
+    async def append(db: AsyncSession, chat_session: ChatSession, messages: List[dict]) -> int:
+        """
+        Add messages after the last stored one (flushed, not committed)
+        
+        Returns:
+            Number of messages in the session afterwards
+        """
+        session_id = chat_session.session_id
+        await db.execute(ChatMessageRepository._claim_session(session_id))
+        last_seq = await db.scalar(select(func.max(ChatMessage.seq)).where(ChatMessage.session_id == session_id))
+        next_seq = last_seq + 1 if last_seq is not None else 0
+        
+        if last_seq is None and chat_session.messages:
+            # One-time move of a legacy JSON message list into chat_messages
+            messages = [m for m in chat_session.messages if isinstance(m, dict)] + list(messages)
+            chat_session.messages = []
+        
+        for message in messages:
+            db.add(ChatMessageRepository._to_row(session_id, next_seq, message))
+            next_seq += 1
+        await db.flush()
+        return next_seq
+    
+    @staticmethod
+    async def get_messages(db: AsyncSession, chat_session: ChatSession, limit: Optional[int] = None) -> List[dict]:
+        """
+        Messages of a session in conversation order, as role/content/timestamp dicts
+        
+        Args:
+            chat_session: The session row (its legacy JSON list is used when no rows exist)
+            limit: Only return the last `limit` messages
+        """
+        query = select(ChatMessage).where(ChatMessage.session_id == chat_session.session_id)
+        if limit:
+            rows = list(await db.scalars(query.order_by(ChatMessage.seq.desc()).limit(limit)))
+            rows.reverse()
+        else:
+            rows = list(await db.scalars(query.order_by(ChatMessage.seq)))
+        
+        if not rows:
+            legacy = chat_session.messages if isinstance(chat_session.messages, list) else []
+            return legacy[-limit:] if limit else list(legacy)
+        
+        return [
+            {
+                "role": row.role,
+                "content": row.content,
+                "timestamp": row.created_at.isoformat() if row.created_at else None
+            }
+            for row in rows
+        ]
+
+
 def db_to_pydantic_job_post(db_job_post: JobPost) -> JobPostPydantic:
     """Convert SQLAlchemy JobPost to Pydantic JobPost"""
     return JobPostPydantic(
@@ -12,6 +12,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from concurrency import run_blocking
+
 try:
     from integrations.rolevate import RolevateGraphQLClient, format_job_for_rolevate
 except ImportError:
@@ -19,14 +21,15 @@ except ImportError:
 
 router = APIRouter()
 
-# Initialize Rolevate client
+# Initialize Rolevate client. It makes blocking `requests` calls, which the
+# routes run through run_blocking so a slow response never stalls the event loop
 rolevate_client = RolevateGraphQLClient()
 
 
 @router.get("/rolevate/health")
 async def check_rolevate_health():
     """Check health of Rolevate API"""
-    result = rolevate_client.get_health()
+    result = await run_blocking(rolevate_client.get_health)
     
     if "errors" in result:
         raise HTTPException(
@@ -49,7 +52,7 @@ async def get_rolevate_companies(limit: int = Query(100, ge=1, le=1000), offset:
         limit: Number of companies to return (max 1000)
         offset: Pagination offset
     """
-    result = rolevate_client.get_all_companies(limit=limit, offset=offset)
+    result = await run_blocking(rolevate_client.get_all_companies, limit=limit, offset=offset)
     
     if "errors" in result:
         raise HTTPException(
@@ -72,7 +75,7 @@ async def get_rolevate_company(slug: str):
     Args:
         slug: Company slug
     """
-    result = rolevate_client.get_company_by_slug(slug)
+    result = await run_blocking(rolevate_client.get_company_by_slug, slug)
     
     if "errors" in result:
         raise HTTPException(
@@ -101,7 +104,7 @@ async def search_rolevate_jobs(
         limit: Number of results
         offset: Pagination offset
     """
-    result = rolevate_client.search_jobs(query=query, limit=limit, offset=offset)
+    result = await run_blocking(rolevate_client.search_jobs, query=query, limit=limit, offset=offset)
     
     if "errors" in result:
         raise HTTPException(
@@ -125,7 +128,7 @@ async def get_company_rolevate_jobs(company_id: str):
     Args:
         company_id: Rolevate company ID (UUID)
     """
-    result = rolevate_client.get_company_jobs(company_id)
+    result = await run_blocking(rolevate_client.get_company_jobs, company_id)
     
     if "errors" in result:
         raise HTTPException(
@@ -147,7 +150,7 @@ async def get_rolevate_job(job_id: str):
     Args:
         job_id: Rolevate job ID (UUID)
     """
-    result = rolevate_client.get_job_by_id(job_id)
+    result = await run_blocking(rolevate_client.get_job_by_id, job_id)
     
     if "errors" in result:
         raise HTTPException(
@@ -170,7 +173,7 @@ async def check_email_on_rolevate(email: str = Query(..., min_length=5)):
     Args:
         email: Email address to check
     """
-    result = rolevate_client.check_email_exists(email)
+    result = await run_blocking(rolevate_client.check_email_exists, email)
     
     if "errors" in result:
         raise HTTPException(
@@ -187,7 +190,7 @@ async def get_rolevate_schema():
     Get GraphQL schema information from Rolevate
     Shows all available queries and mutations
     """
-    result = rolevate_client.get_schema_info()
+    result = await run_blocking(rolevate_client.get_schema_info)
     
     if "errors" in result:
         raise HTTPException(
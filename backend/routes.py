@@ -3,37 +3,46 @@ API Routes for HR Hiring Assistant
 Phase 5: Backend Structure (FastAPI)
 """
 
+import json
+import os
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional
 from datetime import datetime
 
 try:
-    from .database import get_db
+    from .database import get_async_db, AsyncSessionLocal
     from .models import (
         StartChatRequest, SendMessageRequest, PostPreviewResponse,
-        SavePostRequest, RegenerateSectionRequest, JobPost, ChatMessage
+        SavePostRequest, RegenerateSectionRequest, RegenerateSectionsRequest,
+        JobPost, ChatMessage
     )
     from .repositories import (
-        ChatSessionRepository, JobPostRepository, UserRepository,
-        db_to_pydantic_job_post
+        AsyncChatSessionRepository, AsyncChatMessageRepository, AsyncJobPostRepository,
+        db_to_pydantic_job_post, async_unit_of_work
     )
     from .agents.orchestrator import AgentOrchestrator
 except ImportError:
-    from database import get_db
+    from database import get_async_db, AsyncSessionLocal
     from models import (
         StartChatRequest, SendMessageRequest, PostPreviewResponse,
-        SavePostRequest, RegenerateSectionRequest, JobPost, ChatMessage
+        SavePostRequest, RegenerateSectionRequest, RegenerateSectionsRequest,
+        JobPost, ChatMessage
     )
     from repositories import (
-        ChatSessionRepository, JobPostRepository, UserRepository,
-        db_to_pydantic_job_post
+        AsyncChatSessionRepository, AsyncChatMessageRepository, AsyncJobPostRepository,
+        db_to_pydantic_job_post, async_unit_of_work
     )
     from agents.orchestrator import AgentOrchestrator
 
 router = APIRouter()
 
+# Messages of recent context sent with each turn once the extracted job info
+# carries the long-term state (0 = whole conversation)
+CHAT_HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", "40"))
+
 # Global orchestrator instance (in production, use dependency injection)
 orchestrator = None
 
@@ -55,33 +64,250 @@ def get_orchestrator():
     return orchestrator
 
 
-@router.post("/start-chat", response_model=dict)
-async def start_chat(request: StartChatRequest, db: Session = Depends(get_db)):
+def get_previous_job_info(chat_session) -> Optional[dict]:
     """
-    Start a new job creation session
-    Creates a new chat session and returns the initial AI question
+    Job info extracted on the previous turn, or None when it has to be rebuilt
+    from the full conversation (rows written before job_info held the
+    extraction stored the post preview there instead).
+    Always read from the committed ChatSession row: orchestrator state is
+    per worker and may predate turns saved elsewhere.
     """
-    # Get orchestrator (lazy-loaded)
-    orch = get_orchestrator()
+    job_info = chat_session.job_info
+    if not isinstance(job_info, dict):
+        return None
+    if "title" in job_info and "job_title" not in job_info:
+        return None
+    return job_info
+
+
+def session_version(chat_session) -> Optional[str]:
+    """Version of a saved chat session for orchestrator state (changes with every saved turn)"""
+    return chat_session.updated_at.isoformat() if chat_session.updated_at else None
+
+
+async def load_conversation_history(db: AsyncSession, chat_session, previous_job_info: Optional[dict] = None) -> List[dict]:
+    """
+    Convert the stored chat messages to the role/content dicts the orchestrator expects
     
-    # Generate unique session ID
-    session_id = str(uuid.uuid4())
+    Only the last CHAT_HISTORY_WINDOW messages are read when previous_job_info is
+    known; without it the job info is rebuilt from the whole conversation.
+    """
+    conversation_history = []
+    limit = CHAT_HISTORY_WINDOW if previous_job_info else None
+    messages = await AsyncChatMessageRepository.get_messages(db, chat_session, limit=limit)
+    
+    for i, msg in enumerate(messages):
+        if isinstance(msg, dict):
+            conversation_history.append({
+                "role": msg.get("role", "user"),
+                "content": msg.get("content", "")
+            })
+        else:
+            print(f"DEBUG: Skipping message {i} - not a dict: {type(msg)}")
+    return conversation_history
+
+
+async def save_turn(db: AsyncSession, chat_session, user_text: str, orchestrator_result: dict) -> Optional[dict]:
+    """
+    Persist one completed turn: append the messages, store the extracted job info,
+    and save + link the job post when the interview is complete.
+    Everything is written in a single transaction.
+    
+    Returns:
+        The job post dict from the orchestrator result (live preview or final post)
+    """
+    # Add user message to conversation
+    user_message = {
+        "role": "user",
+        "content": user_text,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    
+    # Add assistant response to conversation
+    assistant_message = {
+        "role": "assistant",
+        "content": orchestrator_result["response"],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    
+    # Persist the extracted job info so the next turn only extracts the delta
+    update_data = {
+        "is_complete": 1 if orchestrator_result["is_complete"] else 0,
+        "job_info": orchestrator_result.get("job_info") or {}
+    }
+    
+    # If job post was created, save it
+    job_post_data = None
+    if orchestrator_result.get("job_post"):
+        job_post_data = orchestrator_result["job_post"]
+        # Convert Pydantic model to dict if needed
+        if hasattr(job_post_data, 'model_dump'):
+            job_post_data = job_post_data.model_dump()
+        elif hasattr(job_post_data, 'dict'):
+            job_post_data = job_post_data.dict()
+    
+    async with async_unit_of_work(db):
+        # Append the turn to chat_messages (the session's earlier messages are not rewritten)
+        await AsyncChatMessageRepository.append(db, chat_session, [user_message, assistant_message])
+        
+        # If interview is complete and job post was created, save it to database
+        if orchestrator_result["is_complete"] and job_post_data:
+            # Create JobPost in database (flushed so its id can be linked)
+            job_post_db = await AsyncJobPostRepository.create(db, {
+                "title": job_post_data.get("title"),
+                "company": job_post_data.get("company"),
+                "location": job_post_data.get("location"),
+                "workplace_type": job_post_data.get("workplace_type"),
+                "job_type": job_post_data.get("job_type"),
+                "summary": job_post_data.get("summary"),
+                "culture_and_team": job_post_data.get("culture_and_team"),
+                "responsibilities": job_post_data.get("responsibilities", []),
+                "requirements": job_post_data.get("requirements", []),
+                "skills": job_post_data.get("skills", []),
+                "keywords": job_post_data.get("keywords", []),
+                "hashtags": job_post_data.get("hashtags", []),
+                "tone_type": job_post_data.get("tone_type"),
+                "user_id": chat_session.user_id
+            }, commit=False)
+            
+            # Link job post to chat session
+            update_data["job_post_id"] = job_post_db.id
+        
+        await AsyncChatSessionRepository.update_instance(db, chat_session, update_data)
+    
+    return job_post_data
+
+
+async def load_turn_context(orch: AgentOrchestrator, db: AsyncSession, session_id: str):
+    """
+    Chat session row, previous job info and conversation history for a new turn
+    
+    Raises:
+        HTTPException 404 when the chat session does not exist
+    """
+    chat_session = await AsyncChatSessionRepository.get_by_session_id(db, session_id)
+    
+    if not chat_session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    
+    previous_job_info = get_previous_job_info(chat_session)
+    conversation_history = await load_conversation_history(db, chat_session, previous_job_info)
+    # End the read transaction so its connection is not held while the LLM runs
+    await db.commit()
+    return chat_session, previous_job_info, conversation_history
+
+
+async def save_streamed_turn(
+    orch: AgentOrchestrator, session_id: str, user_text: str, orchestrator_result: dict
+) -> Optional[dict]:
+    """
+    save_turn for a streamed reply, then record the orchestrator state
+    The request-scoped session is not guaranteed to outlive the response, so this opens its own.
+    
+    Raises:
+        HTTPException 404 when the chat session was deleted while the reply streamed
+    """
+    async with AsyncSessionLocal() as stream_db:
+        chat_session = await AsyncChatSessionRepository.get_by_session_id(stream_db, session_id)
+        if not chat_session:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+        job_post_data = await save_turn(stream_db, chat_session, user_text, orchestrator_result)
+    orch.record_turn(session_id, orchestrator_result, session_version(chat_session))
+    return job_post_data
+
+
+async def load_session_job_post(db: AsyncSession, session_id: str) -> JobPost:
+    """
+    The job post linked to a chat session
+    
+    Raises:
+        HTTPException 404 without the session or post, 400 when no post is linked yet
+    """
+    chat_session = await AsyncChatSessionRepository.get_by_session_id(db, session_id)
+    
+    if not chat_session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    
+    if not chat_session.job_post_id:
+        raise HTTPException(status_code=400, detail="No job post found in this session")
+    
+    job_post_db = await AsyncJobPostRepository.get_by_id(db, chat_session.job_post_id)
+    
+    if not job_post_db:
+        raise HTTPException(status_code=404, detail="Job post not found")
     
+    job_post = db_to_pydantic_job_post(job_post_db)
+    # End the read transaction so its connection is not held while the LLM runs
+    await db.commit()
+    return job_post
+
+
+async def update_job_post(db: AsyncSession, post_id: int, job_post) -> JobPost:
+    """Write the editable fields of job_post to the stored post and return it"""
+    return db_to_pydantic_job_post(await AsyncJobPostRepository.update(db, post_id, job_post_update_data(job_post)))
+
+
+def job_post_update_data(job_post) -> dict:
+    """Editable post fields for JobPostRepository.update"""
+    return {
+        "title": job_post.title,
+        "summary": job_post.summary,
+        "culture_and_team": job_post.culture_and_team,
+        "responsibilities": job_post.responsibilities,
+        "requirements": job_post.requirements,
+        "skills": job_post.skills,
+        "keywords": job_post.keywords,
+        "hashtags": job_post.hashtags,
+        "tone_type": job_post.tone_type
+    }
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def start_chat_session(orch: AgentOrchestrator, db: AsyncSession, session_id: str, user_id: Optional[int]) -> dict:
+    """
+    Start the orchestrator session and store the chat session with its first AI question
+    
+    Returns:
+        The orchestrator's start_session result
+    """
     # Start session with orchestrator
     orchestrator_result = orch.start_session(session_id)
     
     # Create chat session in database
     chat_session_data = {
         "session_id": session_id,
-        "messages": [
-            {"role": "assistant", "content": orchestrator_result["response"], "timestamp": datetime.utcnow().isoformat()}
-        ],
+        "messages": [],
         "job_info": {},
         "is_complete": 0,  # False
-        "user_id": request.user_id
+        "user_id": user_id
     }
     
-    ChatSessionRepository.create(db, chat_session_data)
+    async with async_unit_of_work(db):
+        chat_session = await AsyncChatSessionRepository.create(db, chat_session_data, commit=False)
+        await AsyncChatMessageRepository.append(db, chat_session, [
+            {"role": "assistant", "content": orchestrator_result["response"], "timestamp": datetime.utcnow().isoformat()}
+        ])
+    
+    return orchestrator_result
+
+
+@router.post("/start-chat", response_model=dict)
+async def start_chat(request: StartChatRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Start a new job creation session
+    Creates a new chat session and returns the initial AI question
+    """
+    # Get orchestrator (lazy-loaded)
+    orch = get_orchestrator()
+    
+    # Generate unique session ID
+    session_id = str(uuid.uuid4())
+    
+    orchestrator_result = await start_chat_session(orch, db, session_id, request.user_id)
     
     return {
         "session_id": session_id,
@@ -92,7 +318,7 @@ async def start_chat(request: StartChatRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/send-message", response_model=dict)
-async def send_message(request: SendMessageRequest, db: Session = Depends(get_db)):
+async def send_message(request: SendMessageRequest, db: AsyncSession = Depends(get_async_db)):
     """
     HR sends message → AI replies → returns updated preview
     Processes the user's message through the AI agents and returns the response
@@ -103,107 +329,25 @@ async def send_message(request: SendMessageRequest, db: Session = Depends(get_db
         # Get orchestrator (lazy-loaded)
         orch = get_orchestrator()
         
-        # Get or create chat session
-        chat_session = ChatSessionRepository.get_by_session_id(db, request.session_id)
-        
-        if not chat_session:
-            raise HTTPException(status_code=404, detail="Chat session not found")
-        
-        # Convert stored messages to dict format for orchestrator
-        conversation_history = []
-        if chat_session.messages:
-            print(f"DEBUG: chat_session.messages type={type(chat_session.messages)}, length={len(chat_session.messages)}")
-            
-            # Ensure messages is a list
-            messages = chat_session.messages if isinstance(chat_session.messages, list) else []
-            
-            for i, msg in enumerate(messages):
-                try:
-                    if isinstance(msg, dict):
-                        conversation_history.append({
-                            "role": msg.get("role", "user"),
-                            "content": msg.get("content", "")
-                        })
-                    else:
-                        print(f"DEBUG: Skipping message {i} - not a dict: {type(msg)}")
-                except Exception as e:
-                    print(f"DEBUG: Error processing message {i}: {e}")
-        
+        # Load the chat session and its messages in dict format for the orchestrator
+        chat_session, previous_job_info, conversation_history = await load_turn_context(
+            orch, db, request.session_id
+        )
         print(f"DEBUG: conversation_history length={len(conversation_history)}")
         
         # Process message through orchestrator
         print(f"DEBUG: Calling orchestrator.process_message...")
-        orchestrator_result = orch.process_message(
+        orchestrator_result = await orch.aprocess_message(
             request.session_id,
             request.message,
-            conversation_history
+            conversation_history,
+            previous_job_info
         )
         print(f"DEBUG: orchestrator.process_message returned successfully")
         
-        # Add user message to conversation
-        user_message = {
-            "role": "user",
-            "content": request.message,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        # Add assistant response to conversation
-        assistant_message = {
-            "role": "assistant",
-            "content": orchestrator_result["response"],
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        # Update chat session in database
-        updated_messages = (chat_session.messages or []) + [user_message, assistant_message]
-        
-        # Get job info from orchestrator's current session
-        job_info = {}
-        if (orch.current_session and 
-            orch.current_session.get("session_id") == request.session_id):
-            job_info = orch.current_session.get("job_info", {})
-        
-        update_data = {
-            "messages": updated_messages,
-            "is_complete": 1 if orchestrator_result["is_complete"] else 0,
-            "job_info": job_info
-        }
-        
-        # If job post was created, save it
-        job_post_data = None
-        if orchestrator_result.get("job_post"):
-            job_post_data = orchestrator_result["job_post"]
-            # Convert Pydantic model to dict if needed
-            if hasattr(job_post_data, 'model_dump'):
-                job_post_data = job_post_data.model_dump()
-            elif hasattr(job_post_data, 'dict'):
-                job_post_data = job_post_data.dict()
-            update_data["job_info"] = job_post_data
-        
-        ChatSessionRepository.update(db, request.session_id, update_data)
-        
-        # If interview is complete and job post was created, save it to database
-        if orchestrator_result["is_complete"] and job_post_data:
-            # Create JobPost in database
-            job_post_db = JobPostRepository.create(db, {
-                "title": job_post_data.get("title"),
-                "company": job_post_data.get("company"),
-                "location": job_post_data.get("location"),
-                "workplace_type": job_post_data.get("workplace_type"),
-                "job_type": job_post_data.get("job_type"),
-                "summary": job_post_data.get("summary"),
-                "culture_and_team": job_post_data.get("culture_and_team"),
-                "responsibilities": job_post_data.get("responsibilities", []),
-                "requirements": job_post_data.get("requirements", []),
-                "skills": job_post_data.get("skills", []),
-                "keywords": job_post_data.get("keywords", []),
-                "hashtags": job_post_data.get("hashtags", []),
-                "tone_type": job_post_data.get("tone_type"),
-                "user_id": chat_session.user_id
-            })
-            
-            # Link job post to chat session
-            ChatSessionRepository.update(db, request.session_id, {"job_post_id": job_post_db.id})
+        job_post_data = await save_turn(db, chat_session, request.message, orchestrator_result)
+        # Only a committed turn updates the orchestrator state
+        orch.record_turn(request.session_id, orchestrator_result, session_version(chat_session))
         
         return {
             "session_id": request.session_id,
@@ -219,16 +363,68 @@ async def send_message(request: SendMessageRequest, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/post-preview/{session_id}", response_model=PostPreviewResponse)
-async def get_post_preview(session_id: str, db: Session = Depends(get_db)):
+@router.post("/send-message/stream")
+async def send_message_stream(request: SendMessageRequest, db: AsyncSession = Depends(get_async_db)):
     """
-    Returns the current live-generated post
+    Streaming variant of /send-message (Server-Sent Events)
+    
+    Events:
+    - token: {"text": ...} interviewer reply text as it is generated
+    - preview: {"job_post": ...} live preview built from the extracted job info
+    - section: {"section": ..., "value": ...} each section of the post as it is composed
+    - done: same payload as /send-message, sent once the turn is saved
+    - error: {"detail": ...}, with "status_code" when the turn was rejected (404 if the session was deleted mid-stream)
     """
-    # Get orchestrator (lazy-loaded)
     orch = get_orchestrator()
     
+    _, previous_job_info, conversation_history = await load_turn_context(orch, db, request.session_id)
+    
+    async def event_stream():
+        try:
+            async for event in orch.astream_message(
+                request.session_id,
+                request.message,
+                conversation_history,
+                previous_job_info
+            ):
+                if event["event"] != "done":
+                    yield format_sse(event["event"], event["data"])
+                    continue
+                
+                orchestrator_result = event["data"]
+                job_post_data = await save_streamed_turn(orch, request.session_id, request.message, orchestrator_result)
+                
+                yield format_sse("done", {
+                    "session_id": request.session_id,
+                    "response": orchestrator_result["response"],
+                    "is_complete": orchestrator_result["is_complete"],
+                    "job_post": job_post_data
+                })
+        except HTTPException as e:
+            # The response has started, so the status goes in the event
+            yield format_sse("error", {"detail": e.detail, "status_code": e.status_code})
+        except Exception as e:
+            print(f"ERROR in send_message_stream: {e}")
+            import traceback
+            traceback.print_exc()
+            yield format_sse("error", {"detail": f"Internal server error: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def build_post_preview(orch: AgentOrchestrator, db: AsyncSession, session_id: str) -> PostPreviewResponse:
+    """
+    The stored job post of a chat session, else the orchestrator's live preview
+    
+    Raises:
+        HTTPException 404 when the chat session does not exist
+    """
     # Get chat session
-    chat_session = ChatSessionRepository.get_by_session_id(db, session_id)
+    chat_session = await AsyncChatSessionRepository.get_by_session_id(db, session_id)
     
     if not chat_session:
         raise HTTPException(status_code=404, detail="Chat session not found")
@@ -236,17 +432,17 @@ async def get_post_preview(session_id: str, db: Session = Depends(get_db)):
     # Get job post if it exists
     job_post = None
     if chat_session.job_post_id:
-        job_post_db = JobPostRepository.get_by_id(db, chat_session.job_post_id)
+        job_post_db = await AsyncJobPostRepository.get_by_id(db, chat_session.job_post_id)
         if job_post_db:
             job_post = db_to_pydantic_job_post(job_post_db)
     
     # If no job post in database, check if there's one in the orchestrator session
     if not job_post:
-        # Try to get from orchestrator's current session
-        if (orch.current_session and 
-            orch.current_session.get("session_id") == session_id and
-            orch.current_session.get("job_post")):
-            job_post_pydantic = orch.current_session["job_post"]
+        # Try to get the live preview from the orchestrator's session store,
+        # recorded for the turn the database row is at
+        session_state = orch.get_session(session_id, version=session_version(chat_session))
+        if session_state and session_state.get("job_post"):
+            job_post_pydantic = session_state["job_post"]
             if hasattr(job_post_pydantic, 'model_dump'):
                 job_post = JobPost(**job_post_pydantic.model_dump())
             elif hasattr(job_post_pydantic, 'dict'):
@@ -254,6 +450,12 @@ async def get_post_preview(session_id: str, db: Session = Depends(get_db)):
             else:
                 job_post = JobPost(**job_post_pydantic)
     
+    # Otherwise rebuild the live preview from the job info saved with the last turn
+    if not job_post:
+        job_info = get_previous_job_info(chat_session)
+        if job_info:
+            job_post = orch.build_live_preview(job_info)
+    
     # If still no job post, return empty structure
     if not job_post:
         job_post = JobPost(
@@ -271,13 +473,26 @@ async def get_post_preview(session_id: str, db: Session = Depends(get_db)):
     )
 
 
-@router.post("/save-post")
-async def save_post(request: SavePostRequest, db: Session = Depends(get_db)):
+@router.get("/post-preview/{session_id}", response_model=PostPreviewResponse)
+async def get_post_preview(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """
-    Saves the post to the dashboard
+    Returns the current live-generated post
+    """
+    # Get orchestrator (lazy-loaded)
+    orch = get_orchestrator()
+    
+    return await build_post_preview(orch, db, session_id)
+
+
+async def save_session_post(db: AsyncSession, session_id: str, user_id: int) -> JobPost:
+    """
+    Assign the job post of a chat session to the user
+    
+    Raises:
+        HTTPException 404 without the session or post, 400 when no post is linked yet
     """
     # Get chat session
-    chat_session = ChatSessionRepository.get_by_session_id(db, request.session_id)
+    chat_session = await AsyncChatSessionRepository.get_by_session_id(db, session_id)
     
     if not chat_session:
         raise HTTPException(status_code=404, detail="Chat session not found")
@@ -286,16 +501,24 @@ async def save_post(request: SavePostRequest, db: Session = Depends(get_db)):
     if not chat_session.job_post_id:
         raise HTTPException(status_code=400, detail="No job post found in this session")
     
-    job_post_db = JobPostRepository.get_by_id(db, chat_session.job_post_id)
+    job_post_db = await AsyncJobPostRepository.get_by_id(db, chat_session.job_post_id)
     
     if not job_post_db:
         raise HTTPException(status_code=404, detail="Job post not found")
     
     # Update user_id if needed
-    if job_post_db.user_id != request.user_id:
-        JobPostRepository.update(db, job_post_db.id, {"user_id": request.user_id})
+    if job_post_db.user_id != user_id:
+        await AsyncJobPostRepository.update(db, job_post_db.id, {"user_id": user_id})
     
-    job_post = db_to_pydantic_job_post(job_post_db)
+    return db_to_pydantic_job_post(job_post_db)
+
+
+@router.post("/save-post")
+async def save_post(request: SavePostRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Saves the post to the dashboard
+    """
+    job_post = await save_session_post(db, request.session_id, request.user_id)
     
     return {
         "message": "Post saved successfully",
@@ -304,11 +527,11 @@ async def save_post(request: SavePostRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/posts")
-async def get_posts(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_posts(user_id: int, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
     """
     Shows saved posts for the user
     """
-    job_posts = JobPostRepository.get_by_user(db, user_id, skip=skip, limit=limit)
+    job_posts = await AsyncJobPostRepository.get_by_user(db, user_id, skip=skip, limit=limit)
     
     return {
         "posts": [db_to_pydantic_job_post(post) for post in job_posts],
@@ -317,7 +540,7 @@ async def get_posts(user_id: int, skip: int = 0, limit: int = 100, db: Session =
 
 
 @router.post("/regenerate-section")
-async def regenerate_section(request: RegenerateSectionRequest, db: Session = Depends(get_db)):
+async def regenerate_section(request: RegenerateSectionRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Regenerates any section:
     - Responsibilities
@@ -329,47 +552,55 @@ async def regenerate_section(request: RegenerateSectionRequest, db: Session = De
     # Get orchestrator (lazy-loaded)
     orch = get_orchestrator()
     
-    # Get chat session
-    chat_session = ChatSessionRepository.get_by_session_id(db, request.session_id)
-    
-    if not chat_session:
-        raise HTTPException(status_code=404, detail="Chat session not found")
-    
-    # Get job post
-    if not chat_session.job_post_id:
-        raise HTTPException(status_code=400, detail="No job post found in this session")
-    
-    job_post_db = JobPostRepository.get_by_id(db, chat_session.job_post_id)
-    
-    if not job_post_db:
-        raise HTTPException(status_code=404, detail="Job post not found")
-    
-    # Convert to Pydantic model
-    job_post = db_to_pydantic_job_post(job_post_db)
+    # Get the session's job post
+    job_post = await load_session_job_post(db, request.session_id)
     
     # Regenerate section using orchestrator
-    regenerated_post = orch.regenerate_section(
+    regenerated_post = await orch.aregenerate_section(
         request.session_id,
         request.section_type,
         job_post
     )
     
     # Update job post in database
-    update_data = {
-        "title": regenerated_post.title,
-        "summary": regenerated_post.summary,
-        "responsibilities": regenerated_post.responsibilities,
-        "requirements": regenerated_post.requirements,
-        "skills": regenerated_post.skills,
-        "keywords": regenerated_post.keywords,
-        "hashtags": regenerated_post.hashtags,
-        "tone_type": regenerated_post.tone_type
-    }
-    
-    updated_post = JobPostRepository.update(db, job_post_db.id, update_data)
+    updated_post = await update_job_post(db, job_post.id, regenerated_post)
     
     return {
         "message": f"Section '{request.section_type}' regenerated successfully",
-        "job_post": db_to_pydantic_job_post(updated_post)
+        "job_post": updated_post
     }
 
+
+
+@router.post("/regenerate-sections")
+async def regenerate_sections(request: RegenerateSectionsRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Regenerates several sections in one request.
+    Sections are regenerated concurrently and saved with a single update;
+    set reformat to also re-run the whole-post formatting pass.
+    """
+    orch = get_orchestrator()
+    
+    unknown = [s for s in request.section_types if s not in orch.REGENERABLE_SECTIONS]
+    if not request.section_types or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid section types: {unknown or request.section_types}. "
+                   f"Expected any of: {', '.join(orch.REGENERABLE_SECTIONS)}"
+        )
+    
+    job_post = await load_session_job_post(db, request.session_id)
+    
+    regenerated_post = await orch.aregenerate_sections(
+        request.session_id,
+        request.section_types,
+        job_post,
+        reformat=request.reformat
+    )
+    
+    updated_post = await update_job_post(db, job_post.id, regenerated_post)
+    
+    return {
+        "message": f"Sections {', '.join(dict.fromkeys(request.section_types))} regenerated successfully",
+        "job_post": updated_post
+    }
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Tests for the async engine URL and the AsyncSession repositories"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database import Base, async_database_url
+from db_models import ChatMessage, JobPost
+from repositories import (
+    AsyncChatMessageRepository, AsyncChatSessionRepository, AsyncJobPostRepository,
+    AsyncUserRepository, JobPostRepository, async_unit_of_work, unit_of_work
+)
+import routes
+from routes import load_conversation_history, save_streamed_turn, save_turn
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./hiring_assistant.db") == "sqlite+aiosqlite:///./hiring_assistant.db"
+    assert async_database_url("postgresql://u:p@db/hiring") == "postgresql+asyncpg://u:p@db/hiring"
+    assert async_database_url("postgresql+psycopg2://u:p@db:5433/hiring") == "postgresql+asyncpg://u:p@db:5433/hiring"
+    assert async_database_url("mysql://u@db/hiring") == "mysql://u@db/hiring"
+
+
+def test_chat_turn_round_trip(tmp_path):
+    path = tmp_path / "async.db"
+    Base.metadata.create_all(bind=create_engine(f"sqlite:///{path}"))
+    events = []
+
+    def listener(event, post_id):
+        events.append((event, post_id))
+
+    JobPostRepository.add_listener(listener)
+
+    async def main():
+        engine = create_async_engine(async_database_url(f"sqlite:///{path}"))
+        session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+        try:
+            async with session_factory() as db:
+                user = await AsyncUserRepository.create(db, {"email": "hr@example.com", "password": "x", "name": "HR"})
+                assert (await AsyncUserRepository.get_by_email(db, "hr@example.com")).id == user.id
+
+                async with async_unit_of_work(db):
+                    chat_session = await AsyncChatSessionRepository.create(
+                        db, {"session_id": "s1", "messages": [], "job_info": {}, "user_id": user.id}, commit=False
+                    )
+                    await AsyncChatMessageRepository.append(db, chat_session, [{"role": "assistant", "content": "Hi"}])
+
+                result = {
+                    "response": "Here is your post",
+                    "is_complete": True,
+                    "job_info": {"job_title": "Data Analyst"},
+                    "job_post": {"title": "Data Analyst", "skills": ["SQL"]},
+                }
+                await save_turn(db, chat_session, "SQL please", result)
+
+            async with session_factory() as db:
+                stored = await AsyncChatSessionRepository.get_by_session_id(db, "s1")
+                assert stored.is_complete == 1 and stored.job_info == {"job_title": "Data Analyst"}
+                history = await load_conversation_history(db, stored, stored.job_info)
+                assert [m["content"] for m in history] == ["Hi", "SQL please", "Here is your post"]
+
+                post = await AsyncJobPostRepository.get_by_id(db, stored.job_post_id)
+                assert post.title == "Data Analyst" and post.user_id == user.id
+                updated = await AsyncJobPostRepository.update(db, post.id, {"summary": "Numbers"})
+                assert updated.summary == "Numbers"
+                assert [p.id for p in await AsyncJobPostRepository.get_by_user(db, user.id)] == [post.id]
+
+                assert await AsyncChatSessionRepository.delete(db, "s1")
+                assert await db.get(ChatMessage, ("s1", 0)) is None
+                return post.id
+        finally:
+            await engine.dispose()
+
+    try:
+        post_id = asyncio.run(main())
+    finally:
+        JobPostRepository.remove_listener(listener)
+    assert events == [("create", post_id), ("update", post_id)]
+
+
+def test_job_post_listeners_wait_for_commit(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'listeners.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    events = []
+
+    def listener(event, post_id):
+        # The notified row is visible to other connections
+        other = sessionmaker(bind=engine)()
+        try:
+            events.append((event, other.get(JobPost, post_id) is not None))
+        finally:
+            other.close()
+
+    JobPostRepository.add_listener(listener)
+    try:
+        with unit_of_work(db):
+            JobPostRepository.create(db, {"title": "Data Analyst"}, commit=False)
+            assert events == []
+        assert events == [("create", True)]
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db):
+                JobPostRepository.create(db, {"title": "Never saved"}, commit=False)
+                raise RuntimeError("turn failed")
+        db.commit()
+        assert events == [("create", True)]
+    finally:
+        JobPostRepository.remove_listener(listener)
+        db.close()
+        engine.dispose()
+
+
+def test_streamed_turn_for_a_deleted_session_is_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "stream.db"
+    Base.metadata.create_all(bind=create_engine(f"sqlite:///{path}"))
+    recorded = []
+
+    class Orchestrator:
+        def record_turn(self, *args):
+            recorded.append(args)
+
+    async def main():
+        engine = create_async_engine(async_database_url(f"sqlite:///{path}"))
+        monkeypatch.setattr(routes, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+        try:
+            with pytest.raises(HTTPException) as error:
+                await save_streamed_turn(Orchestrator(), "gone", "Hi", {"response": "Hello", "is_complete": False})
+            return error.value.status_code
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(main()) == 404
+    assert recorded == []
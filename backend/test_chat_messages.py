@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Tests for append-only chat message storage and unit-of-work persistence"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from db_models import ChatSession, ChatMessage, JobPost
+from repositories import ChatSessionRepository, ChatMessageRepository, JobPostRepository, unit_of_work
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _message(i):
+    return {"role": "user" if i % 2 else "assistant", "content": f"message {i}"}
+
+
+def test_append_assigns_sequence_and_reads_window(db):
+    chat_session = ChatSessionRepository.create(db, {"session_id": "s1", "messages": []})
+    ChatMessageRepository.append(db, chat_session, [_message(0), _message(1)])
+    assert ChatMessageRepository.append(db, chat_session, [_message(2), _message(3)]) == 4
+    db.commit()
+
+    assert [m["content"] for m in ChatMessageRepository.get_messages(db, chat_session)] == [
+        "message 0", "message 1", "message 2", "message 3"
+    ]
+    window = ChatMessageRepository.get_messages(db, chat_session, limit=2)
+    assert [m["content"] for m in window] == ["message 2", "message 3"]
+    assert [row.seq for row in db.query(ChatMessage).order_by(ChatMessage.seq)] == [0, 1, 2, 3]
+
+
+def test_legacy_json_messages_are_read_then_moved_on_append(db):
+    legacy = [_message(0), _message(1)]
+    chat_session = ChatSessionRepository.create(db, {"session_id": "old", "messages": legacy})
+
+    assert ChatMessageRepository.get_messages(db, chat_session) == legacy
+    assert ChatMessageRepository.get_messages(db, chat_session, limit=1) == legacy[-1:]
+
+    ChatMessageRepository.append(db, chat_session, [_message(2)])
+    db.commit()
+
+    assert db.query(ChatSession).filter_by(session_id="old").one().messages == []
+    assert [m["content"] for m in ChatMessageRepository.get_messages(db, chat_session)] == [
+        "message 0", "message 1", "message 2"
+    ]
+
+
+def test_delete_session_removes_its_messages(db):
+    ChatSessionRepository.create(db, {"session_id": "s2", "messages": []})
+    ChatSessionRepository.add_message(db, "s2", _message(0))
+    assert ChatSessionRepository.delete(db, "s2")
+    assert db.query(ChatMessage).count() == 0
+
+
+def test_unit_of_work_rolls_back_every_write(db):
+    chat_session = ChatSessionRepository.create(db, {"session_id": "s3", "messages": []})
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            ChatMessageRepository.append(db, chat_session, [_message(0)])
+            post = JobPostRepository.create(db, {"title": "Engineer"}, commit=False)
+            ChatSessionRepository.update_instance(db, chat_session, {"job_post_id": post.id})
+            raise RuntimeError("boom")
+
+    assert db.query(ChatMessage).count() == 0
+    assert db.query(JobPost).count() == 0
+    assert db.query(ChatSession).filter_by(session_id="s3").one().job_post_id is None
+
+
+def test_concurrent_appends_take_distinct_sequence_numbers(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'messages.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    make_session = sessionmaker(bind=engine)
+    with make_session() as db:
+        ChatSessionRepository.create(db, {"session_id": "s4", "messages": []})
+
+    first, second = make_session(), make_session()
+    ChatMessageRepository.append(first, first.query(ChatSession).filter_by(session_id="s4").one(), [_message(0), _message(1)])
+
+    # The second append starts while the first is uncommitted and waits for it
+    def append_second():
+        with unit_of_work(second):
+            ChatMessageRepository.append(second, second.query(ChatSession).filter_by(session_id="s4").one(), [_message(2)])
+
+    thread = threading.Thread(target=append_second)
+    thread.start()
+    time.sleep(0.2)
+    first.commit()
+    thread.join(timeout=5)
+
+    with make_session() as db:
+        assert [(row.seq, row.content) for row in db.query(ChatMessage).order_by(ChatMessage.seq)] == [
+            (0, "message 0"), (1, "message 1"), (2, "message 2")
+        ]
+    first.close()
+    second.close()
+    engine.dispose()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for running blocking route work in the sized worker threads"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import HTTPException
+
+import concurrency
+from concurrency import run_blocking
+
+
+def test_blocking_calls_overlap_up_to_the_limit(monkeypatch):
+    monkeypatch.setattr(concurrency, "BLOCKING_THREADS", 3)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow_call(seconds):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(seconds)
+        with lock:
+            running[0] -= 1
+        return seconds
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            # The event loop keeps running while the calls block their threads
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_blocking(slow_call, 0.2) for _ in range(6)))
+        elapsed = time.perf_counter() - start
+        tick_task.cancel()
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(main())
+    assert results == [0.2] * 6
+    assert peak[0] == 3
+    assert 0.35 < elapsed < 1.0  # two waves of three
+    assert ticks > 10
+
+
+def test_exceptions_reach_the_caller():
+    def missing():
+        raise HTTPException(status_code=404, detail="Chat session not found")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run_blocking(missing))
+    assert error.value.status_code == 404
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for the database engine profiles"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import text
+
+from database import create_profiled_async_engine, create_profiled_engine, engine_options
+
+
+def test_engine_options():
+    postgres = engine_options("postgresql://u:p@db/hiring", "production")
+    assert postgres["pool_size"] + postgres["max_overflow"] == 40
+    assert postgres["pool_pre_ping"] and postgres["pool_recycle"] == 1800
+    # The async engine gets its own, smaller pool
+    async_postgres = engine_options("postgresql+asyncpg://u:p@db/hiring", "production", "async")
+    assert async_postgres["pool_size"] + async_postgres["max_overflow"] == 20
+    assert "sync_pool" not in postgres and "async_pool" not in async_postgres
+
+    sqlite = engine_options("sqlite:///./hiring_assistant.db", "production")
+    assert sqlite["connect_args"] == {"check_same_thread": False}
+    assert "pool_pre_ping" not in sqlite and sqlite["pool_size"] == 10
+
+    # In-memory databases keep their single-connection pool
+    assert engine_options("sqlite://", "production") == {"echo": False, "connect_args": {"check_same_thread": False}}
+    assert engine_options("postgresql://u:p@db/hiring", "basic") == {"echo": False}
+    with pytest.raises(ValueError):
+        engine_options("sqlite://", "fastest")
+
+
+def test_sqlite_pragmas(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profiles.db'}"
+    engine = create_profiled_engine(url, "production")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 15000
+    finally:
+        engine.dispose()
+
+    basic = create_profiled_engine(f"sqlite:///{tmp_path / 'basic.db'}", "basic")
+    try:
+        with basic.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    finally:
+        basic.dispose()
+
+    async def main():
+        async_engine = create_profiled_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profiles.db'}", "production")
+        try:
+            async with async_engine.connect() as conn:
+                return (await conn.execute(text("PRAGMA cache_size"))).scalar()
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(main()) == -16384
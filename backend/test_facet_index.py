@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for the Job Finder facet bitmaps"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_finder.bitmap import ARRAY_MAX, Bitmap
+from job_finder.facet_index import FACETS, FacetIndex, facet_values
+from job_finder.job_index import JobIndex
+from job_finder.matching_agent import MatchingAgent
+from job_finder.models import SAMPLE_JOB_LISTINGS
+from test_job_index import INDUSTRIES, SKILLS, synthetic_jobs
+
+FILTER_VALUES = {
+    "locations": ["remote", "amman", "UAE", ""],
+    "work_types": ["Remote", "onsite", "hybrid"],
+    "companies": ["acme", "tech"],
+    "skills": [s.upper() for s in SKILLS],
+    "industries": INDUSTRIES,
+}
+
+
+def random_filters(rng):
+    filters = {
+        facet: rng.sample(values, rng.randint(1, 2))
+        for facet, values in FILTER_VALUES.items()
+        if rng.random() < 0.4
+    }
+    if rng.random() < 0.2:
+        filters["keyword"] = rng.choice(["engineer", "DATA", "design"])
+    return filters
+
+
+def test_filters_and_counts_match_list_scan():
+    agent = MatchingAgent()
+    jobs = synthetic_jobs(800) + list(SAMPLE_JOB_LISTINGS)
+    index = JobIndex(jobs)
+    assert index.filter_options() == agent.extract_filter_options(jobs)
+
+    rng = random.Random(3)
+    for _ in range(150):
+        filters = random_filters(rng)
+        selected, counts = index.filter(filters)
+        assert selected == agent.filter_jobs(jobs, filters), filters
+        for facet in FACETS:
+            # Disjunctive counts: the facet's own filter is left out
+            others = agent.filter_jobs(jobs, {k: v for k, v in filters.items() if k != facet})
+            expected = {}
+            for job in others:
+                for value in set(facet_values(job)[facet]):
+                    expected[value] = expected.get(value, 0) + 1
+            assert counts[facet] == expected, (facet, filters)
+
+
+def test_bitmaps_follow_incremental_updates():
+    agent = MatchingAgent()
+    jobs = synthetic_jobs(200)
+    index = JobIndex(jobs[:150])
+    for job in jobs[150:]:
+        index.add(job)
+    for job in jobs[:40]:
+        index.remove(job.id)
+    index.add(jobs[60].model_copy(update={"company": "Tech Corp", "work_type": "hybrid"}))
+
+    remaining = index.listings()
+    assert index.filter_options() == agent.extract_filter_options(remaining)
+    filters = {"companies": ["tech"], "work_types": ["hybrid"]}
+    assert index.filter(filters)[0] == agent.filter_jobs(remaining, filters)
+
+
+def test_bitmap_matches_set_semantics():
+    rng = random.Random(5)
+    # Sparse and dense chunks, and slots past the first chunk
+    sets = [
+        set(rng.sample(range(200000), 300)),
+        set(range(0, 3 * ARRAY_MAX, 2)) | {70000, 150001},
+        set(rng.sample(range(70000), 9000)),
+    ]
+    bitmaps = [Bitmap.from_slots(slots) for slots in sets]
+    for a, set_a in zip(bitmaps, sets):
+        assert list(a) == sorted(set_a) and len(a) == len(set_a)
+        for b, set_b in zip(bitmaps, sets):
+            assert list(a & b) == sorted(set_a & set_b)
+            assert list(a | b) == sorted(set_a | set_b)
+            assert a.intersection_len(b) == len(set_a & set_b)
+
+    bitmap, expected = Bitmap(), set()
+    for _ in range(20000):
+        slot = rng.randrange(2 * ARRAY_MAX)
+        if rng.random() < 0.6:
+            bitmap.add(slot)
+            expected.add(slot)
+        else:
+            bitmap.discard(slot)
+            expected.discard(slot)
+    assert list(bitmap) == sorted(expected)
+    assert all((slot in bitmap) == (slot in expected) for slot in range(2 * ARRAY_MAX))
+
+
+def test_freed_slots_are_reused():
+    facets = FacetIndex()
+    jobs = synthetic_jobs(300)
+    facets.add_many(enumerate(jobs[:100]))
+    churned = jobs[:50]
+    for round_ in range(5):
+        for job in churned:
+            facets.remove(job.id)
+        churned = [job.model_copy(update={"id": f"{job.id}-{round_}"}) for job in jobs[:50]]
+        facets.add_many(enumerate(churned, start=100 * (round_ + 1)))
+    # Churn does not grow the slot range
+    assert len(facets) == 100 and max(facets.live) == 99
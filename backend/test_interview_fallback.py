@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for the deadline-bound LLM fallback of the Job Finder interview"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_finder.interview_agent import REQUIRED_FIELDS, InterviewAgent
+from job_finder.models import JobSeekerProfile
+
+
+class FakeCompletions:
+    """Stands in for AsyncOpenAI().chat.completions, answering after `delay` seconds."""
+
+    def __init__(self, delay, content):
+        self.delay = delay
+        self.content = content
+        self.cancelled = 0
+
+    async def create(self, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))])
+
+
+def _agent(monkeypatch, delay, content):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    agent = InterviewAgent()
+    completions = FakeCompletions(delay, content)
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    agent.model = "test-model"
+    return agent, completions
+
+
+def test_slow_llm_degrades_to_next_question(monkeypatch):
+    agent, completions = _agent(monkeypatch, delay=5, content="{}")
+    start = time.perf_counter()
+    result = asyncio.run(agent.aprocess_message("hello there", JobSeekerProfile(), deadline_seconds=0.1))
+    assert time.perf_counter() - start < 1
+    assert completions.cancelled == 1
+    assert result == {
+        "question": REQUIRED_FIELDS["preferred_titles"],
+        "is_complete": False,
+        "updates": {},
+    }
+
+
+def test_fast_llm_result_is_used(monkeypatch):
+    agent, _ = _agent(monkeypatch, delay=0, content='{"preferred_titles": ["Platform Engineer"], "skills": null}')
+    result = asyncio.run(agent.aprocess_message("I build internal platforms", JobSeekerProfile(), deadline_seconds=1))
+    assert result["updates"] == {"preferred_titles": ["Platform Engineer"]}
+
+    # Keyword matches never wait for the LLM
+    agent.client.chat.completions.delay = 5
+    start = time.perf_counter()
+    result = asyncio.run(agent.aprocess_message("remote please", JobSeekerProfile(), deadline_seconds=10))
+    assert time.perf_counter() - start < 1
+    assert result["updates"]["work_type"] == "remote"
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Tests for reverse matching of new job posts to stored seeker profiles"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from db_models import JobPost
+from repositories import JobPostRepository
+from job_finder.db_models import Base as JobFinderBase, JobRecommendationORM
+from job_finder.job_alerts import JobAlertService
+from job_finder.job_index import JobFeatures, SeekerFeatures
+from job_finder.matching_agent import MatchingAgent
+from job_finder.models import JobListing, JobSeekerProfile
+from job_finder.seeker_index import SeekerIndex
+
+SKILLS = ["Python", "SQL", "React", "Figma", "AWS", "Go", "Excel", "Docker"]
+TITLES = ["Backend Engineer", "Data Analyst", "Frontend Developer", "Product Designer", "Accountant"]
+LOCATIONS = ["Amman", "Dubai", "Remote", "Cairo"]
+WORK_TYPES = ["remote", "hybrid", "on-site", None]
+
+
+def _seeker(rng, i):
+    return JobSeekerProfile(
+        id=f"seeker-{i}",
+        skills=rng.sample(SKILLS, rng.randint(0, 3)),
+        preferred_titles=rng.sample(TITLES, rng.randint(0, 1)),
+        preferred_locations=rng.sample(LOCATIONS, rng.randint(0, 1)),
+        work_type=rng.choice(WORK_TYPES),
+        industries=rng.sample(["Tech", "Finance", "Retail"], rng.randint(0, 1)),
+    )
+
+
+def _job(rng, i):
+    return JobListing(
+        id=f"job-{i}",
+        title=rng.choice(TITLES),
+        company="Acme",
+        location=rng.choice(LOCATIONS),
+        required_skills=rng.sample(SKILLS, rng.randint(0, 3)),
+        optional_skills=rng.sample(SKILLS, rng.randint(0, 1)),
+        work_type=rng.choice(WORK_TYPES),
+        industries=rng.sample(["Tech", "Finance", "Retail"], rng.randint(0, 1)),
+    )
+
+
+def test_candidates_cover_every_matching_seeker():
+    rng = random.Random(7)
+    seekers = [_seeker(rng, i) for i in range(400)]
+    index = SeekerIndex(seekers)
+    for i in range(100):
+        job = _job(rng, i)
+        features = JobFeatures.from_listing(job)
+        expected = {
+            seeker.id for seeker in seekers
+            if MatchingAgent.score_features(SeekerFeatures.from_profile(seeker), features) >= MatchingAgent.MIN_MATCH_SCORE
+        }
+        candidates = set(index.candidates(features, MatchingAgent.MIN_MATCH_SCORE))
+        assert expected <= candidates
+        assert len(candidates) < len(seekers)
+
+
+def test_work_type_alone_only_counts_for_tech_titles():
+    index = SeekerIndex([JobSeekerProfile(id="remote-only", work_type="remote")])
+    analyst = JobFeatures.from_listing(JobListing(
+        id="1", title="Data Analyst", company="Acme", location="Amman", required_skills=[], work_type="remote",
+    ))
+    engineer = JobFeatures.from_listing(JobListing(
+        id="2", title="Backend Engineer", company="Acme", location="Amman", required_skills=[], work_type="remote",
+    ))
+    assert index.candidates(analyst, MatchingAgent.MIN_MATCH_SCORE) == []
+    assert index.candidates(engineer, MatchingAgent.MIN_MATCH_SCORE) == ["remote-only"]
+    assert index.candidates(analyst) == ["remote-only"]
+
+
+@pytest.fixture
+def alerts(tmp_path):
+    # A file database so the alert worker thread gets its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'alerts.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    JobFinderBase.metadata.create_all(bind=engine)
+    service = JobAlertService(sessionmaker(bind=engine))
+    JobPostRepository.add_listener(service.on_job_post_change)
+    yield service
+    JobPostRepository.remove_listener(service.on_job_post_change)
+    engine.dispose()
+
+
+def test_new_posts_are_pushed_to_matching_seekers(alerts):
+    db = alerts.session_factory()
+    alerts.upsert_profile(db, JobSeekerProfile(
+        id="python-dev", skills=["Python", "SQL"], preferred_titles=["Backend Engineer"], work_type="remote",
+    ))
+    alerts.upsert_profile(db, JobSeekerProfile(id="designer", skills=["Figma"], preferred_titles=["Product Designer"]))
+
+    post = JobPostRepository.create(db, {
+        "title": "Backend Engineer", "company": "Acme", "location": "Remote",
+        "requirements": ["Python", "SQL"], "workplace_type": "Remote",
+    })
+    assert alerts.drain(timeout=10)
+
+    rows = db.query(JobRecommendationORM).all()
+    assert [(row.seeker_id, row.job_id) for row in rows] == [("python-dev", str(post.id))]
+    assert rows[0].match_score >= MatchingAgent.MIN_MATCH_SCORE
+    assert rows[0].job.title == "Backend Engineer"
+
+    JobPostRepository.delete(db, post.id)
+    assert alerts.drain(timeout=10)
+    db.expire_all()
+    assert db.query(JobRecommendationORM).count() == 0
+    assert db.get(JobPost, post.id) is None
+    db.close()
+
+
+def test_profiles_stored_by_other_workers_are_indexed(alerts):
+    db = alerts.session_factory()
+    job = JobListing(id="job-1", title="Data Analyst", company="Acme", location="Amman", required_skills=["SQL", "Excel"])
+    assert alerts.match_job(db, job) == []
+
+    # Another worker's service stores a completed profile
+    other = JobAlertService(alerts.session_factory)
+    other.upsert_profile(db, JobSeekerProfile(id="analyst", skills=["SQL", "Excel"], preferred_locations=["Amman"]))
+    assert [seeker.id for _, seeker in alerts.match_job(db, job)] == ["analyst"]
+    db.close()
+
+
+def test_session_save_and_push_share_recommendation_rows(alerts):
+    from job_finder.models import JobFinderSession, JobRecommendation
+    from job_finder.session_store import JobFinderSessionStore
+
+    db = alerts.session_factory()
+    seeker = JobSeekerProfile(id="python-dev", skills=["Python", "SQL"], preferred_titles=["Backend Engineer"])
+    job = JobListing(id="job-1", title="Backend Engineer", company="Acme", location="Remote", required_skills=["Python", "SQL"])
+    alerts.upsert_profile(db, seeker)
+    rec = JobRecommendation(id="rec-job-1-python-dev", job_id="job-1", seeker_id="python-dev", match_score=1, explanation="old")
+    JobFinderSessionStore().save(db, JobFinderSession(session_id="s1", seeker_profile=seeker, recommendations=[rec], is_profile_complete=True), [job])
+
+    assert alerts.push_job(db, job) == 1
+    db.expire_all()
+    assert db.get(JobRecommendationORM, "rec-job-1-python-dev").explanation != "old"
+    # A later session save of the same row overwrites instead of conflicting
+    JobFinderSessionStore().save(db, JobFinderSession(session_id="s2", seeker_profile=seeker, recommendations=[rec], is_profile_complete=True), [job])
+    db.expire_all()
+    rows = db.query(JobRecommendationORM).all()
+    assert [(row.id, row.explanation) for row in rows] == [("rec-job-1-python-dev", "old")]
+    db.close()
+
+
+def test_migrate_schema_adds_missing_columns_and_indexes(tmp_path):
+    from sqlalchemy import inspect
+    from database import migrate_schema
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        # job_finder_sessions before the version column, without any indexes
+        connection.exec_driver_sql(
+            "CREATE TABLE job_finder_sessions (session_id VARCHAR PRIMARY KEY, profile_id VARCHAR NOT NULL,"
+            " messages JSON, is_profile_complete INTEGER, recommendation_ids JSON,"
+            " created_at DATETIME, updated_at DATETIME)"
+        )
+        connection.exec_driver_sql("INSERT INTO job_finder_sessions (session_id, profile_id) VALUES ('s1', 'p1')")
+    JobFinderBase.metadata.create_all(bind=engine)
+    for _ in range(2):
+        migrate_schema(engine, (JobFinderBase.metadata,))
+
+    inspector = inspect(engine)
+    assert "version" in {column["name"] for column in inspector.get_columns("job_finder_sessions")}
+    assert "ix_job_finder_sessions_session_id" in {index["name"] for index in inspector.get_indexes("job_finder_sessions")}
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT version FROM job_finder_sessions").scalar() == 0
+    engine.dispose()
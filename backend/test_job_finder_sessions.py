@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for persisted Job Finder sessions"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from job_finder.db_models import Base as JobFinderBase, JobFinderSessionORM, JobRecommendationORM
+from job_finder.orchestrator import JobFinderOrchestrator
+from job_finder.session_store import JobFinderSessionStore, SessionConflict
+
+
+@pytest.fixture
+def make_db(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("JOB_ALERTS_ENABLED", "false")
+    engine = create_engine(f"sqlite:///{tmp_path / 'sessions.db'}")
+    Base.metadata.create_all(bind=engine)
+    JobFinderBase.metadata.create_all(bind=engine)
+    sessions = []
+
+    def make():
+        session = sessionmaker(bind=engine)()
+        sessions.append(session)
+        return session
+
+    yield make
+    for session in sessions:
+        session.close()
+    engine.dispose()
+
+
+def test_sessions_survive_restart_and_are_shared(make_db):
+    # Two orchestrators with their own caches stand in for two workers
+    first = JobFinderOrchestrator(db=make_db())
+    second = JobFinderOrchestrator(db=make_db())
+
+    session_id = first.start_session().session_id
+    assert second.get_session(session_id).messages == []
+
+    result = first.process_user_message(session_id, "Senior frontend engineer, React and TypeScript, remote please")
+    assert result["is_profile_complete"] and result["recommendations"]
+
+    # The second worker's cached copy is stale and gets reloaded
+    loaded = second.get_session(session_id)
+    assert loaded.is_profile_complete
+    assert len(loaded.messages) == 2
+    assert loaded.seeker_profile.work_type == "remote"
+    assert [rec.model_dump() for rec in loaded.recommendations] == result["recommendations"]
+
+    db = make_db()
+    rows = db.query(JobRecommendationORM).filter(JobRecommendationORM.seeker_id == session_id).all()
+    assert sorted(row.id for row in rows) == sorted(rec["id"] for rec in result["recommendations"])
+    assert db.get(JobFinderSessionORM, session_id).version == 2
+
+    assert JobFinderOrchestrator(db=make_db()).get_session("missing") is None
+
+
+def test_cache_is_bounded(make_db):
+    orchestrator = JobFinderOrchestrator(db=make_db(), session_store=JobFinderSessionStore(max_entries=3))
+    ids = [orchestrator.start_session().session_id for _ in range(10)]
+    assert len(orchestrator.sessions) == 3
+    # Evicted sessions are still served from the database
+    assert orchestrator.get_session(ids[0]).session_id == ids[0]
+
+
+def test_concurrent_saves_do_not_overwrite_each_other(make_db):
+    first = JobFinderOrchestrator(db=make_db())
+    second = JobFinderOrchestrator(db=make_db())
+    session_id = first.start_session().session_id
+
+    # Both workers read the session before either saves
+    stale = first.get_session(session_id)
+    stale.messages.append({"role": "user", "content": "not saved"})
+    assert first.get_session(session_id).messages == []  # callers get copies
+
+    second.process_user_message(session_id, "I'm a backend engineer")
+    with pytest.raises(SessionConflict):
+        first.sessions.save(first.db, stale)
+
+    # A turn applied to the stale copy is retried on top of the saved one
+    stale = first.get_session(session_id, db=make_db())
+    third = JobFinderOrchestrator(db=make_db())
+    third.process_user_message(session_id, "Python and Go, remote")
+    first._apply_turn(first.db, stale, "5 years", {"updates": {}, "question": "Anything else?", "is_complete": False})
+
+    loaded = JobFinderOrchestrator(db=make_db()).get_session(session_id)
+    assert [m["content"] for m in loaded.messages if m["role"] == "user"] == [
+        "I'm a backend engineer", "Python and Go, remote", "5 years",
+    ]
+    assert loaded.version == 4
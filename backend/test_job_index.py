@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Tests for the Job Finder inverted index"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_finder.job_index import JobIndex
+from job_finder.matching_agent import MatchingAgent
+from job_finder.models import JobListing, JobSeekerProfile, SAMPLE_JOB_LISTINGS
+
+SKILLS = ["react", "nodejs", "python", "sql", "figma", "aws", "docker", "go", "excel", "typescript"]
+TITLES = ["Frontend Developer", "Data Analyst", "Backend Engineer", "Product Designer", "Sales Manager", "Full Stack"]
+LOCATIONS = ["Amman, Jordan", "Remote (US)", "Dubai, UAE", "Beirut, Lebanon (Hybrid)", "", "Remote"]
+WORK_TYPES = ["remote", "onsite", "on-site", "hybrid", "", None]
+INDUSTRIES = ["software", "fintech", "saas", "retail", "ai"]
+
+
+def synthetic_jobs(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        JobListing(
+            id=f"syn-{i}",
+            title=rng.choice(TITLES),
+            company="Acme",
+            location=rng.choice(LOCATIONS),
+            required_skills=rng.sample(SKILLS, rng.randint(0, 3)),
+            optional_skills=rng.sample(SKILLS, rng.randint(0, 2)),
+            work_type=rng.choice(WORK_TYPES),
+            industries=rng.sample(INDUSTRIES, rng.randint(0, 2)),
+        )
+        for i in range(count)
+    ]
+
+
+def synthetic_seekers(count, seed=11):
+    rng = random.Random(seed)
+    return [
+        JobSeekerProfile(
+            id=f"seeker-{i}",
+            skills=[s.upper() for s in rng.sample(SKILLS, rng.randint(0, 3))],
+            preferred_titles=rng.sample(["frontend", "engineer", "designer", "analyst", "full stack developer"], rng.randint(0, 2)),
+            preferred_locations=rng.sample(["amman", "remote", "dubai"], rng.randint(0, 2)),
+            work_type=rng.choice(["remote", "onsite", "hybrid", None]),
+            industries=rng.sample(INDUSTRIES, rng.randint(0, 1)),
+        )
+        for i in range(count)
+    ]
+
+
+def test_candidates_cover_every_job_above_threshold():
+    agent = MatchingAgent()
+    jobs = synthetic_jobs(600) + list(SAMPLE_JOB_LISTINGS)
+    index = JobIndex(jobs)
+    for seeker in synthetic_seekers(80):
+        candidates = set(index.candidates(seeker, agent.MIN_MATCH_SCORE))
+        for job in jobs:
+            if agent.score_job(seeker, job) >= agent.MIN_MATCH_SCORE:
+                assert job.id in candidates, (seeker, job)
+
+
+def test_indexed_matching_returns_the_same_recommendations():
+    agent = MatchingAgent()
+    jobs = synthetic_jobs(400) + list(SAMPLE_JOB_LISTINGS)
+    index = JobIndex(jobs)
+    for seeker in synthetic_seekers(40):
+        expected = agent.match_jobs(seeker, jobs)
+        actual = agent.match_jobs(seeker, index=index)
+        assert [(r.job_id, r.match_score) for r in actual] == [(r.job_id, r.match_score) for r in expected]
+
+
+def test_incremental_add_and_remove():
+    index = JobIndex(SAMPLE_JOB_LISTINGS)
+    seeker = JobSeekerProfile(skills=["rust"])
+    assert index.candidates(seeker, 30) == []
+
+    rust_job = SAMPLE_JOB_LISTINGS[0].model_copy(update={"id": "job-rust", "required_skills": ["Rust"]})
+    index.add(rust_job)
+    assert index.candidates(seeker, 30) == ["job-rust"]
+
+    index.add(rust_job.model_copy(update={"required_skills": ["go"]}))
+    assert index.candidates(seeker, 30) == []
+    assert len(index) == len(SAMPLE_JOB_LISTINGS) + 1
+
+    index.remove("job-rust")
+    assert "job-rust" not in index
+    assert "go" not in index.required_skills
+
+
+def test_top_scored_pages_follow_full_sort():
+    rng = random.Random(5)
+    scored = [(rng.randint(1, 100), position, f"job-{position}") for position in range(500)]
+    expected = sorted(scored, key=lambda entry: (-entry[0], entry[1]))
+
+    assert MatchingAgent.top_scored(scored, 10, offset=20) == expected[20:30]
+    pages, after = [], None
+    while True:
+        page = MatchingAgent.top_scored(scored, 7, after=after)
+        if not page:
+            break
+        pages += page
+        after = page[-1][:2]
+    assert pages == expected
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Tests for the Job Finder interview keyword extractor"""
+
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_finder.interview_agent import InterviewAgent
+from job_finder.keyword_extractor import KeywordExtractor, trie_pattern
+from job_finder.models import JobSeekerProfile
+
+
+def test_no_matches_inside_words(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    agent = InterviewAgent()
+    result = agent.process_message("I maintain services and focus on quality", JobSeekerProfile())
+    assert "industries" not in result["updates"]
+    assert "preferred_locations" not in result["updates"]
+
+    updates = agent.process_message(
+        "Senior full stack developer in the US, React/Node.js and AI SaaS, on-site or remote",
+        JobSeekerProfile(),
+    )["updates"]
+    assert updates["work_type"] == "remote"
+    assert updates["preferred_titles"] == ["full stack", "developer", "senior"]
+    assert updates["skills"] == ["node", "react"]
+    assert updates["industries"] == ["ai", "saas"]
+    assert updates["preferred_locations"] == ["us", "remote"]
+
+
+def test_longest_term_and_aliases():
+    extractor = KeywordExtractor({
+        "skills": ["java", "javascript", "node", "node.js", "c++", "c"],
+        "work_types": {"onsite": ["onsite", "on-site"], "remote": ["remote"]},
+    })
+    found = extractor.extract("Node.js, JavaScript and C++ on-site; some C")
+    assert found["skills"] == ["javascript", "node.js", "c++", "c"]
+    assert found["work_types"] == ["onsite"]
+    assert extractor.extract("nothing here") == {"skills": [], "work_types": []}
+
+
+def test_trie_pattern_matches_exactly_the_terms():
+    terms = ["data", "data scientist", "database", "dat", "designer", "design"]
+    regex = re.compile(f"(?:{trie_pattern(terms)})$")
+    assert all(regex.match(term) for term in terms)
+    assert not any(regex.match(text) for text in ["da", "data scien", "designe", "databases"])
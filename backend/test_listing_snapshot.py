@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Tests for the incrementally refreshed Job Finder listing snapshot"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from db_models import JobPost
+from repositories import JobPostRepository
+from job_finder.listing_snapshot import ListingSnapshot
+from job_finder.models import SAMPLE_JOB_LISTINGS
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def snapshot():
+    snapshot = ListingSnapshot(refresh_seconds=3600, lookback_seconds=5)
+    JobPostRepository.add_listener(snapshot.on_job_post_change)
+    yield snapshot
+    JobPostRepository.remove_listener(snapshot.on_job_post_change)
+
+
+def _post(title, **extra):
+    return {"title": title, "company": "Acme", "location": "Amman", "requirements": ["python"], **extra}
+
+
+def test_serves_samples_until_rows_exist(db, snapshot):
+    assert len(snapshot.get_index(db)) == len(SAMPLE_JOB_LISTINGS)
+    post = JobPostRepository.create(db, _post("Backend Engineer"))
+    assert [job.id for job in snapshot.get_index(db).listings()] == [str(post.id)]
+
+
+def test_repository_writes_refresh_only_changed_rows(db, snapshot, monkeypatch):
+    first = JobPostRepository.create(db, _post("Backend Engineer"))
+    second = JobPostRepository.create(db, _post("Data Analyst"))
+    index = snapshot.get_index(db)
+    version = index.version
+
+    # A read with no writes does not touch the index
+    assert snapshot.get_index(db) is index and index.version == version
+
+    JobPostRepository.update(db, second.id, {"title": "Senior Data Analyst"})
+    third = JobPostRepository.create(db, _post("Designer"))
+    index = snapshot.get_index(db)
+    assert index.get(str(second.id)).title == "Senior Data Analyst"
+    assert index.get(str(third.id)) is not None
+    # Only the updated and created rows were re-indexed
+    assert index.version == version + 2
+
+    JobPostRepository.delete(db, first.id)
+    refreshed = snapshot.get_index(db)
+    assert [job.id for job in refreshed.listings()] == [str(second.id), str(third.id)]
+    # The index handed out before the delete is left as it was
+    assert str(first.id) in index and refreshed is not index
+
+
+def test_picks_up_writes_from_other_processes_on_interval(db):
+    snapshot = ListingSnapshot(refresh_seconds=0, lookback_seconds=5)
+    kept = JobPostRepository.create(db, _post("Backend Engineer"))
+    gone = JobPostRepository.create(db, _post("Data Analyst"))
+    snapshot.get_index(db)
+
+    # Bypass the repository so no listener fires
+    db.query(JobPost).filter(JobPost.id == gone.id).delete()
+    db.commit()
+    assert [job.id for job in snapshot.get_index(db).listings()] == [str(kept.id)]
+
+
+def test_picks_up_rows_without_updated_at(db):
+    snapshot = ListingSnapshot(refresh_seconds=0, lookback_seconds=5)
+    JobPostRepository.create(db, _post("Backend Engineer"))
+    snapshot.get_index(db)
+
+    # Rows inserted outside the ORM get no updated_at default
+    db.execute(JobPost.__table__.insert().values(title="Data Analyst", updated_at=None))
+    db.commit()
+    titles = sorted(job.title for job in snapshot.get_index(db).listings())
+    assert titles == ["Backend Engineer", "Data Analyst"]
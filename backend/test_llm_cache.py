@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for the LLM response cache and its memory/SQLite tiers"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from cache import LRUCache, SQLiteCache
+from agents.llm_cache import LLMResponseCache
+from agents.base import BaseAgent
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=f"reply {self.calls}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class _EchoAgent(BaseAgent):
+    async def aprocess(self, *args, **kwargs):
+        return {}
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_ttl_expiry():
+    cache = LRUCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_sqlite_tier_size_eviction(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.db"), max_entries=3)
+    for i in range(5):
+        disk.set(f"k{i}", {"n": i})
+    assert len(disk) == 3
+    assert disk.get("k0") is None
+    assert disk.get("k4") == {"n": 4}
+    disk.close()
+
+
+def test_disk_hit_is_promoted_to_memory(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.db"))
+    disk.set("key", "cached reply")
+    cache = LLMResponseCache(LRUCache(max_entries=4), disk)
+    assert cache.get("key") == "cached reply"
+    assert "key" in cache.memory
+    assert cache.stats()["hits"] == 1
+    disk.close()
+
+
+def test_make_key_depends_on_request_parameters():
+    messages = [{"role": "user", "content": "hi"}]
+    key = LLMResponseCache.make_key("gpt-4o-mini", messages, 0.7, 200)
+    assert key == LLMResponseCache.make_key("gpt-4o-mini", list(messages), 0.7, 200)
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", messages, 0.5, 200)
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", messages, 0.7, 300)
+
+
+def test_acall_llm_serves_repeat_prompts_from_cache():
+    agent = _EchoAgent()
+    agent.cache = LLMResponseCache(LRUCache(max_entries=8))
+    completions = _FakeCompletions()
+    agent.async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    messages = [{"role": "user", "content": "Generate hashtags"}]
+
+    async def calls():
+        first = await agent._acall_llm(messages, temperature=0.7, max_tokens=200)
+        second = await agent._acall_llm(messages, temperature=0.7, max_tokens=200)
+        uncached = await agent._acall_llm(messages, temperature=0.7, max_tokens=200, use_cache=False)
+        return first, second, uncached
+
+    first, second, uncached = asyncio.run(calls())
+
+    assert first == second == "reply 1"
+    assert uncached == "reply 2"
+    assert completions.calls == 2
+    assert agent.cache.stats()["hits"] == 1
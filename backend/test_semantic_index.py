@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for semantic Job Finder matching"""
+
+import gc
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+np = pytest.importorskip("numpy")
+
+from job_finder.job_index import JobIndex
+from job_finder.matching_agent import MatchingAgent
+from job_finder.models import JobListing, JobSeekerProfile, SAMPLE_JOB_LISTINGS
+from job_finder.semantic_index import IVFIndex, SemanticIndex
+
+
+def test_semantic_mode_matches_related_titles():
+    ui_job = JobListing(id="ui-1", title="UI Engineer", company="Acme", location="Amman, Jordan",
+                        required_skills=["CSS"], work_type="onsite")
+    index = JobIndex(list(SAMPLE_JOB_LISTINGS) + [ui_job])
+    seeker = JobSeekerProfile(id="s", preferred_titles=["Frontend Developer"], skills=["CSS"])
+
+    heuristic = MatchingAgent(matching_mode="heuristic")
+    semantic = MatchingAgent(matching_mode="semantic")
+    heuristic_score = heuristic.score_job(seeker, ui_job)
+    semantic_scores = {rec.job_id: rec.match_score for rec in semantic.match_jobs(seeker, index=index)}
+    # The tech-role bonus (5) becomes a title match (30)
+    assert heuristic_score == 25
+    assert semantic_scores["ui-1"] == 50
+    assert "ui-1" not in {rec.job_id for rec in heuristic.match_jobs(seeker, index=index)}
+
+
+def test_unknown_matching_mode_is_rejected():
+    with pytest.raises(ValueError):
+        MatchingAgent(matching_mode="fuzzy")
+
+
+def test_ivf_recall_against_brute_force():
+    rng = np.random.default_rng(4)
+    centers = rng.normal(size=(40, 32))
+    vectors = (centers[rng.integers(0, 40, 8000)] + 0.3 * rng.normal(size=(8000, 32))).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ann = IVFIndex(vectors)
+
+    recalls = []
+    for query in vectors[rng.choice(8000, 50, replace=False)]:
+        exact, _ = ann.search_exact(query, 20)
+        approx, _ = ann.search(query, 20, nprobe=8)
+        recalls.append(len(set(exact) & set(approx)) / 20)
+    assert np.mean(recalls) >= 0.9
+    # Probing every list is exhaustive
+    query = vectors[0]
+    assert set(ann.search(query, 20, nprobe=ann.nlist)[0]) == set(ann.search_exact(query, 20)[0])
+
+
+def test_listing_changes_update_the_index_in_place(monkeypatch):
+    monkeypatch.setenv("SEMANTIC_RETRAIN_DRIFT", "0.5")
+    index = JobIndex(SAMPLE_JOB_LISTINGS)
+    agent = MatchingAgent(matching_mode="semantic")
+    first = agent.get_semantic_index(index)
+
+    ui_job = JobListing(id="ui-1", title="UI Engineer", company="Acme", location="Amman, Jordan", required_skills=["CSS"])
+    index.add(ui_job)
+    index.remove(SAMPLE_JOB_LISTINGS[0].id)
+    updated = agent.get_semantic_index(index)
+    assert updated is not first and updated.ann.centroids is first.ann.centroids
+    assert SAMPLE_JOB_LISTINGS[0].id in first.rows  # readers of the old index are unaffected
+
+    seeker = JobSeekerProfile(id="s", preferred_titles=["Frontend Developer"], skills=["CSS"])
+    rebuilt = MatchingAgent(matching_mode="semantic").get_semantic_index(index)
+    everything = len(index) + 1
+    assert set(updated.candidates(seeker, everything)) == set(rebuilt.candidates(seeker, everything)) == set(
+        job.id for job in index.listings()
+    )
+    assert updated.title_similarity(seeker, ["ui-1"]) == pytest.approx(rebuilt.title_similarity(seeker, ["ui-1"]))
+
+    # Past the drift threshold k-means is retrained in the background and swapped in
+    for i in range(len(SAMPLE_JOB_LISTINGS)):
+        index.add(ui_job.model_copy(update={"id": f"ui-{i + 2}"}))
+    assert agent.get_semantic_index(index).needs_retrain()
+    for _ in range(200):
+        if not agent._semantic_retraining:
+            break
+        time.sleep(0.01)
+    retrained = agent.get_semantic_index(index)
+    assert not retrained.needs_retrain() and set(retrained.rows) == {job.id for job in index.listings()}
+
+
+def test_vector_files_live_as_long_as_an_index_uses_them(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEMANTIC_INDEX_DIR", str(tmp_path))
+    semantic = SemanticIndex(SAMPLE_JOB_LISTINGS)
+    assert len(list(tmp_path.glob("job_vectors_*.f32"))) == 2
+
+    ui_job = JobListing(id="ui-1", title="UI Engineer", company="Acme", location="Amman, Jordan", required_skills=["CSS"])
+    updated = semantic.updated(list(SAMPLE_JOB_LISTINGS) + [ui_job])
+    del semantic
+    gc.collect()
+    # The updated index still reads the original files
+    assert len(list(tmp_path.glob("job_vectors_*.f32"))) == 2
+    assert "ui-1" in updated.candidates(JobSeekerProfile(id="s", preferred_titles=["UI Engineer"]), 3)
+
+    del updated
+    gc.collect()
+    assert list(tmp_path.glob("job_vectors_*.f32")) == []
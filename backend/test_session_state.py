@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Tests for the orchestrator's versioned per-session state"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.orchestrator import AgentOrchestrator
+from agents.session_store import SessionStateStore
+from routes import get_previous_job_info
+
+
+class Row:
+    def __init__(self, job_info):
+        self.session_id = "s1"
+        self.job_info = job_info
+
+
+def test_state_from_another_turn_is_ignored(tmp_path):
+    db_path = str(tmp_path / "sessions.db")
+    worker_a = AgentOrchestrator(SessionStateStore(db_path=db_path))
+    worker_b = AgentOrchestrator(SessionStateStore(db_path=db_path))
+    turn = {"job_info": {"job_title": "Data Analyst"}, "is_complete": False, "job_post": {"title": "Data Analyst"}}
+
+    worker_a.record_turn("s1", turn, version="v1")
+    assert worker_a.get_session("s1", version="v1")["job_post"].title == "Data Analyst"
+
+    # Worker B saves the next turn; A's memory tier still holds v1
+    worker_b.record_turn("s1", {**turn, "job_info": {"job_title": "Data Analyst", "location": "Amman"}}, version="v2")
+    assert worker_a.get_session("s1", version="v2")["job_info"]["location"] == "Amman"
+    assert worker_b.get_session("s1", version="v3") is None
+
+
+def test_previous_job_info_comes_from_the_saved_row():
+    assert get_previous_job_info(Row({"job_title": "Data Analyst"})) == {"job_title": "Data Analyst"}
+    # Older rows stored the post preview in job_info
+    assert get_previous_job_info(Row({"title": "Data Analyst"})) is None
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Tests for the Job Finder BM25 text index"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from job_finder.job_index import JobIndex
+from job_finder.models import JobListing, SAMPLE_JOB_LISTINGS
+from job_finder.text_index import BM25_B, BM25_K1, listing_terms, stem, tokenize
+
+
+def _job(job_id, title, description="", responsibilities=()):
+    return JobListing(id=job_id, title=title, company="Acme", location="Remote", required_skills=[],
+                      description=description, responsibilities=list(responsibilities))
+
+
+def test_tokenize_stems_and_drops_stopwords():
+    assert tokenize("Developing dashboards for the Engineers") == ["develop", "dashboard", "engineer"]
+    assert [stem(w) for w in ("planned", "running", "companies", "classes", "business")] == [
+        "plan", "run", "company", "class", "business"
+    ]
+    # Short and technical tokens are left alone
+    assert tokenize("Node.js C++ C# AWS") == ["node", "js", "c++", "c#", "aws"]
+
+
+def test_scores_match_bm25_definition():
+    jobs = list(SAMPLE_JOB_LISTINGS)
+    index = JobIndex(jobs)
+    query = "react developer building dashboards"
+
+    terms = {job.id: listing_terms(job) for job in jobs}
+    average = sum(sum(t.values()) for t in terms.values()) / len(jobs)
+    expected = {}
+    for term in set(tokenize(query)):
+        having = [job_id for job_id, t in terms.items() if term in t]
+        idf = math.log(1 + (len(jobs) - len(having) + 0.5) / (len(having) + 0.5))
+        for job_id in having:
+            tf, length = terms[job_id][term], sum(terms[job_id].values())
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+            expected[job_id] = expected.get(job_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    scores = index.text_scores(query)
+    assert scores.keys() == expected.keys()
+    for job_id, score in expected.items():
+        assert scores[job_id] == pytest.approx(score)
+
+
+def test_ranking_and_incremental_updates():
+    index = JobIndex([
+        _job("title", "Python Engineer", "Build services."),
+        _job("body", "Backend Engineer", "Maintain services.", ["Write Python tooling"]),
+        _job("other", "Designer", "Design screens."),
+    ])
+    assert [job_id for _, job_id in index.text.search("python")] == ["title", "body"]
+
+    index.add(_job("body", "Backend Engineer", "Maintain services."))
+    index.remove("title")
+    assert index.text_scores("python") == {}
+    assert set(index.text_scores("services design")) == {"body", "other"}
+
+
+def test_keyword_filter_and_counts_follow_the_text_postings():
+    index = JobIndex([
+        _job("a", "Python Engineer", "Build services."),
+        _job("b", "Data Engineer", "Python pipelines.").model_copy(update={"location": "Amman"}),
+        _job("c", "Designer", "Design screens."),
+    ])
+    jobs, counts = index.filter({"keyword": "Python engineers"})
+    assert [job.id for job in jobs] == ["a", "b"]
+    assert counts["locations"] == {"Remote": 1, "Amman": 1}
+
+    # Counts cover only the listings a text query kept
+    jobs, counts = index.filter({"locations": ["remote"]}, within=index.text_scores("design"))
+    assert [job.id for job in jobs] == ["c"]
+    assert counts["locations"] == {"Remote": 1}
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for the vectorized Job Finder scorer"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("numpy")
+
+from job_finder.job_index import JobIndex, SeekerFeatures
+from job_finder.matching_agent import MatchingAgent
+from job_finder.models import JobListing, JobSeekerProfile, SAMPLE_JOB_LISTINGS
+from job_finder.vector_scorer import VectorizedScorer
+from test_job_index import synthetic_jobs, synthetic_seekers
+
+EDGE_SEEKERS = [
+    JobSeekerProfile(id="empty"),
+    JobSeekerProfile(id="blank-location", preferred_locations=[""], work_type="remote"),
+    JobSeekerProfile(id="onsite", preferred_titles=["Backend Engineer"], work_type="OnSite", preferred_locations=["AMMAN"]),
+    JobSeekerProfile(id="everything", skills=["React", "SQL", "Python", "AWS"], preferred_titles=["developer", ""],
+                     preferred_locations=["remote", "dubai"], work_type="hybrid", industries=["SaaS", "AI"]),
+]
+
+
+def test_scores_match_score_job():
+    agent = MatchingAgent()
+    jobs = synthetic_jobs(20000, seed=3) + list(SAMPLE_JOB_LISTINGS) + [
+        JobListing(id="blank", title="", company="Acme", location="", required_skills=[], work_type=""),
+        JobListing(id="caps", title="SENIOR REACT DEVELOPER", company="Acme", location="REMOTE", work_type="Remote",
+                   required_skills=["REACT", "react"], industries=["SAAS"]),
+    ]
+    scorer = VectorizedScorer.from_index(JobIndex(jobs))
+    for seeker in synthetic_seekers(40) + EDGE_SEEKERS:
+        scores = scorer.score_all(seeker)
+        expected = [agent.score_job(seeker, job) for job in jobs]
+        assert scores.tolist() == expected, seeker.id
+
+
+def test_top_matches_bounded_search():
+    agent = MatchingAgent()
+    index = JobIndex(synthetic_jobs(3000) + list(SAMPLE_JOB_LISTINGS))
+    scorer = VectorizedScorer.from_index(index)
+    for seeker in synthetic_seekers(60) + EDGE_SEEKERS:
+        expected = [
+            (score, job.id)
+            for score, job in agent._match_indexed(SeekerFeatures.from_profile(seeker), index)
+        ]
+        assert scorer.top(seeker, agent.MAX_RECOMMENDATIONS, agent.MIN_MATCH_SCORE) == expected, seeker.id
+
+
+def test_match_many_equals_match_jobs_per_seeker(monkeypatch):
+    agent = MatchingAgent(matching_mode="heuristic")
+    index = JobIndex(synthetic_jobs(3000, seed=5) + list(SAMPLE_JOB_LISTINGS))
+    seekers = synthetic_seekers(80) + EDGE_SEEKERS
+    scorer = agent.get_vector_scorer(index)
+    assert scorer.score_matrix(seekers).tolist() == [scorer.score_all(s).tolist() for s in seekers]
+
+    expected = [[(r.job_id, r.match_score) for r in agent.match_jobs(s, index=index)] for s in seekers]
+    # Small chunks, so several score matrices are combined
+    monkeypatch.setenv("BATCH_MATCH_CHUNK_CELLS", str(len(index) * 7))
+    for workers in (0, 2, 2):
+        batches = agent.match_many(seekers, index=index, workers=workers)
+        assert [[(r.job_id, r.match_score) for r in recs] for recs in batches] == expected
+    # The worker pool outlives a call and is replaced once the index changes
+    pool = agent._worker_pool[1]
+    agent.match_many(seekers[:2], index=index, workers=2)
+    assert agent._worker_pool[1] is pool
+    index.remove(SAMPLE_JOB_LISTINGS[0].id)
+    agent.match_many(seekers[:2], index=index, workers=2)
+    assert agent._worker_pool[1] is not pool
+    agent.close()
+    assert agent._worker_pool is None
+    assert [len(recs) for recs in agent.match_many(seekers[:3], index=index, k=12)] == [
+        len(agent._match_indexed(SeekerFeatures.from_profile(s), index, 12)) for s in seekers[:3]
+    ]
@@ -44,6 +44,8 @@ export default function JobFinderPage() {
   const [isLoading, setIsLoading] = useState(false);
   const [isInitializing, setIsInitializing] = useState(true);
   const [matchScores, setMatchScores] = useState<{ [key: string]: number }>({});
+  const [totalResults, setTotalResults] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   
   // Filter state
   const [filterOptions, setFilterOptions] = useState<FilterOptions | null>(null);
@@ -120,7 +122,7 @@ export default function JobFinderPage() {
     }
   };
 
-  const performSearch = async (filters?: Filters) => {
+  const performSearch = async (filters?: Filters, cursor?: string) => {
     if (!sessionId) return;
 
     try {
@@ -130,18 +132,21 @@ export default function JobFinderPage() {
         body: JSON.stringify({
           session_id: sessionId,
           filters: filters || activeFilters,
+          cursor,
         }),
       });
 
       const data = await response.json();
       const jobs = data.recommendations || [];
+      setTotalResults(data.total_results || 0);
+      setNextCursor(data.next_cursor || null);
 
       // Extract match scores
       const scores: { [key: string]: number } = {};
       jobs.forEach((rec: any) => {
         scores[rec.job_id] = rec.match_score;
       });
-      setMatchScores(scores);
+      setMatchScores((prev) => (cursor ? { ...prev, ...scores } : scores));
 
       // Map to JobData
       const jobList = jobs.map((rec: any) => ({
@@ -155,7 +160,8 @@ export default function JobFinderPage() {
         experience_level: rec.job?.experience_level,
       }));
 
-      setJobRecommendations(jobList);
+      // A cursor loads the next page, appended below the current one
+      setJobRecommendations((prev) => (cursor ? [...prev, ...jobList] : jobList));
     } catch (error) {
       console.error('Search failed:', error);
     }
@@ -237,7 +243,7 @@ export default function JobFinderPage() {
           <div className="top-bar-stats">
             <div className="stat">
               <span className="stat-label">Matches Found</span>
-              <span className="stat-value">{jobRecommendations.length}</span>
+              <span className="stat-value">{totalResults}</span>
             </div>
           </div>
         )}
@@ -265,7 +271,7 @@ export default function JobFinderPage() {
           {isComplete ? (
             <div className="preview-wrapper">
               <div className="preview-header">
-                <h3>Filtered Jobs ({jobRecommendations.length})</h3>
+                <h3>Filtered Jobs ({totalResults})</h3>
               </div>
 
               {/* Jobs List */}
@@ -317,6 +323,15 @@ export default function JobFinderPage() {
                 ))}
               </div>
 
+              {nextCursor && (
+                <button
+                  className="regenerate-button"
+                  onClick={() => performSearch(undefined, nextCursor)}
+                >
+                  Load more jobs
+                </button>
+              )}
+
               {jobRecommendations.length === 0 && (
                 <div className="no-results">
                   <p>No jobs match your filters. Try adjusting them!</p>
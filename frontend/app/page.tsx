@@ -14,7 +14,7 @@ import { useRouter } from 'next/navigation';
 import ChatPanel from '@/components/ChatPanel';
 import PreviewPanel from '@/components/PreviewPanel';
 import { ChatMessage, JobPost } from '@/types';
-import { startChat, sendMessage, getPostPreview, regenerateSection } from '@/lib/api';
+import { startChat, sendMessageStream, getPostPreview, regenerateSection } from '@/lib/api';
 
 export default function Home() {
   const router = useRouter();
@@ -92,16 +92,32 @@ export default function Home() {
     setMessages((prev) => [...prev, userMessage]);
     setIsLoading(true);
 
+    // Grow the AI message in place as tokens stream in
+    let streamedText = '';
+    let hasAssistantMessage = false;
+    const showAssistantText = (content: string) => {
+      const aiMessage: ChatMessage = { role: 'assistant', content, timestamp: new Date() };
+      if (hasAssistantMessage) {
+        setMessages((prev) => [...prev.slice(0, -1), aiMessage]);
+      } else {
+        hasAssistantMessage = true;
+        setMessages((prev) => [...prev, aiMessage]);
+      }
+    };
+
     try {
-      const response = await sendMessage(sessionId, message);
+      const response = await sendMessageStream(sessionId, message, {
+        onToken: (text) => {
+          streamedText += text;
+          setIsLoading(false);
+          showAssistantText(streamedText);
+        },
+        onPreview: (preview) => setJobPost(preview),
+        onSection: (section, value) => setJobPost((prev) => ({ ...prev, [section]: value })),
+      });
       
-      // Add AI response
-      const aiMessage: ChatMessage = {
-        role: 'assistant',
-        content: response.response,
-        timestamp: new Date(),
-      };
-      setMessages((prev) => [...prev, aiMessage]);
+      // Replace the streamed text with the final AI response
+      showAssistantText(response.response);
 
       // Update job post if available
       if (response.job_post) {
@@ -89,6 +89,71 @@ export async function sendMessage(
   return response.json();
 }
 
+export interface SendMessageStreamHandlers {
+  onToken?: (text: string) => void;
+  onPreview?: (jobPost: any) => void;
+  onSection?: (section: string, value: any) => void;
+}
+
+/**
+ * Send a message and stream the reply (Server-Sent Events).
+ * Handlers fire as interviewer tokens, live-preview updates and composed
+ * sections arrive; resolves with the same payload as sendMessage.
+ */
+export async function sendMessageStream(
+  sessionId: string,
+  message: string,
+  handlers: SendMessageStreamHandlers = {}
+): Promise<SendMessageResponse> {
+  const response = await fetch(`${API_BASE_URL}/send-message/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      session_id: sessionId,
+      message: message,
+    }),
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error('Failed to send message');
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let event = 'message';
+      let data = '';
+      for (const line of rawEvent.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      const payload = data ? JSON.parse(data) : null;
+
+      if (event === 'token') handlers.onToken?.(payload.text);
+      else if (event === 'preview') handlers.onPreview?.(payload.job_post);
+      else if (event === 'section') handlers.onSection?.(payload.section, payload.value);
+      else if (event === 'error') throw new Error(payload?.detail || 'Failed to send message');
+      else if (event === 'done') return payload as SendMessageResponse;
+    }
+  }
+
+  throw new Error('Stream ended before the reply was complete');
+}
+
 /**
  * Get post preview for a session
  */
@@ -163,3 +228,30 @@ export async function regenerateSection(
 }
 
 
+
+/**
+ * Regenerate several sections of the post in one request
+ */
+export async function regenerateSections(
+  sessionId: string,
+  sectionTypes: string[],
+  reformat: boolean = false
+): Promise<any> {
+  const response = await fetch(`${API_BASE_URL}/regenerate-sections`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      session_id: sessionId,
+      section_types: sectionTypes,
+      reformat,
+    }),
+  });
+
+  if (!response.ok) {
+    throw new Error('Failed to regenerate sections');
+  }
+
+  return response.json();
+}